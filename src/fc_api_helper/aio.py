@@ -0,0 +1,125 @@
+"""Asyncio execution core shared by the curl wrappers, fc-uuid and the explorers.
+
+Processes (curl, psql) run as asyncio subprocesses and HTTP requests
+(`requests`, which is blocking) run in the loop's thread pool, so schema
+revalidation, token refresh, UUID prefetching and API calls can overlap in
+one event loop. Callers that are not async use run() or a BackgroundLoop:
+
+    result = aio.run(aio.run_process(['curl', url]))
+
+    loop = aio.BackgroundLoop()
+    future = loop.submit(aio.fetch_csv_rows(query))  # concurrent.futures.Future
+"""
+
+import asyncio
+import csv
+import io
+import subprocess
+import threading
+from functools import partial
+
+import requests
+
+from fc_api_helper.profiling import span
+from fc_api_helper.psql import DB_URL, DatabaseError, build_copy_script
+
+
+def run(coro):
+    """Run a coroutine to completion from synchronous code."""
+    return asyncio.run(coro)
+
+
+async def run_process(cmd, input=None, text=True):
+    """Run a command and capture its output, like subprocess.run(capture_output=True).
+
+    Args:
+        cmd: Command and arguments
+        input: Optional data written to stdin (str if text, else bytes)
+        text: Decode stdout/stderr as UTF-8
+
+    Returns:
+        subprocess.CompletedProcess
+
+    Raises:
+        FileNotFoundError: The command does not exist
+    """
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=subprocess.PIPE if input is not None else subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    )
+    if text and input is not None:
+        input = input.encode('utf-8')
+    stdout, stderr = await process.communicate(input)
+    if text:
+        stdout = stdout.decode('utf-8', 'replace')
+        stderr = stderr.decode('utf-8', 'replace')
+    return subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr)
+
+
+async def http_request(method, url, **kwargs):
+    """Send an HTTP request without blocking the event loop.
+
+    Args:
+        method: HTTP method
+        url: Request URL
+        **kwargs: Passed to requests.request (json, headers, timeout...)
+
+    Returns:
+        requests.Response
+
+    Raises:
+        requests.exceptions.RequestException: The request failed
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, partial(requests.request, method, url, **kwargs))
+
+
+async def fetch_csv_rows(query, db_url=DB_URL, params=None):
+    """Run a SELECT query through psql and return its rows (see psql.stream_csv_rows).
+
+    Raises:
+        DatabaseError: psql is missing or the query failed
+    """
+    script = build_copy_script([query], params)
+    cmd = ['psql', db_url, '-X', '-q', '-v', 'ON_ERROR_STOP=1', '-f', '-']
+    try:
+        with span('psql'):
+            result = await run_process(cmd, input=script.encode('utf-8'), text=False)
+    except FileNotFoundError:
+        raise DatabaseError("psql not found") from None
+
+    if result.returncode != 0:
+        raise DatabaseError(result.stderr.decode('utf-8', 'replace').strip()
+                            or f"psql exited with status {result.returncode}")
+
+    return list(csv.reader(io.StringIO(result.stdout.decode('utf-8'), newline='')))
+
+
+class BackgroundLoop:
+    """An event loop running in a daemon thread, for work started from sync code."""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name='fc-api-aio', daemon=True)
+        self._thread.start()
+
+    def submit(self, coro):
+        """Schedule a coroutine on the loop.
+
+        Returns:
+            concurrent.futures.Future of the coroutine's result
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def close(self):
+        """Cancel pending work and stop the loop."""
+        def cancel_all():
+            for task in asyncio.all_tasks(self.loop):
+                task.cancel()
+            self.loop.stop()
+
+        if self.loop.is_running():
+            self.loop.call_soon_threadsafe(cancel_all)
+        self._thread.join(timeout=1)
@@ -1,9 +1,26 @@
 """Shared OpenAPI API explorer library."""
 
 import json
+import mmap
+import os
+import re
+import shlex
 import subprocess
 import sys
-from fc_api_helper.schema_refresh import fetch_openapi_schema
+import time
+from fc_api_helper.schema_refresh import fetch_openapi_schema, fetch_openapi_schemas
+from fc_api_helper import json_codec
+from fc_api_helper.fake_payloads import compile_operation_generator, write_payloads
+from fc_api_helper.profiling import span
+from fc_api_helper.search_index import SEARCH_FILE, search_index_file
+from fc_api_helper.uuid_prefetch import UuidPrefetcher
+from fc_api_helper.endpoint_index import (
+    render_index,
+    load_endpoint_index,
+    build_endpoint_index,
+    load_operation_slice,
+    get_preview_command
+)
 from fc_api_helper.colors import (
     Colors,
     colored,
@@ -17,6 +34,12 @@ from fc_api_helper.colors import (
 # Global client UUID (set when user provides x-sirius-client-uuid header, used by prompt_for_value)
 _current_client_uuid = None
 
+# UUID samples of the selected operation's uuid fields, loaded in the background
+_uuid_prefetcher = None
+
+# Identifiers from earlier responses, offered first by the UUID pickers (see api_session)
+_response_values = None
+
 
 def merge_schemas(schema_entries):
     """Merge multiple OpenAPI schemas into one.
@@ -68,8 +91,8 @@ def load_schema(cache_file, schema_url, base_url):
         base_url: Base URL of the API (for error messages)
     """
     try:
-        with open(cache_file, 'r') as f:
-            return json.load(f)
+        with span('load_schema'):
+            return json_codec.load_file(cache_file)
     except FileNotFoundError:
         print(info("Schema cache not found at ") + cache_file, file=sys.stderr)
         print(info(f"Fetching schema from {schema_url}..."), file=sys.stderr)
@@ -82,48 +105,120 @@ def load_schema(cache_file, schema_url, base_url):
         print("", file=sys.stderr)
 
         try:
-            with open(cache_file, 'r') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
+            with span('load_schema'):
+                return json_codec.load_file(cache_file)
+        except (FileNotFoundError, *json_codec.DecodeError) as e:
             print(error(f"Error: Failed to load schema after refresh: {e}"), file=sys.stderr)
             sys.exit(1)
 
-    except json.JSONDecodeError:
+    except json_codec.DecodeError:
         print(error(f"Error: Invalid JSON in {cache_file}"), file=sys.stderr)
         sys.exit(1)
 
 
 def format_endpoints(schema):
-    """Format endpoints for fzf selection."""
-    endpoints = []
-    for path, methods in schema.get('paths', {}).items():
-        for method, details in methods.items():
-            summary = details.get('summary') or details.get('description') or "No description"
-            summary = summary.split('\n')[0].strip()
-            if len(summary) > 100:
-                summary = summary[:97] + "..."
-            endpoints.append(f"{method.upper()} {path} -- {summary}")
-    return "\n".join(endpoints)
-
-
-def select_endpoint_with_fzf(endpoints_text):
-    """Use fzf to select an endpoint."""
+    """Format endpoints for fzf selection.
+
+    Each line is "<key>\t<offset>\t<length>\t<METHOD> <path> -- <summary>";
+    the first three columns are hidden in fzf, the key indexes the operation
+    table and offset/length locate the preview (see endpoint_index.render_index).
+    """
+    return render_index(schema)[1].decode('utf-8')
+
+
+def select_endpoint_with_fzf(endpoints_file, preview_command=None, keys=None, fzf_header=None,
+                             exit_on_cancel=True):
+    """Use fzf to select an endpoint from a rendered endpoints file.
+
+    Args:
+        endpoints_file: Path of the endpoints file of the endpoint index
+        preview_command: Optional fzf --preview command for the detail pane
+        keys: Optional operation keys to offer, in this order (e.g. search
+            results); fzf keeps the order while filtering
+        fzf_header: Optional header line shown above the endpoints
+        exit_on_cancel: Exit when nothing is selected (otherwise return None)
+
+    Returns:
+        Integer key of the selected operation
+    """
+    fzf_cmd = ['fzf', '--height=60%', '--reverse', '--border', '--prompt=Select API endpoint: ',
+               '--delimiter=\t', '--with-nth=4..']
+    if preview_command:
+        fzf_cmd += [f'--preview={preview_command}', '--preview-window=right,50%,wrap']
+    if keys is not None:
+        fzf_cmd.append('--no-sort')
+    if fzf_header:
+        fzf_cmd.append(f'--header={fzf_header}')
+
     try:
-        result = subprocess.run(
-            ['fzf', '--height=60%', '--reverse', '--border', '--prompt=Select API endpoint: '],
-            input=endpoints_text,
-            text=True,
-            capture_output=True
-        )
+        with open(endpoints_file, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as endpoints_blob, \
+                span('fzf'):
+            if keys is not None:
+                # Line i holds key i
+                lines = endpoints_blob[:].split(b"\n")
+                endpoints_input = b"\n".join(lines[key] for key in keys)
+            else:
+                endpoints_input = endpoints_blob
+            result = subprocess.run(
+                fzf_cmd,
+                input=endpoints_input,
+                capture_output=True
+            )
         if result.returncode != 0:
+            if not exit_on_cancel:
+                return None
             print(info("No selection made"), file=sys.stderr)
             sys.exit(0)
-        return result.stdout.strip()
+        return int(result.stdout.split(b'\t', 1)[0])
     except FileNotFoundError:
         print(error("Error: fzf not found"), file=sys.stderr)
         sys.exit(1)
 
 
+def select_uuid_for_field(name):
+    """Select a UUID for a field with fc-uuid.
+
+    In a session, the identifiers of earlier responses are offered first
+    (see api_session.ResponseValues); aborting that picker goes on to fc-uuid.
+    When the field's table is known (see uuid_prefetch), the UUID picker opens
+    directly on the prefetched rows, or runs fc-uuid --table if they are not
+    available; aborting the prefetched picker falls back to the full fc-uuid
+    table picker.
+
+    Returns:
+        Selected UUID string
+
+    Raises:
+        subprocess.CalledProcessError: fc-uuid failed or nothing was selected
+        FileNotFoundError: fc-uuid is not installed
+    """
+    if _response_values:
+        value = _response_values.select(name)
+        if value:
+            return value
+
+    table = _uuid_prefetcher.get_table(name) if _uuid_prefetcher else None
+    rows = _uuid_prefetcher.get_rows(table, _current_client_uuid) if table else None
+    if rows:
+        from fc_api_helper.cli.fc_uuid import pick_uuid_with_fzf
+        with span('fc-uuid'):
+            selected = pick_uuid_with_fzf(rows, table)
+        if selected:
+            return selected
+        # Left without a selection: fall back to the fc-uuid table picker
+        table = None
+
+    cmd = ['fc-uuid']
+    if _current_client_uuid:
+        cmd.extend(['--client', _current_client_uuid])
+    if table:
+        cmd.extend(['--table', table])
+    with span('fc-uuid'):
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
 def prompt_for_value(name, required, param_type, description, param_in=''):
     """Prompt user for a parameter value."""
     print("", file=sys.stderr)
@@ -154,29 +249,23 @@ def prompt_for_value(name, required, param_type, description, param_in=''):
 
     if 'uuid' in name.lower() or (description and 'uuid' in description.lower()):
         try:
-            cmd = ['fc-uuid']
-            if _current_client_uuid:
-                cmd.extend(['--client', _current_client_uuid])
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            uuid_value = result.stdout.strip()
+            uuid_value = select_uuid_for_field(name)
             print(f"  {success('✓ Selected:')} {uuid_value}", file=sys.stderr)
             return uuid_value
         except subprocess.CalledProcessError:
             print(f"  {info('fc-uuid failed, falling back to manual input')}", file=sys.stderr)
             print(f"  {label('Enter value:')} ", end='', file=sys.stderr, flush=True)
-            return input()
+            with span('prompt'):
+                return input()
         except FileNotFoundError:
             print(f"  {info('fc-uuid not found, falling back to manual input')}", file=sys.stderr)
             print(f"  {label('Enter value:')} ", end='', file=sys.stderr, flush=True)
-            return input()
+            with span('prompt'):
+                return input()
     else:
         print(f"  {label('Enter value:')} ", end='', file=sys.stderr, flush=True)
-        return input()
+        with span('prompt'):
+            return input()
 
 
 def get_parameters(schema, path, method, param_in):
@@ -469,12 +558,13 @@ def prompt_for_enum_value(name, required, param_type, description, enum_values):
     # Use fzf to select from enum values
     try:
         enum_text = "\n".join(str(v) for v in enum_values)
-        result = subprocess.run(
-            ['fzf', '--height=40%', '--reverse', '--border', f'--prompt=Select {name}: '],
-            input=enum_text,
-            text=True,
-            capture_output=True
-        )
+        with span('fzf'):
+            result = subprocess.run(
+                ['fzf', '--height=40%', '--reverse', '--border', f'--prompt=Select {name}: '],
+                input=enum_text,
+                text=True,
+                capture_output=True
+            )
         if result.returncode == 0:
             selected = result.stdout.strip()
             print(f"  {success('✓ Selected:')} {selected}", file=sys.stderr)
@@ -542,11 +632,7 @@ def prompt_for_array_value(name, required, prop_schema, full_schema, description
                 break
             # Use fc-uuid for UUID selection
             try:
-                cmd = ['fc-uuid']
-                if _current_client_uuid:
-                    cmd.extend(['--client', _current_client_uuid])
-                result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-                uuid_value = result.stdout.strip()
+                uuid_value = select_uuid_for_field(name)
                 if uuid_value:
                     array_values.append(uuid_value)
                     print(f"  {success('✓ Added:')} {uuid_value}", file=sys.stderr)
@@ -577,23 +663,58 @@ def prompt_for_array_value(name, required, prop_schema, full_schema, description
     return None
 
 
-def run_api_explorer(config, refresh=False):
-    """Main entry point for API explorer.
+def get_fake_output_file(path, method):
+    """Return the default --fake output file of an operation (in the current directory)."""
+    slug = re.sub(r'[^a-z0-9]+', '-', path.lower()).strip('-') or 'root'
+    return f"fake-{method.lower()}-{slug}.jsonl"
+
+
+def write_fake_requests(config, schema, path, method, headers, count, output_file=None, seed=None):
+    """Write fake requests for an operation and print the command sending them.
+
+    uuid fields are filled from the prefetched fc-uuid samples when the
+    database is reachable, and with random UUIDs otherwise.
 
     Args:
-        config: Dict with keys:
-            - schemas: List of schema configs, each with:
-                - cache_file: Path to schema cache
-                - schema_url: URL to fetch schema from
-                - path_prefix: Prefix to prepend to all paths (e.g., '/v2')
-            - base_url: API base URL
-            - curl_command: Command to use for API calls
-            - environment: Environment name (optional, default: 'local')
-        refresh: If True, refresh cached schema data
+        config: Explorer config (see run_api_explorer)
+        schema: Schema holding the operation (its slice)
+        path: Operation path
+        method: Operation method
+        headers: Headers added to every request (e.g. the client UUID)
+        count: Number of requests to generate
+        output_file: JSON Lines file to write (default: see get_fake_output_file)
+        seed: Optional seed, for reproducible payloads
     """
-    global _current_client_uuid
+    output_file = output_file or get_fake_output_file(path, method)
+    uuid_samples = _uuid_prefetcher.get_samples(_current_client_uuid) if _uuid_prefetcher else {}
+    if uuid_samples:
+        print(info(f"Using fc-uuid samples for: {', '.join(sorted(uuid_samples))}"), file=sys.stderr)
 
-    # Load all schemas with their prefixes
+    started = time.perf_counter()
+    generate = compile_operation_generator(schema, path, method, headers, uuid_samples, seed)
+    try:
+        with span('fake'), open(output_file, 'wb') as f:
+            write_payloads(f, generate, count)
+    except OSError as e:
+        print(error(f"Error: Cannot write {output_file}: {e.strerror}"), file=sys.stderr)
+        sys.exit(1)
+    size = os.path.getsize(output_file)
+    print(success(f"✓ Wrote {count} fake {method.upper()} requests to {output_file} "
+                  f"({size / (1 << 20):.1f} MB in {time.perf_counter() - started:.1f}s)"), file=sys.stderr)
+
+    command = f"{config['curl_command']}"
+    environment = config.get('environment', 'local')
+    if environment != 'local':
+        command += f" --env {environment}"
+    print(f"{command} --batch {shlex.quote(output_file)}")
+
+
+def load_schema_entries(config):
+    """Load every schema of an explorer config.
+
+    Returns:
+        List of dicts with 'schema' and 'path_prefix' keys (see merge_schemas)
+    """
     schema_entries = []
     for schema_config in config['schemas']:
         schema = load_schema(
@@ -605,44 +726,147 @@ def run_api_explorer(config, refresh=False):
             'schema': schema,
             'path_prefix': schema_config.get('path_prefix', '')
         })
+    return schema_entries
+
+
+def set_response_values(response_values):
+    """Offer the identifiers of earlier responses in the UUID pickers (see api_session)."""
+    global _response_values
+    _response_values = response_values
+
+
+def search_endpoints(endpoint_index, query):
+    """Rank the endpoints of an endpoint index against a free-text query.
+
+    Returns:
+        List of operation keys, best match first
+    """
+    search_file = os.path.join(endpoint_index['index_dir'], SEARCH_FILE)
+    return [key for key, _ in search_index_file(search_file, query)]
+
 
-    # Merge all schemas into one
-    schema = merge_schemas(schema_entries)
+def load_explorer_index(config):
+    """Fetch the missing schema caches and load the endpoint index, rebuilding it if stale.
 
-    endpoints_text = format_endpoints(schema)
-    if not endpoints_text:
+    Args:
+        config: Explorer config (see run_api_explorer)
+
+    Returns:
+        Tuple of (endpoint_index, full_schema); full_schema is the merged
+        schema when the index was rebuilt, None otherwise
+    """
+    # Fetch all missing schema caches concurrently
+    missing = [c for c in config['schemas'] if not os.path.exists(c['cache_file'])]
+    if missing:
+        print(info(f"Fetching {len(missing)} missing schema cache(s)..."), file=sys.stderr)
+        fetch_openapi_schemas(missing, config['base_url'])
+        print("", file=sys.stderr)
+
+    # The full schemas are only loaded (and merged) to rebuild a stale index;
+    # afterwards just the selected operation's slice is kept in memory
+    full_schema = None
+    endpoint_index = load_endpoint_index(config)
+    if endpoint_index is None:
+        # The decoded schemas are millions of objects without cycles: a
+        # collector pass over them would cost more than the rebuild itself
+        with json_codec.gc_paused():
+            schema_entries = load_schema_entries(config)
+            with span('merge'):
+                full_schema = merge_schemas(schema_entries)
+            endpoint_index = build_endpoint_index(config, full_schema, schema_entries)
+    if not endpoint_index['operations']:
         print(error("Error: No endpoints found in schema"), file=sys.stderr)
         sys.exit(1)
+    return endpoint_index, full_schema
 
-    selected = select_endpoint_with_fzf(endpoints_text)
 
-    parts = selected.split(' -- ')[0].split(' ', 1)
-    method = parts[0]
-    path = parts[1]
+def start_uuid_prefetch(endpoint_index, schema, path, method, required_headers, full_schema=None,
+                        client_known=False):
+    """Start sampling the tables of an operation's uuid fields in the background.
 
-    current_path = path
+    Required headers (the client UUID) are sampled unfiltered right away, the
+    other fields once the client filter is known (see prompt_required_headers),
+    or right away when it already is.
+
+    Args:
+        endpoint_index: Result of load_explorer_index
+        schema: Schema slice of the operation
+        path: Operation path
+        method: Operation method
+        required_headers: Required headers of the config
+        full_schema: Merged schema, if loaded (see UuidPrefetcher)
+        client_known: The required headers were already answered
+
+    Returns:
+        The UuidPrefetcher (shut it down once the request is built)
+    """
+    global _uuid_prefetcher
+
+    _uuid_prefetcher = UuidPrefetcher(schema, path, method, required_headers, endpoint_index['index_dir'],
+                                      full_schema=full_schema, changes=endpoint_index['changes'])
+    if client_known or not required_headers:
+        _uuid_prefetcher.prefetch(_current_client_uuid)
+    else:
+        _uuid_prefetcher.prefetch(_current_client_uuid, names={rh['name'] for rh in required_headers})
+    return _uuid_prefetcher
+
+
+def prompt_required_headers(required_headers):
+    """Prompt for the required headers of a config (e.g. x-sirius-client-uuid for BE API).
+
+    Returns:
+        Dict of header name -> value
+    """
+    global _current_client_uuid
 
-    # Process required headers from config first (e.g., x-sirius-client-uuid for BE API)
     headers = {}
-    required_headers = config.get('required_headers', [])
-    if required_headers:
-        print(header("Required Headers"), file=sys.stderr)
-        print("", file=sys.stderr)
-        for rh in required_headers:
-            name = rh['name']
-            description = rh.get('description', '')
+    if not required_headers:
+        return headers
 
-            value = prompt_for_value(name, True, 'string', description, 'header')
+    print(header("Required Headers"), file=sys.stderr)
+    print("", file=sys.stderr)
+    for rh in required_headers:
+        name = rh['name']
+        description = rh.get('description', '')
 
-            if value:
-                headers[name] = value
-                if name.lower() == 'x-sirius-client-uuid':
-                    _current_client_uuid = value
-                    print(f"  {info('(will be used for fc-uuid filtering)')}", file=sys.stderr)
-        print("", file=sys.stderr)
+        value = prompt_for_value(name, True, 'string', description, 'header')
+
+        if value:
+            headers[name] = value
+            if name.lower() == 'x-sirius-client-uuid':
+                _current_client_uuid = value
+                print(f"  {info('(will be used for fc-uuid filtering)')}", file=sys.stderr)
+    print("", file=sys.stderr)
+    if _uuid_prefetcher:
+        client_fields = {rh['name'] for rh in required_headers}
+        _uuid_prefetcher.prefetch(
+            _current_client_uuid,
+            names=set(_uuid_prefetcher.field_tables) - client_fields
+        )
+    return headers
+
+
+def prompt_for_request(config, schema, path, method, headers):
+    """Prompt for the header, path and query parameters and the body of a request.
+
+    Args:
+        config: Explorer config (see run_api_explorer)
+        schema: Schema holding the operation (its slice)
+        path: Operation path
+        method: Operation method
+        headers: Headers already set (the required headers); not prompted again
+
+    Returns:
+        Tuple of (url, headers, request_body); request_body is None for
+        requests without a body
+    """
+    global _current_client_uuid
+
+    current_path = path
+    headers = dict(headers)
 
     # Process schema-defined headers, skipping any already provided by required_headers
-    required_header_names = {rh['name'].lower() for rh in required_headers}
+    required_header_names = {rh['name'].lower() for rh in config.get('required_headers', [])}
     header_params = get_parameters(schema, path, method, 'header')
     header_params = [p for p in header_params if p['name'].lower() not in required_header_names]
     if header_params:
@@ -713,6 +937,11 @@ def run_api_explorer(config, refresh=False):
         if body_schema:
             request_body = prompt_for_body_fields(body_schema, schema, method, path)
 
+    return url, headers, request_body
+
+
+def format_command(config, url, method, headers, request_body=None):
+    """Return the be-curl/dpl-curl command line of a request."""
     command = f"{config['curl_command']}"
 
     environment = config.get('environment', 'local')
@@ -728,4 +957,59 @@ def run_api_explorer(config, refresh=False):
         body_json = json.dumps(request_body)
         command += f" -d '{body_json}'"
 
-    print(command)
+    return command
+
+
+def run_api_explorer(config, refresh=False, fake=None, fake_output=None, seed=None, search=None):
+    """Main entry point for API explorer.
+
+    Args:
+        config: Dict with keys:
+            - schemas: List of schema configs, each with:
+                - cache_file: Path to schema cache
+                - schema_url: URL to fetch schema from
+                - path_prefix: Prefix to prepend to all paths (e.g., '/v2')
+            - base_url: API base URL
+            - curl_command: Command to use for API calls
+            - service: 'be' or 'dpl' (authentication of api_session)
+            - environment: Environment name (optional, default: 'local')
+        refresh: If True, refresh cached schema data
+        fake: If set, write this many fake requests for the selected endpoint
+            (see write_fake_requests) instead of prompting for one
+        fake_output: Output file of the fake requests
+        seed: Seed of the fake requests
+        search: Optional free-text query; the endpoint picker then lists only
+            the matching endpoints, best match first
+    """
+    endpoint_index, full_schema = load_explorer_index(config)
+
+    keys = None
+    if search:
+        keys = search_endpoints(endpoint_index, search)
+        if not keys:
+            print(error(f"Error: No endpoints match '{search}'"), file=sys.stderr)
+            sys.exit(1)
+
+    selected = select_endpoint_with_fzf(
+        endpoint_index['endpoints_file'],
+        get_preview_command(endpoint_index['index_dir']),
+        keys
+    )
+    method, path = endpoint_index['operations'][selected]
+    schema = load_operation_slice(endpoint_index, selected)
+
+    # Sample the tables of all uuid fields while the user answers the prompts
+    required_headers = config.get('required_headers', [])
+    start_uuid_prefetch(endpoint_index, schema, path, method, required_headers, full_schema)
+    full_schema = None
+    headers = prompt_required_headers(required_headers)
+
+    if fake:
+        write_fake_requests(config, schema, path, method, headers, fake, fake_output, seed)
+        _uuid_prefetcher.shutdown()
+        return
+
+    url, headers, request_body = prompt_for_request(config, schema, path, method, headers)
+    _uuid_prefetcher.shutdown()
+
+    print(format_command(config, url, method, headers, request_body))
@@ -0,0 +1,248 @@
+"""Interactive request session for the API explorers (be-api/dpl-api --session).
+
+A single explorer run loads the endpoint index, asks for the required headers
+and exits after printing one command. A session keeps all of that between
+requests: the endpoint index and the operation slices already decoded, the
+required headers (the client UUID), the authentication headers and a
+requests.Session whose connections stay open. Each round picks an endpoint,
+prompts for the request like run_api_explorer, sends it and prints the
+response.
+
+Identifiers found in the responses are kept (ResponseValues) and offered first
+by the UUID pickers of the following requests, so the uuid of a resource just
+created by a POST can be passed straight to the next request.
+"""
+
+import re
+import subprocess
+import sys
+import time
+
+import requests
+
+from fc_api_helper import api_explorer, json_codec
+from fc_api_helper.colors import error, header, info, success
+from fc_api_helper.curl_wrapper import ENV_CONFIG, format_json_output, format_size, load_api_key
+from fc_api_helper.endpoint_index import get_preview_command, load_operation_slice
+from fc_api_helper.profiling import span
+from fc_api_helper.uuid_prefetch import field_stem, path_entity
+
+
+# Identifiers kept from earlier responses
+RESPONSE_VALUES_LIMIT = 500
+
+# Seconds to wait for a response
+REQUEST_TIMEOUT = 60
+
+UUID_PATTERN = re.compile(r'^[0-9a-fA-F]{8}-(?:[0-9a-fA-F]{4}-){3}[0-9a-fA-F]{12}$')
+
+
+class ResponseValues:
+    """UUIDs seen in the responses of a session, most recent first.
+
+    Each value remembers its key, the entity it identifies ("fund" for
+    "fund_uuid", the path's resource for a bare "uuid") and the request it
+    came from.
+    """
+
+    def __init__(self, limit=RESPONSE_VALUES_LIMIT):
+        self.limit = limit
+        # [value, key, entity, source] lists
+        self.entries = []
+
+    def _collect(self, data, entity, source, found):
+        if len(found) >= self.limit:
+            return
+        if isinstance(data, dict):
+            for key, value in data.items():
+                if isinstance(value, str):
+                    if UUID_PATTERN.match(value):
+                        found.append([value, key, field_stem(key) or entity, source])
+                elif isinstance(value, dict):
+                    self._collect(value, field_stem(key) or entity, source, found)
+                elif isinstance(value, list):
+                    # List elements are the entity of the enclosing object
+                    # ("results" of /funds/ are funds)
+                    self._collect(value, entity, source, found)
+        elif isinstance(data, list):
+            for item in data:
+                self._collect(item, entity, source, found)
+
+    def add_response(self, method, path, data):
+        """Record the UUIDs of a decoded response body.
+
+        Args:
+            method: Request method
+            path: Operation path (its last resource names bare uuid keys)
+            data: Decoded JSON body
+        """
+        found = []
+        self._collect(data, path_entity(path), f"{method.upper()} {path}", found)
+        values = {entry[0] for entry in found}
+        self.entries = (found + [entry for entry in self.entries if entry[0] not in values])[:self.limit]
+
+    def ranked(self, name):
+        """Return the entries for a field: same key first, then same entity, then the rest."""
+        stem = field_stem(name)
+
+        def rank(entry):
+            if entry[1] == name:
+                return 0
+            return 1 if stem and entry[2] == stem else 2
+        return sorted(self.entries, key=rank)
+
+    def select(self, name):
+        """Pick a value for a field with fzf.
+
+        Returns:
+            Selected UUID, or None if there is none or nothing was selected
+        """
+        entries = self.ranked(name)
+        if not entries:
+            return None
+        lines = "\n".join(f"{value}\t{key}\t{source}" for value, key, _, source in entries)
+        try:
+            with span('fzf'):
+                result = subprocess.run(
+                    ['fzf', '--height=40%', '--reverse', '--border', f'--prompt=Select {name}: ',
+                     '--delimiter=\t', '--header=From earlier responses (Esc: fc-uuid)'],
+                    input=lines,
+                    text=True,
+                    capture_output=True
+                )
+        except FileNotFoundError:
+            return None
+        if result.returncode != 0:
+            return None
+        return result.stdout.split('\t', 1)[0].strip()
+
+
+def get_auth_headers(config, reauthenticate=False):
+    """Return the authentication headers of an explorer config's service.
+
+    Args:
+        config: Explorer config with 'service' ('be' or 'dpl') and 'environment'
+        reauthenticate: Authenticate again (BE, after a 401)
+    """
+    environment = config.get('environment', 'local')
+    if config['service'] == 'be':
+        return {'Authorization': f"Token {load_api_key(environment, reauthenticate)}"}
+    return {'X-API-KEY': ENV_CONFIG[environment]['dpl']['api_key']}
+
+
+def send_request(http, config, auth_headers, method, url, headers, body):
+    """Send one request on the session's connection pool.
+
+    BE requests are re-authenticated and sent again once on a 401.
+
+    Returns:
+        Tuple of (response or None if the request failed, elapsed seconds,
+        auth headers to use from now on)
+    """
+    for attempt in range(2):
+        started = time.perf_counter()
+        try:
+            with span('http'):
+                response = http.request(method, url, headers={**auth_headers, **headers}, json=body,
+                                        timeout=REQUEST_TIMEOUT)
+        except requests.exceptions.RequestException as e:
+            print(error(f"Error: Request failed: {e}"), file=sys.stderr)
+            return None, time.perf_counter() - started, auth_headers
+        if response.status_code != 401 or config['service'] != 'be' or attempt:
+            break
+        print("Received 401 UNAUTHORIZED. Re-authenticating...", file=sys.stderr)
+        auth_headers = get_auth_headers(config, reauthenticate=True)
+    return response, time.perf_counter() - started, auth_headers
+
+
+def print_response(response, elapsed):
+    """Print the status line and the formatted body of a response (to stderr)."""
+    status = f"HTTP {response.status_code} {response.reason or ''}".rstrip()
+    status = success(status) if response.status_code < 400 else error(status)
+    print(f"{status} {info(f'({elapsed * 1000:.0f} ms, {format_size(len(response.content))})')}",
+          file=sys.stderr)
+    if response.content:
+        print(format_json_output(response.text), file=sys.stderr)
+    print("", file=sys.stderr)
+
+
+def run_api_session(config, search=None):
+    """Pick, send and inspect requests in a loop until the endpoint picker is left.
+
+    Responses are printed to stderr; when the session ends, the command of
+    the last request is printed to stdout (like a single explorer run).
+
+    Args:
+        config: Explorer config (see api_explorer.run_api_explorer) with a
+            'service' key ('be' or 'dpl')
+        search: Optional free-text query restricting the endpoint picker
+            (see api_explorer.search_endpoints)
+    """
+    endpoint_index, full_schema = api_explorer.load_explorer_index(config)
+    keys = None
+    if search:
+        keys = api_explorer.search_endpoints(endpoint_index, search)
+        if not keys:
+            print(error(f"Error: No endpoints match '{search}'"), file=sys.stderr)
+            sys.exit(1)
+
+    preview_command = get_preview_command(endpoint_index['index_dir'])
+    required_headers = config.get('required_headers', [])
+    response_values = ResponseValues()
+    api_explorer.set_response_values(response_values)
+    slices = {}
+    headers = None
+    auth_headers = None
+    last_command = None
+    sent = 0
+
+    with requests.Session() as http:
+        while True:
+            selected = api_explorer.select_endpoint_with_fzf(
+                endpoint_index['endpoints_file'], preview_command, keys,
+                fzf_header=f"Session: {sent} request(s) sent, Esc to quit", exit_on_cancel=False
+            )
+            if selected is None:
+                break
+            method, path = endpoint_index['operations'][selected]
+            schema = slices.get(selected)
+            if schema is None:
+                schema = slices[selected] = load_operation_slice(endpoint_index, selected)
+            print(header(f"{method} {path}"), file=sys.stderr)
+            print("", file=sys.stderr)
+
+            prefetcher = api_explorer.start_uuid_prefetch(endpoint_index, schema, path, method, required_headers,
+                                                          full_schema, client_known=headers is not None)
+            full_schema = None
+            try:
+                if headers is None:
+                    headers = api_explorer.prompt_required_headers(required_headers)
+                url, request_headers, body = api_explorer.prompt_for_request(config, schema, path, method, headers)
+            except KeyboardInterrupt:
+                print("", file=sys.stderr)
+                print(info("Request cancelled"), file=sys.stderr)
+                continue
+            except EOFError:
+                break
+            finally:
+                prefetcher.shutdown()
+
+            last_command = api_explorer.format_command(config, url, method, request_headers, body)
+            print(info(last_command), file=sys.stderr)
+            if auth_headers is None:
+                auth_headers = get_auth_headers(config)
+            response, elapsed, auth_headers = send_request(http, config, auth_headers, method, url,
+                                                           request_headers, body)
+            sent += 1
+            if response is None:
+                continue
+            print_response(response, elapsed)
+            try:
+                response_values.add_response(method, path, json_codec.loads(response.content))
+            except json_codec.DecodeError:
+                pass
+
+    api_explorer.set_response_values(None)
+    print(info(f"Session ended: {sent} request(s) sent"), file=sys.stderr)
+    if last_command:
+        print(last_command)
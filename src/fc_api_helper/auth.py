@@ -3,6 +3,8 @@
 import sys
 import getpass
 import requests
+from fc_api_helper import aio
+from fc_api_helper.profiling import span
 
 
 # Import ENV_CONFIG to avoid duplication
@@ -13,6 +15,24 @@ def get_auth_url(environment):
     return f"{base_url}/api/api-token-auth/"
 
 
+async def request_token(auth_url, email, password):
+    """Request a BE API token.
+
+    Returns:
+        requests.Response of the token endpoint
+
+    Raises:
+        requests.exceptions.RequestException: The request failed
+    """
+    with span('auth'):
+        return await aio.http_request(
+            'POST',
+            auth_url,
+            json={"email": email, "password": password},
+            headers={"Content-Type": "application/json"}
+        )
+
+
 def authenticate_be(api_key_file, environment='local'):
     """Authenticate with BE API and save token.
 
@@ -33,11 +53,7 @@ def authenticate_be(api_key_file, environment='local'):
         sys.exit(1)
 
     try:
-        response = requests.post(
-            auth_url,
-            json={"email": email, "password": password},
-            headers={"Content-Type": "application/json"}
-        )
+        response = aio.run(request_token(auth_url, email, password))
 
         if response.status_code != 200:
             print(f"Error: Authentication failed (HTTP {response.status_code})", file=sys.stderr)
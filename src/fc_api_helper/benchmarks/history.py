@@ -0,0 +1,94 @@
+"""Benchmark result history and regression comparison."""
+
+import json
+import os
+import platform
+import subprocess
+import time
+
+
+HISTORY_FILE = os.path.expanduser('~/.cache/fc-api-helper/bench-history.json')
+
+
+def get_git_revision():
+    """Return the current git revision of the package checkout, if any."""
+    try:
+        result = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+        )
+    except FileNotFoundError:
+        return None
+    return result.stdout.strip() or None
+
+
+def load_history(history_file=HISTORY_FILE):
+    """Load the list of recorded benchmark runs (oldest first)."""
+    try:
+        with open(history_file, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return []
+
+
+def save_run(results, history_file=HISTORY_FILE, label=None):
+    """Append a benchmark run to the history file.
+
+    Args:
+        results: Dict returned by run_suite
+        history_file: Path of the JSON history file
+        label: Optional free-form label for the run
+
+    Returns:
+        The run entry that was saved
+    """
+    run = {
+        'timestamp': int(time.time()),
+        'revision': get_git_revision(),
+        'python': platform.python_version(),
+        'label': label,
+        'results': results,
+    }
+
+    history = load_history(history_file)
+    history.append(run)
+
+    history_dir = os.path.dirname(history_file)
+    if history_dir:
+        os.makedirs(history_dir, exist_ok=True)
+    with open(history_file, 'w') as f:
+        json.dump(history, f, indent=2)
+
+    return run
+
+
+def compare_runs(baseline, current, threshold=0.10):
+    """Compare two runs case by case using the minimum timing.
+
+    Args:
+        baseline: Earlier run entry
+        current: Later run entry
+        threshold: Relative slowdown above which a case is a regression
+
+    Returns:
+        List of (case, baseline_seconds, current_seconds, ratio, status)
+        tuples where status is 'regression', 'improvement', 'ok' or 'new'
+    """
+    rows = []
+    for key, result in current['results'].items():
+        before = baseline['results'].get(key)
+        if before is None:
+            rows.append((key, None, result['min'], None, 'new'))
+            continue
+
+        ratio = result['min'] / before['min'] if before['min'] else 1.0
+        if ratio > 1 + threshold:
+            status = 'regression'
+        elif ratio < 1 - threshold:
+            status = 'improvement'
+        else:
+            status = 'ok'
+        rows.append((key, before['min'], result['min'], ratio, status))
+    return rows
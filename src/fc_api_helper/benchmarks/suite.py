@@ -0,0 +1,233 @@
+"""Benchmark cases for schema handling and fc-uuid query building."""
+
+import csv
+import io
+import json
+import os
+import statistics
+import subprocess
+import tempfile
+import time
+
+from fc_api_helper import api_explorer, completion, curl_wrapper, endpoint_index, fake_payloads, json_codec, json_select, search_index
+from fc_api_helper.benchmarks.synthetic import make_schema, make_psql_output
+from fc_api_helper.cli import fc_uuid
+from fc_api_helper.table_config import TABLE_CONFIG
+
+
+# Schema sizes (number of paths) benchmarked by default
+DEFAULT_SIZES = (100, 1000, 10000)
+
+# Rows of COPY CSV output parsed per TABLE_CONFIG entry
+ROWS_PER_TABLE = 200
+
+# Registered benchmark cases: list of (name, per_size, setup)
+CASES = []
+
+
+def case(name, per_size=True):
+    """Register a benchmark case.
+
+    The decorated setup function receives the schema context (or None for
+    size-independent cases) and returns the zero-argument callable to time.
+    """
+    def decorator(setup):
+        CASES.append((name, per_size, setup))
+        return setup
+    return decorator
+
+
+def time_callable(func, repeat):
+    """Time func repeat times.
+
+    Returns:
+        Dict with min/median/max seconds and the repeat count
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'max': max(timings),
+        'repeat': repeat,
+    }
+
+
+@case('load_schema')
+def _load_schema(ctx):
+    return lambda: api_explorer.load_schema(ctx['schema_file'], '', '')
+
+
+@case('json_loads_stdlib')
+def _json_loads_stdlib(ctx):
+    return lambda: json.loads(ctx['schema_bytes'])
+
+
+@case('json_loads')
+def _json_loads(ctx):
+    # Active json_codec backend (compare with json_loads_stdlib)
+    return lambda: json_codec.loads(ctx['schema_bytes'])
+
+
+@case('format_json_output_stdlib')
+def _format_json_output_stdlib(ctx):
+    return lambda: json.dumps(json.loads(ctx['response_text']), indent=2)
+
+
+@case('format_json_output')
+def _format_json_output(ctx):
+    return lambda: curl_wrapper.format_json_output(ctx['response_text'])
+
+
+@case('json_select')
+def _json_select(ctx):
+    # Streaming --select of one field per list element (compare with format_json_output)
+    return lambda: json_select.select_values('results[*].type', ctx['response_text'])
+
+
+@case('fake_payloads', per_size=False)
+def _fake_payloads(ctx):
+    # 1000 requests for a write operation with nested $ref objects and arrays
+    schema = make_schema(10)
+    path, method = next((path, method) for path, details in schema['paths'].items()
+                        for method in details if method in ('post', 'put', 'patch'))
+    generate = fake_payloads.compile_operation_generator(schema, path, method, seed=1)
+    return lambda: fake_payloads.write_payloads(io.BytesIO(), generate, 1000)
+
+
+@case('merge_schemas')
+def _merge_schemas(ctx):
+    entries = [
+        {'schema': ctx['schema'], 'path_prefix': ''},
+        {'schema': ctx['schema'], 'path_prefix': '/v2'},
+    ]
+    return lambda: api_explorer.merge_schemas(entries)
+
+
+@case('render_index')
+def _render_index(ctx):
+    return lambda: endpoint_index.render_index(ctx['schema'])
+
+
+@case('render_search_index')
+def _render_search_index(ctx):
+    return lambda: search_index.render_search_index(ctx['schema'])
+
+
+@case('search_index')
+def _search_index(ctx):
+    # A three-word query with one prefix word, against the index on disk
+    search_file = os.path.splitext(ctx['schema_file'])[0] + '.search.txt'
+    with open(search_file, 'wb') as f:
+        f.write(search_index.render_search_index(ctx['schema']))
+    return lambda: search_index.search_index_file(search_file, 'create resource amou')
+
+
+@case('render_completion_paths')
+def _render_completion_paths(ctx):
+    return lambda: completion.render_completion_paths(ctx['schema'])
+
+
+@case('complete_url')
+def _complete_url(ctx):
+    # What a TAB costs in the completion scripts: one awk process over paths.txt
+    paths_file = os.path.splitext(ctx['schema_file'])[0] + '.paths.txt'
+    with open(paths_file, 'wb') as f:
+        f.write(completion.render_completion_paths(ctx['schema']))
+    command = ['awk', '-v', 'base=http://localhost:8080', '-v', 'typed=/api/resource-1/x/items/?p',
+               completion.AWK_PROGRAM, paths_file]
+    return lambda: subprocess.run(command, stdout=subprocess.DEVNULL, check=True)
+
+
+@case('generate_body_with_comments')
+def _generate_body_with_comments(ctx):
+    schema = ctx['schema']
+    bodies = [
+        (api_explorer.get_request_body_schema(schema, path, 'post'), path)
+        for path in schema['paths']
+    ]
+
+    def run():
+        for body_schema, path in bodies:
+            api_explorer.generate_body_with_comments(body_schema, schema, 'post', path)
+    return run
+
+
+@case('resolve_ref')
+def _resolve_ref(ctx):
+    schema = ctx['schema']
+    refs = [f'#/components/schemas/{name}' for name in schema['components']['schemas']]
+
+    def run():
+        for ref in refs:
+            api_explorer.resolve_ref(schema, ref)
+    return run
+
+
+@case('build_client_filtered_query', per_size=False)
+def _build_client_filtered_query(ctx):
+    tables = list(TABLE_CONFIG)
+
+    def run():
+        for table in tables:
+            fc_uuid.build_client_filtered_query(table, 'nJr4WoFWwrc5D2HUaMszqf', 't.uuid')
+    return run
+
+
+@case('parse_uuid_rows', per_size=False)
+def _parse_uuid_rows(ctx):
+    outputs = [make_psql_output(ROWS_PER_TABLE, seed=i) for i in range(len(TABLE_CONFIG))]
+
+    def run():
+        for output in outputs:
+            for _ in fc_uuid.parse_uuid_rows(csv.reader(io.StringIO(output, newline=''))):
+                pass
+    return run
+
+
+def run_suite(sizes=DEFAULT_SIZES, repeat=5, selected=None, progress=None):
+    """Run all benchmark cases.
+
+    Args:
+        sizes: Iterable of schema sizes (number of paths)
+        repeat: Number of timed repetitions per case
+        selected: Optional set of case names to run
+        progress: Optional callable receiving (key, result) after each case
+
+    Returns:
+        Dict mapping "case[size]" (or "case" for size-independent cases)
+        to timing results
+    """
+    results = {}
+
+    def record(key, setup, ctx):
+        result = time_callable(setup(ctx), repeat)
+        results[key] = result
+        if progress:
+            progress(key, result)
+
+    for name, per_size, setup in CASES:
+        if not per_size and (not selected or name in selected):
+            record(name, setup, None)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in sizes:
+            schema = make_schema(size)
+            schema_file = os.path.join(tmp_dir, f'schema-{size}.json')
+            with open(schema_file, 'w') as f:
+                json.dump(schema, f)
+            with open(schema_file, 'rb') as f:
+                schema_bytes = f.read()
+            # A list response of one item per path (as returned by be-curl)
+            response_text = json.dumps({'count': size, 'results': list(schema['components']['schemas'].values())[:size]})
+            ctx = {'schema': schema, 'schema_file': schema_file, 'schema_bytes': schema_bytes,
+                   'response_text': response_text}
+
+            for name, per_size, setup in CASES:
+                if per_size and (not selected or name in selected):
+                    record(f'{name}[{size}]', setup, ctx)
+
+    return results
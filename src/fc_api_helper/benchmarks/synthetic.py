@@ -0,0 +1,115 @@
+"""Synthetic OpenAPI schemas and psql output for benchmarks."""
+
+import random
+import uuid
+
+
+# Depth of the $ref chain hanging off every request body
+REF_DEPTH = 6
+
+
+def _component(name, next_ref, rng):
+    """Build one component schema, optionally pointing at the next one."""
+    properties = {
+        'uuid': {'type': 'string', 'format': 'uuid', 'description': f'{name} identifier'},
+        'name': {'type': 'string', 'description': f'Name of the {name}'},
+        'amount': {'type': 'number', 'description': 'Amount in base currency'},
+        'count': {'type': 'integer'},
+        'is_active': {'type': 'boolean'},
+        'status': {'type': 'string', 'enum': ['draft', 'pending', 'done']},
+        'tags': {'type': 'array', 'items': {'type': 'string'}},
+        'fund_uuid': {'type': 'string', 'description': 'Fund UUID'},
+    }
+    if next_ref:
+        properties['child'] = {'$ref': f'#/components/schemas/{next_ref}'}
+        properties['children'] = {'type': 'array', 'items': {'$ref': f'#/components/schemas/{next_ref}'}}
+
+    for i in range(rng.randint(0, 6)):
+        properties[f'extra_field_{i}'] = {'type': rng.choice(['string', 'integer', 'number', 'boolean'])}
+
+    return {
+        'type': 'object',
+        'required': ['name', 'uuid'],
+        'properties': properties,
+    }
+
+
+def make_schema(path_count, seed=0):
+    """Build a synthetic OpenAPI schema.
+
+    Every path has a GET and a POST operation; each POST body references
+    the head of a REF_DEPTH-deep $ref chain of components.
+
+    Args:
+        path_count: Number of paths to generate
+        seed: Random seed for reproducible schemas
+
+    Returns:
+        OpenAPI schema dict
+    """
+    rng = random.Random(seed)
+    paths = {}
+    components = {}
+
+    for i in range(path_count):
+        chain = [f'Resource{i}Level{d}' for d in range(REF_DEPTH)]
+        for depth, name in enumerate(chain):
+            next_ref = chain[depth + 1] if depth + 1 < REF_DEPTH else None
+            components[name] = _component(name, next_ref, rng)
+
+        path = f'/api/resource-{i}/{{uuid}}/items/'
+        parameters = [
+            {'name': 'uuid', 'in': 'path', 'required': True, 'schema': {'type': 'string'}},
+            {'name': 'page', 'in': 'query', 'schema': {'type': 'integer'}},
+            {'name': 'search', 'in': 'query', 'schema': {'type': 'string'},
+             'description': 'A search term.'},
+        ]
+        paths[path] = {
+            'get': {
+                'operationId': f'resource_{i}_list',
+                'summary': f'List items of resource {i}\nLonger description line. ' * 3,
+                'tags': [f'resource-{i % 20}'],
+                'parameters': parameters,
+            },
+            'post': {
+                'operationId': f'resource_{i}_create',
+                'description': f'Create an item for resource {i}',
+                'tags': [f'resource-{i % 20}'],
+                'parameters': parameters[:1],
+                'requestBody': {
+                    'content': {
+                        'application/json': {
+                            'schema': {'$ref': f'#/components/schemas/{chain[0]}'},
+                        },
+                    },
+                },
+            },
+        }
+
+    return {
+        'openapi': '3.0.3',
+        'info': {'title': f'Synthetic API ({path_count} paths)', 'version': '1.0.0'},
+        'paths': paths,
+        'components': {'schemas': components},
+    }
+
+
+def make_psql_output(row_count, seed=0):
+    """Build COPY ... (FORMAT csv) style "uuid,identifier" output.
+
+    Args:
+        row_count: Number of rows to generate
+        seed: Random seed for reproducible output
+
+    Returns:
+        String as produced by psql for a two column COPY TO STDOUT
+    """
+    rng = random.Random(seed)
+    lines = []
+    for i in range(row_count):
+        identifier = f'Identifier {i} ' + 'x' * rng.randint(0, 40)
+        if rng.random() < 0.1:
+            # Some identifiers need CSV quoting
+            identifier = f'"{identifier}, ""quoted""\nline"'
+        lines.append(f'{uuid.UUID(int=rng.getrandbits(128))},{identifier}')
+    return '\n'.join(lines) + '\n'
@@ -4,7 +4,9 @@ import os
 import sys
 import argparse
 from fc_api_helper.api_explorer import run_api_explorer
-from fc_api_helper.schema_refresh import fetch_openapi_schema
+from fc_api_helper.api_session import run_api_session
+from fc_api_helper.schema_refresh import fetch_openapi_schemas
+from fc_api_helper.profiling import profiled
 
 
 # Environment configurations for BE API
@@ -42,6 +44,7 @@ ENV_CONFIG = {
 }
 
 
+@profiled('be-api')
 def main():
     """Run BE API explorer."""
     parser = argparse.ArgumentParser(description='BE API explorer')
@@ -49,13 +52,31 @@ def main():
                        help='Refresh schema cache before running')
     parser.add_argument('--env', choices=['local', 'test'], default='local',
                        help='Environment to use (default: local)')
+    parser.add_argument('--fake', type=int, metavar='N',
+                       help='Write N fake requests for the selected endpoint to a JSON Lines file '
+                            '(for --batch) instead of building one command')
+    parser.add_argument('--fake-output', metavar='FILE',
+                       help='File written by --fake (default: fake-<method>-<path>.jsonl)')
+    parser.add_argument('--seed', type=int,
+                       help='Seed for --fake, for reproducible payloads')
+    parser.add_argument('--search', metavar='QUERY',
+                       help='List only the endpoints matching QUERY (summaries, descriptions, '
+                            'paths, parameters, body fields, tags), best match first')
+    parser.add_argument('--session', action='store_true',
+                       help='Pick and send requests in a loop, keeping the schema, headers, token '
+                            'and connections (and offering the UUIDs of earlier responses)')
     args = parser.parse_args()
+    if args.fake is not None and args.fake < 1:
+        parser.error('--fake must be at least 1')
+    if args.session and args.fake is not None:
+        parser.error('--session cannot be combined with --fake')
 
     env_config = ENV_CONFIG[args.env]
     config = {
         'schemas': env_config['schemas'],
         'base_url': env_config['base_url'],
         'curl_command': 'be-curl',
+        'service': 'be',
         'environment': args.env,
         'required_headers': [
             {
@@ -67,15 +88,15 @@ def main():
 
     if args.refresh:
         print(f"Refreshing cache for environment: {args.env}", file=sys.stderr)
-        for schema_config in config['schemas']:
-            fetch_openapi_schema(
-                schema_config['schema_url'],
-                schema_config['cache_file'],
-                config['base_url']
-            )
+        fetch_openapi_schemas(config['schemas'], config['base_url'])
         print("", file=sys.stderr)
 
-    run_api_explorer(config, refresh=args.refresh)
+    if args.session:
+        run_api_session(config, search=args.search)
+        return
+
+    run_api_explorer(config, refresh=args.refresh, fake=args.fake, fake_output=args.fake_output, seed=args.seed,
+                     search=args.search)
 
 
 if __name__ == '__main__':
@@ -1,17 +1,66 @@
 """BE curl wrapper CLI entry point."""
 
 import argparse
-from fc_api_helper.curl_wrapper import run_curl_with_token_auth
+from fc_api_helper.completion import SHELLS, completion_script, get_completion_targets
+from fc_api_helper.curl_wrapper import ENV_CONFIG, run_batch, run_curl_with_token_auth, run_fanout_with_token_auth
+from fc_api_helper.json_diff import VOLATILE_FIELDS
+from fc_api_helper.profiling import profiled
+from fc_api_helper.request_scheduler import DEFAULT_CONCURRENCY, DEFAULT_RATE
 
 
+def parse_environments(value):
+    """Parse a comma-separated --env value into known environment names."""
+    environments = [env.strip() for env in value.split(',') if env.strip()]
+    unknown = [env for env in environments if env not in ENV_CONFIG]
+    if not environments or unknown:
+        raise argparse.ArgumentTypeError(
+            f"invalid environment: {', '.join(unknown) or value!r} (choose from {', '.join(ENV_CONFIG)})")
+    return list(dict.fromkeys(environments))
+
+
+@profiled('be-curl')
 def main():
     """Execute curl with BE API authentication."""
     parser = argparse.ArgumentParser(description='BE curl wrapper with authentication')
-    parser.add_argument('--env', choices=['local', 'test'], default='local',
-                       help='Environment to use (default: local)')
+    parser.add_argument('--env', type=parse_environments, default=['local'],
+                       help='Environment to use (default: local); a comma-separated list '
+                            '(e.g. local,test) sends the request to each and diffs the responses')
+    parser.add_argument('--record', metavar='CASSETTE',
+                       help='Append the request/response pair to a cassette file')
+    parser.add_argument('--select', metavar='EXPR',
+                       help="Print only the matching values of the JSON response, one per line "
+                            "(e.g. 'results[*].uuid')")
+    parser.add_argument('--ignore', metavar='PATTERN', action='append', default=[],
+                       help='Key or path glob left out of the multi-environment diff, in addition to '
+                            f"{', '.join(VOLATILE_FIELDS)} (repeatable)")
+    parser.add_argument('--batch', metavar='FILE',
+                       help="Send every request of FILE ('-' for stdin; JSON Lines or 'METHOD URL [BODY]' "
+                            "lines) with rate limiting and adaptive concurrency; results are printed "
+                            "as JSON Lines")
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE,
+                       help=f'Batch requests per second (default: {DEFAULT_RATE:g}, 0: unlimited)')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                       help=f'Maximum batch requests in flight (default: {DEFAULT_CONCURRENCY})')
+    parser.add_argument('--completion', choices=SHELLS,
+                       help='Print the shell completion script (URL paths from the endpoint index)')
     args, _ = parser.parse_known_args()
 
-    run_curl_with_token_auth(environment=args.env)
+    if args.completion:
+        # Imported lazily: the explorer CLI is only needed for its environments
+        from fc_api_helper.cli.be_api import ENV_CONFIG as API_ENV_CONFIG
+        options = [option for action in parser._actions for option in action.option_strings]
+        print(completion_script(args.completion, 'be-curl',
+                                get_completion_targets('be', API_ENV_CONFIG), options), end='')
+    elif args.batch:
+        if len(args.env) > 1:
+            parser.error('--batch takes a single --env')
+        run_batch('be', environment=args.env[0], batch_file=args.batch, rate=args.rate,
+                  concurrency=args.concurrency, select=args.select, record=args.record)
+    elif len(args.env) > 1:
+        run_fanout_with_token_auth(args.env, record=args.record, select=args.select,
+                                   ignore=VOLATILE_FIELDS + tuple(args.ignore))
+    else:
+        run_curl_with_token_auth(environment=args.env[0], record=args.record, select=args.select)
 
 
 if __name__ == '__main__':
@@ -1,17 +1,46 @@
 """DPL curl wrapper CLI entry point."""
 
 import argparse
-from fc_api_helper.curl_wrapper import run_curl_with_api_key
+from fc_api_helper.completion import SHELLS, completion_script, get_completion_targets
+from fc_api_helper.curl_wrapper import run_batch, run_curl_with_api_key
+from fc_api_helper.profiling import profiled
+from fc_api_helper.request_scheduler import DEFAULT_CONCURRENCY, DEFAULT_RATE
 
 
+@profiled('dpl-curl')
 def main():
     """Execute curl with DPL API authentication."""
     parser = argparse.ArgumentParser(description='DPL curl wrapper with authentication')
     parser.add_argument('--env', choices=['local', 'test'], default='local',
                        help='Environment to use (default: local)')
+    parser.add_argument('--record', metavar='CASSETTE',
+                       help='Append the request/response pair to a cassette file')
+    parser.add_argument('--select', metavar='EXPR',
+                       help="Print only the matching values of the JSON response, one per line "
+                            "(e.g. 'results[*].uuid')")
+    parser.add_argument('--batch', metavar='FILE',
+                       help="Send every request of FILE ('-' for stdin; JSON Lines or 'METHOD URL [BODY]' "
+                            "lines) with rate limiting and adaptive concurrency; results are printed "
+                            "as JSON Lines")
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE,
+                       help=f'Batch requests per second (default: {DEFAULT_RATE:g}, 0: unlimited)')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                       help=f'Maximum batch requests in flight (default: {DEFAULT_CONCURRENCY})')
+    parser.add_argument('--completion', choices=SHELLS,
+                       help='Print the shell completion script (URL paths from the endpoint index)')
     args, _ = parser.parse_known_args()
 
-    run_curl_with_api_key(environment=args.env)
+    if args.completion:
+        # Imported lazily: the explorer CLI is only needed for its environments
+        from fc_api_helper.cli.dpl_api import ENV_CONFIG as API_ENV_CONFIG
+        options = [option for action in parser._actions for option in action.option_strings]
+        print(completion_script(args.completion, 'dpl-curl',
+                                get_completion_targets('dpl', API_ENV_CONFIG), options), end='')
+    elif args.batch:
+        run_batch('dpl', environment=args.env, batch_file=args.batch, rate=args.rate,
+                  concurrency=args.concurrency, select=args.select, record=args.record)
+    else:
+        run_curl_with_api_key(environment=args.env, record=args.record, select=args.select)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,124 @@
+"""fc-api-bench CLI entry point: run and compare performance benchmarks."""
+
+import argparse
+import sys
+from fc_api_helper.colors import error, info, success, label
+from fc_api_helper.benchmarks.suite import DEFAULT_SIZES, run_suite
+from fc_api_helper.benchmarks.history import HISTORY_FILE, load_history, save_run, compare_runs
+from fc_api_helper.profiling import profiled
+
+
+def format_seconds(seconds):
+    """Format a duration with a readable unit."""
+    if seconds is None:
+        return '-'
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f}µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds:.3f}s"
+
+
+def print_comparison(rows):
+    """Print a comparison table and return the number of regressions."""
+    regressions = 0
+    width = max((len(row[0]) for row in rows), default=10)
+
+    for key, before, after, ratio, status in rows:
+        change = f"{(ratio - 1) * 100:+.1f}%" if ratio is not None else 'new'
+        line = f"{key:<{width}}  {format_seconds(before):>10}  {format_seconds(after):>10}  {change:>8}"
+        if status == 'regression':
+            regressions += 1
+            print(error(f"{line}  REGRESSION"))
+        elif status == 'improvement':
+            print(success(line))
+        else:
+            print(line)
+
+    return regressions
+
+
+def cmd_run(args):
+    """Run the benchmark suite and optionally save it to the history."""
+    sizes = [int(s) for s in args.sizes.split(',')] if args.sizes else DEFAULT_SIZES
+    selected = set(args.case) if args.case else None
+
+    def progress(key, result):
+        print(f"{key:<40} min {format_seconds(result['min']):>10}  "
+              f"median {format_seconds(result['median']):>10}", file=sys.stderr)
+
+    results = run_suite(sizes=sizes, repeat=args.repeat, selected=selected, progress=progress)
+
+    if args.no_save:
+        return 0
+
+    history = load_history(args.history)
+    run = save_run(results, args.history, label=args.label)
+    print(success(f"✓ Saved run to {args.history}"), file=sys.stderr)
+
+    if history:
+        print("", file=sys.stderr)
+        print(label("Compared with previous run:"))
+        regressions = print_comparison(compare_runs(history[-1], run, args.threshold))
+        return 1 if regressions and args.fail_on_regression else 0
+    return 0
+
+
+def cmd_compare(args):
+    """Compare two runs from the history (default: the last two)."""
+    history = load_history(args.history)
+    if len(history) < 2:
+        print(info(f"Need at least two runs in {args.history} to compare"), file=sys.stderr)
+        return 1
+
+    try:
+        baseline = history[args.baseline]
+        current = history[args.current]
+    except IndexError:
+        print(error(f"Error: History has only {len(history)} runs"), file=sys.stderr)
+        return 1
+
+    print(label(f"Baseline: {baseline.get('revision') or '?'} ({baseline.get('label') or 'no label'})"))
+    print(label(f"Current:  {current.get('revision') or '?'} ({current.get('label') or 'no label'})"))
+    regressions = print_comparison(compare_runs(baseline, current, args.threshold))
+
+    if regressions:
+        print(error(f"{regressions} regression(s) above {args.threshold:.0%}"), file=sys.stderr)
+        return 1
+    return 0
+
+
+@profiled('fc-api-bench')
+def main():
+    """Run or compare fc-api-helper benchmarks."""
+    parser = argparse.ArgumentParser(description='fc-api-helper performance benchmarks')
+    parser.add_argument('--history', default=HISTORY_FILE,
+                       help=f'Benchmark history file (default: {HISTORY_FILE})')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                       help='Relative slowdown flagged as regression (default: 0.10)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='Run the benchmark suite')
+    run_parser.add_argument('--sizes', help='Comma-separated schema sizes (default: 100,1000,10000)')
+    run_parser.add_argument('--repeat', type=int, default=5, help='Repetitions per case (default: 5)')
+    run_parser.add_argument('--case', action='append', help='Only run this case (repeatable)')
+    run_parser.add_argument('--label', help='Label stored with the run')
+    run_parser.add_argument('--no-save', action='store_true', help='Do not write the run to the history')
+    run_parser.add_argument('--fail-on-regression', action='store_true',
+                           help='Exit with status 1 when the run regresses against the previous one')
+
+    compare_parser = subparsers.add_parser('compare', help='Compare two runs from the history')
+    compare_parser.add_argument('--baseline', type=int, default=-2,
+                               help='History index of the baseline run (default: -2)')
+    compare_parser.add_argument('--current', type=int, default=-1,
+                               help='History index of the run to check (default: -1)')
+
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        sys.exit(cmd_run(args))
+    sys.exit(cmd_compare(args))
+
+
+if __name__ == '__main__':
+    main()
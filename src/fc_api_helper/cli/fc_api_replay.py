@@ -0,0 +1,76 @@
+"""fc-api-replay CLI entry point: serve recorded cassettes offline."""
+
+import argparse
+import sys
+import time
+from urllib.parse import urlsplit
+from fc_api_helper.curl_wrapper import ENV_CONFIG
+from fc_api_helper.replay import load_cassettes, ReplayStore, start_replay_server
+from fc_api_helper.cli.be_api import ENV_CONFIG as BE_API_CONFIG
+from fc_api_helper.cli.dpl_api import ENV_CONFIG as DPL_API_CONFIG
+from fc_api_helper.profiling import profiled
+
+
+def get_schema_files(service, environment):
+    """Map schema URL paths to cached schema files so be-api/dpl-api work offline."""
+    api_config = BE_API_CONFIG if service == 'be' else DPL_API_CONFIG
+    schemas = api_config.get(environment, {}).get('schemas', [])
+    return {urlsplit(s['schema_url']).path: s['cache_file'] for s in schemas}
+
+
+@profiled('fc-api-replay')
+def main():
+    """Serve recorded request/response pairs at the ENV_CONFIG base URLs."""
+    parser = argparse.ArgumentParser(description='Offline replay server for recorded be-curl/dpl-curl cassettes')
+    parser.add_argument('cassettes', nargs='+', help='Cassette files written with --record')
+    parser.add_argument('--env', choices=['local', 'test'], default='local',
+                       help='Environment whose base URL ports to bind (default: local)')
+    parser.add_argument('--service', choices=['be', 'dpl', 'all'], default='all',
+                       help='Service to replay (default: all)')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to bind (default: 127.0.0.1)')
+    parser.add_argument('--be-port', type=int,
+                       help='Port serving BE (default: the port of its http base URL)')
+    parser.add_argument('--dpl-port', type=int,
+                       help='Port serving DPL (default: the port of its http base URL)')
+    parser.add_argument('--latency-scale', type=float, default=1.0,
+                       help='Multiplier for recorded latencies, 0 to disable (default: 1.0)')
+    args = parser.parse_args()
+
+    services = ['be', 'dpl'] if args.service == 'all' else [args.service]
+
+    servers = []
+    for service in services:
+        base_url = urlsplit(ENV_CONFIG[args.env][service]['base_url'])
+        port = getattr(args, f'{service}_port')
+        if port is None:
+            # The replay server speaks plain HTTP only
+            if base_url.scheme != 'http':
+                print(f"Error: The {args.env} {service} base URL is {base_url.scheme}; "
+                      f"pass --{service}-port to replay it over http", file=sys.stderr)
+                sys.exit(1)
+            port = base_url.port or 80
+        exchanges = load_cassettes(args.cassettes, service=service)
+        store = ReplayStore(exchanges, static_files=get_schema_files(service, args.env))
+
+        try:
+            servers.append(start_replay_server(args.host, port, store, args.latency_scale))
+        except OSError as e:
+            print(f"Error: Could not bind {args.host}:{port} for {service}: {e}", file=sys.stderr)
+            sys.exit(1)
+
+        count = sum(len(v) for v in exchanges.values())
+        replay_url = f"http://{args.host}:{port}"
+        print(f"✓ Replaying {count} {service} exchanges on {replay_url}", file=sys.stderr)
+        if replay_url != ENV_CONFIG[args.env][service]['base_url']:
+            print(f"  Send requests to it with full URLs: {service}-curl {replay_url}/api/...", file=sys.stderr)
+
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        for server in servers:
+            server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,235 @@
+"""Shell completion of be-curl/dpl-curl URLs from the endpoint index.
+
+The endpoint index holds paths.txt, the sorted list of every schema path
+(a flattened path trie), plus one "<path>?<name>" line per query parameter:
+
+    /api/funds/
+    /api/funds/{uuid}/
+    /api/funds/{uuid}/nav/
+    /api/funds/?search
+
+The completion scripts (`be-curl --completion zsh|bash`) never start Python:
+on TAB a single awk pass over paths.txt matches the typed segments, where
+any value matches a {param} segment, and prints the possible next segments
+(or query parameter names after "?" or "&").
+"""
+
+import os
+import shlex
+
+
+COMPLETION_FILE = 'paths.txt'
+
+SHELLS = ('bash', 'zsh')
+
+# Prints the completions of typed (a path, possibly with a query string) as
+# base + completed path. No single quotes: it is inlined in the scripts.
+AWK_PROGRAM = r'''
+BEGIN {
+    if (typed == "") typed = "/"
+    q = index(typed, "?")
+    if (q) {
+        name = substr(typed, q + 1)
+        sub(/.*&/, "", name)
+        wanted = split(substr(typed, 1, q - 1), want, "/")
+    } else {
+        wanted = split(typed, want, "/")
+        name = want[wanted]
+    }
+    head = substr(typed, 1, length(typed) - length(name))
+}
+function same(segment, typed_segment) {
+    return segment == typed_segment || (segment ~ /^[{].*[}]$/ && typed_segment != "")
+}
+{
+    p = index($0, "?")
+    if (q) {
+        if (!p) next
+        count = split(substr($0, 1, p - 1), segments, "/")
+        if (count != wanted) next
+        for (i = 2; i <= count; i++) if (!same(segments[i], want[i])) next
+        candidate = substr($0, p + 1) "="
+    } else {
+        if (p) next
+        count = split($0, segments, "/")
+        if (count < wanted || segments[wanted] == "") next
+        for (i = 2; i < wanted; i++) if (!same(segments[i], want[i])) next
+        candidate = segments[wanted] (wanted < count ? "/" : "")
+    }
+    if (index(candidate, name) != 1 || candidate in seen) next
+    seen[candidate] = 1
+    print base head candidate
+}
+'''
+
+URLS_FUNCTION = '''{function}() {{
+    # $1: word to complete, $2: environment
+    local word="$1" env="$2" base="" url_path="" rest="" file="" url
+    case "$word" in
+        *://*/*)
+            rest="${{word#*://}}"
+            base="${{word%%://*}}://${{rest%%/*}}"
+            url_path="/${{rest#*/}}"
+            ;;
+        /*)
+            url_path="$word"
+            ;;
+        *)
+            for url in {urls}; do
+                case "$url" in "$word"*) printf '%s/\\n' "$url" ;; esac
+            done
+            return
+            ;;
+    esac
+    case "$base" in
+{base_cases}
+        *)
+            case "$env" in
+{env_cases}
+            esac
+            ;;
+    esac
+    [ -r "$file" ] && awk -v base="$base" -v typed="$url_path" '{awk}' "$file"
+}}
+'''
+
+BASH_SCRIPT = '''# {command} completion for bash (generated by `{command} --completion bash`)
+{urls_function}
+_{name}() {{
+    local cur="${{COMP_WORDS[COMP_CWORD]}}" line="${{COMP_LINE:0:COMP_POINT}}" env=local
+    local env_pattern='--env[= ]+([a-z]+)' word
+    if [[ "${{COMP_WORDS[COMP_CWORD-1]}}" == --env ]]; then
+        COMPREPLY=($(compgen -W "{environments}" -- "$cur"))
+        return
+    fi
+    [[ "$COMP_LINE" =~ $env_pattern ]] && env="${{BASH_REMATCH[1]}}"
+    word="${{line##*[[:space:]]}}"
+    word="${{word#[\\"\\']}}"
+    case "$word" in
+        -*)
+            COMPREPLY=($(compgen -W "{options}" -- "$cur"))
+            return
+            ;;
+    esac
+    local IFS=$'\\n'
+    local candidates=($({urls_name} "$word" "$env"))
+    # bash splits URLs at ':' and '=' (COMP_WORDBREAKS): complete the last piece
+    local prefix="${{word%"$cur"}}"
+    COMPREPLY=("${{candidates[@]#"$prefix"}}")
+}}
+complete -o nospace -o default -F _{name} {command}
+'''
+
+ZSH_SCRIPT = '''#compdef {command}
+# {command} completion for zsh (generated by `{command} --completion zsh`)
+{urls_function}
+_{name}() {{
+    local word="${{(Q)PREFIX}}" env=local env_pattern='--env[= ]+([a-z]+)'
+    local -a candidates
+    if [[ "${{words[CURRENT-1]}}" == --env ]]; then
+        compadd -- {environments}
+        return
+    fi
+    [[ "${{words[*]}}" =~ $env_pattern ]] && env="${{match[1]}}"
+    case "$word" in
+        -*)
+            compadd -- {options}
+            return
+            ;;
+    esac
+    candidates=(${{(f)"$({urls_name} "$word" "$env")"}})
+    if (( ${{#candidates}} )); then
+        compadd -S '' -- "${{candidates[@]}}"
+    else
+        _files
+    fi
+}}
+# Autoloaded from $fpath as _{command}, or sourced
+if [[ "${{funcstack[1]}}" == _{command} ]]; then
+    _{name} "$@"
+else
+    compdef _{name} {command}
+fi
+'''
+
+
+def render_completion_paths(schema):
+    """Render paths.txt for a merged schema.
+
+    Returns:
+        The file contents (bytes): sorted paths and "<path>?<query parameter>" lines
+    """
+    # Imported lazily: endpoint_index imports this module
+    from fc_api_helper.endpoint_index import iter_operations
+
+    lines = set()
+    for _, path, details in iter_operations(schema):
+        lines.add(path)
+        for param in details.get('parameters') or ():
+            if isinstance(param, dict) and param.get('in') == 'query' and param.get('name'):
+                lines.add(f"{path}?{param['name']}")
+    lines = sorted(line for line in lines if not any(c.isspace() for c in line))
+    return ("\n".join(lines) + "\n").encode('utf-8') if lines else b""
+
+
+def get_completion_targets(service, api_env_config):
+    """Locate the completion file of every environment of a service.
+
+    Args:
+        service: 'be' or 'dpl'
+        api_env_config: ENV_CONFIG of the service's explorer CLI (schemas and
+            base URL of each environment)
+
+    Returns:
+        List of (environment, base URLs, paths.txt path); the base URLs are
+        the explorer's and the curl wrapper's
+    """
+    # Imported lazily: endpoint_index imports this module, and the explorers
+    # do not need the curl wrapper
+    from fc_api_helper.curl_wrapper import ENV_CONFIG
+    from fc_api_helper.endpoint_index import get_index_dir
+
+    targets = []
+    for environment, env_config in api_env_config.items():
+        base_urls = [env_config['base_url']]
+        curl_base_url = ENV_CONFIG.get(environment, {}).get(service, {}).get('base_url')
+        if curl_base_url and curl_base_url not in base_urls:
+            base_urls.append(curl_base_url)
+        targets.append((environment, base_urls, os.path.join(get_index_dir(env_config), COMPLETION_FILE)))
+    return targets
+
+
+def completion_script(shell, command, targets, options=()):
+    """Generate the completion script of a curl wrapper.
+
+    Args:
+        shell: 'bash' or 'zsh'
+        command: Command name (be-curl, dpl-curl)
+        targets: Result of get_completion_targets
+        options: Option names completed after '-'
+
+    Returns:
+        Script text, to eval or save in the shell's completion directory
+    """
+    name = command.replace('-', '_')
+    urls_name = f"_{name}_urls"
+    base_cases = "\n".join(f"        {shlex.quote(url)}) file={shlex.quote(completion_file)} ;;"
+                           for _, base_urls, completion_file in targets for url in base_urls)
+    env_cases = "\n".join(f"                {shlex.quote(environment)}) file={shlex.quote(completion_file)} ;;"
+                          for environment, _, completion_file in targets)
+    urls_function = URLS_FUNCTION.format(
+        function=urls_name,
+        urls=" ".join(shlex.quote(url) for _, base_urls, _ in targets for url in base_urls),
+        base_cases=base_cases,
+        env_cases=env_cases,
+        awk=AWK_PROGRAM.strip('\n'),
+    )
+    template = BASH_SCRIPT if shell == 'bash' else ZSH_SCRIPT
+    return template.format(
+        command=command,
+        name=name,
+        urls_name=urls_name,
+        urls_function=urls_function,
+        environments=" ".join(environment for environment, _, _ in targets),
+        options=" ".join(options),
+    )
@@ -2,10 +2,19 @@
 
 import os
 import sys
-import subprocess
 import re
 import json
+import subprocess
+import tempfile
+import time
+from urllib.parse import urlsplit
+from fc_api_helper import aio, json_codec
 from fc_api_helper.auth import authenticate_be
+from fc_api_helper.colors import Colors, colored, error, info, label, success
+from fc_api_helper.json_diff import VOLATILE_FIELDS, iter_diff
+from fc_api_helper.json_select import CHUNK_SIZE, JsonSelector, parse_selector, select_values
+from fc_api_helper.profiling import span
+from fc_api_helper.request_scheduler import DEFAULT_CONCURRENCY, DEFAULT_RATE, RequestScheduler
 
 
 # Environment configurations
@@ -33,6 +42,28 @@ ENV_CONFIG = {
 }
 
 
+# Options consumed by the wrappers themselves (never forwarded to curl)
+WRAPPER_OPTIONS = ('--env', '--record', '--select', '--ignore', '--batch', '--rate', '--concurrency')
+
+# Write-out marker appended to curl output to recover status and timing
+STATUS_MARKER = '__HTTP_STATUS__:'
+STATUS_WRITE_OUT = f'\n{STATUS_MARKER}%{{http_code}}:%{{time_total}}'
+
+# curl options that take a value (so the value is not mistaken for the URL)
+CURL_VALUE_OPTIONS = {
+    '-H', '--header', '-X', '--request', '-d', '--data', '--data-raw',
+    '--data-binary', '--data-urlencode', '--json', '-o', '--output',
+    '-u', '--user', '-A', '--user-agent', '-e', '--referer', '-b', '--cookie',
+    '-c', '--cookie-jar', '-F', '--form', '-T', '--upload-file', '-w',
+    '--write-out', '-m', '--max-time', '--connect-timeout', '-x', '--proxy',
+    '--url', '-D', '--dump-header', '-K', '--config', '--retry',
+}
+CURL_DATA_OPTIONS = {'-d', '--data', '--data-raw', '--data-binary', '--data-urlencode', '--json'}
+
+# Differences printed per environment pair before the diff stops
+DIFF_LIMIT = 100
+
+
 def format_json_output(output):
     """Format JSON output with indentation.
 
@@ -43,9 +74,8 @@ def format_json_output(output):
         Formatted JSON string, or original string if not valid JSON
     """
     try:
-        parsed = json.loads(output)
-        return json.dumps(parsed, indent=2)
-    except (json.JSONDecodeError, TypeError):
+        return json_codec.dumps_str(json_codec.loads(output), indent=True)
+    except (*json_codec.DecodeError, TypeError):
         return output
 
 
@@ -83,74 +113,369 @@ def filter_auth_headers(args, header_pattern):
     return filtered_args
 
 
-def run_curl_with_token_auth(environment='local'):
-    """Execute curl with Authorization Token header.
+def filter_wrapper_args(args):
+    """Remove wrapper-only options (see WRAPPER_OPTIONS) from curl arguments.
 
-    Automatically authenticates if receiving 401 UNAUTHORIZED response.
+    Args:
+        args: List of command line arguments
+
+    Returns:
+        List of arguments to forward to curl
+    """
+    filtered_args = []
+    i = 0
+
+    while i < len(args):
+        arg = args[i]
+        if arg in WRAPPER_OPTIONS:
+            i += 2
+            continue
+        if arg.split('=', 1)[0] in WRAPPER_OPTIONS and '=' in arg:
+            i += 1
+            continue
+        filtered_args.append(arg)
+        i += 1
+
+    return filtered_args
+
+
+def split_status_marker(output):
+    """Split curl output into body, HTTP status and total time.
 
     Args:
-        environment: Environment to use ('local', 'test', 'prod')
+        output: curl stdout produced with STATUS_WRITE_OUT
+
+    Returns:
+        Tuple of (body, status_code, elapsed) where status_code is a string
+        and elapsed is seconds as float (None when the marker is missing)
     """
-    config = ENV_CONFIG[environment]['be']
-    api_key_file = config['api_key_file']
+    if STATUS_MARKER not in output:
+        return output, None, None
+
+    body, marker = output.rsplit(STATUS_MARKER, 1)
+    if body.endswith('\n'):
+        body = body[:-1]
+    status_code, _, elapsed = marker.strip().partition(':')
+    try:
+        elapsed = float(elapsed)
+    except ValueError:
+        elapsed = None
+    return body, status_code or None, elapsed
+
+
+def parse_curl_request(args):
+    """Extract method, URL and body from curl arguments.
+
+    Args:
+        args: List of curl arguments (wrapper options already removed)
+
+    Returns:
+        Dict with 'method', 'url' and 'body' keys
+    """
+    method = None
+    url = None
+    body = None
+    i = 0
+
+    while i < len(args):
+        arg = args[i]
+        value = args[i + 1] if i + 1 < len(args) else None
+
+        if arg in ('-X', '--request'):
+            method = value
+        elif arg in CURL_DATA_OPTIONS:
+            body = value if body is None else f"{body}&{value}"
+        elif arg == '--url':
+            url = value
+        elif arg.startswith('-X') and len(arg) > 2:
+            method = arg[2:]
+        elif not arg.startswith('-') and url is None:
+            url = arg
+
+        if arg in CURL_VALUE_OPTIONS:
+            i += 2
+        else:
+            i += 1
+
+    if method is None:
+        method = 'POST' if body is not None else 'GET'
+
+    return {'method': method.upper(), 'url': url, 'body': body}
+
+
+def find_url_index(args):
+    """Return the index of the request URL in curl arguments, or None."""
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg == '--url':
+            return i + 1 if i + 1 < len(args) else None
+        if not arg.startswith('-'):
+            return i
+        i += 2 if arg in CURL_VALUE_OPTIONS else 1
+    return None
+
+
+def map_url_to_env(url, service, environment):
+    """Rewrite a request URL for another environment.
+
+    Args:
+        url: URL starting with the base URL of any environment, or a path
+        service: Service name ('be' or 'dpl')
+        environment: Target environment
+
+    Returns:
+        URL on the target environment's base URL, or None if url does not
+        belong to a known environment
+    """
+    base_url = ENV_CONFIG[environment][service]['base_url']
+    for env_config in ENV_CONFIG.values():
+        env_base_url = env_config[service]['base_url']
+        if url == env_base_url or url.startswith(env_base_url + '/'):
+            return base_url + url[len(env_base_url):]
+    if url.startswith('/'):
+        return base_url + url
+    return None
+
+
+def record_exchange(cassette_file, service, environment, args, output, status_code, elapsed):
+    """Append a request/response pair to a cassette file.
+
+    Cassettes are JSON Lines files (one compact exchange per line) that
+    can be served offline by fc-api-replay.
+
+    Args:
+        cassette_file: Path of the cassette to append to
+        service: Service name ('be' or 'dpl')
+        environment: Environment the request was sent to
+        args: curl arguments used for the request
+        output: Response body text
+        status_code: HTTP status code string
+        elapsed: Total request time in seconds
+    """
+    request = parse_curl_request(args)
+    url = urlsplit(request['url'] or '')
+    path = url.path or '/'
+    if url.query:
+        path += f"?{url.query}"
+
+    entry = {
+        'service': service,
+        'env': environment,
+        'method': request['method'],
+        'path': path,
+        'body': request['body'],
+        'status': int(status_code) if status_code and status_code.isdigit() else 0,
+        'elapsed': round(elapsed or 0.0, 4),
+        'response': output,
+        'recorded_at': int(time.time()),
+    }
+
+    cassette_dir = os.path.dirname(cassette_file)
+    if cassette_dir:
+        os.makedirs(cassette_dir, exist_ok=True)
+
+    with open(cassette_file, 'a') as f:
+        f.write(json.dumps(entry, separators=(',', ':')) + '\n')
+
+    print(f"Recorded {entry['method']} {path} -> {cassette_file}", file=sys.stderr)
+
+
+async def run_curl(curl_cmd):
+    """Run a curl command without blocking the event loop.
+
+    Returns:
+        subprocess.CompletedProcess with text output; exits if curl is missing
+    """
+    try:
+        with span('curl'):
+            return await aio.run_process(curl_cmd)
+    except FileNotFoundError:
+        print("Error: curl not found", file=sys.stderr)
+        sys.exit(1)
 
-    def execute_curl(api_key):
-        """Execute curl command with given API key."""
-        args = sys.argv[1:]
-        # Filter out --env flag from curl args
-        filtered_args = [arg for i, arg in enumerate(args)
-                        if not (arg == '--env' or (i > 0 and args[i-1] == '--env'))]
-        filtered_args = filter_auth_headers(filtered_args, r'^[Aa]uthorization:.*')
-
-        curl_cmd = [
-            'curl',
-            '-s',
-            '-w', '\n__HTTP_STATUS__:%{http_code}',
-            '-H', f'Authorization: Token {api_key}',
-            '-H', 'Content-Type: application/json'
-        ] + filtered_args
 
+def stream_curl_select(curl_cmd, expression, keep_body=False):
+    """Run curl and print the values selected from its JSON body as it streams in.
+
+    Every match is printed as one line of compact JSON as soon as it has
+    been read; the rest of the body is skipped without being decoded.
+
+    Args:
+        curl_cmd: curl command producing the body followed by STATUS_WRITE_OUT
+        expression: Selector (see json_select)
+        keep_body: Also return the complete body (for --record)
+
+    Returns:
+        subprocess.CompletedProcess whose stdout is the status marker (preceded
+        by the body if keep_body), like run_curl; a body that is not valid
+        JSON is reported in stderr with return code 1
+    """
+    try:
+        process = subprocess.Popen(curl_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    except FileNotFoundError:
+        print("Error: curl not found", file=sys.stderr)
+        sys.exit(1)
+
+    body_parts = [] if keep_body else None
+
+    def read_chunks():
+        while True:
+            chunk = process.stdout.read1(CHUNK_SIZE)
+            if not chunk:
+                return
+            if body_parts is not None:
+                body_parts.append(chunk)
+            yield chunk
+
+    selector = JsonSelector(expression)
+    select_error = None
+    with span('curl'):
         try:
-            result = subprocess.run(curl_cmd, capture_output=True, text=True)
-            return result
-        except FileNotFoundError:
-            print("Error: curl not found", file=sys.stderr)
-            sys.exit(1)
+            for value in selector.iter_matches(read_chunks()):
+                sys.stdout.write(json_codec.dumps_str(value) + "\n")
+        except ValueError as e:
+            select_error = f"Error: Response body is not valid JSON ({e})"
+        except BrokenPipeError:
+            # Output piped into head & co: stop quietly
+            process.kill()
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            sys.exit(0)
+        trailer = selector.remainder()
+        stderr = process.stderr.read().decode('utf-8', 'replace')
+        process.wait()
+    sys.stdout.flush()
+
+    stdout = b"".join(body_parts).decode('utf-8', 'replace') if keep_body else trailer
+    returncode = process.returncode
+    if select_error:
+        stderr += select_error
+        returncode = returncode or 1
+    return subprocess.CompletedProcess(curl_cmd, returncode, stdout, stderr)
+
+
+def check_selector(select):
+    """Exit with an error if a --select expression is invalid."""
+    if select is None:
+        return
+    try:
+        parse_selector(select)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
 
+def load_api_key(environment, reauthenticate=False):
+    """Return the BE API key of an environment, authenticating if needed.
+
+    Args:
+        environment: Environment to use
+        reauthenticate: Authenticate even if a key is stored (e.g. after a 401)
+    """
+    api_key_file = ENV_CONFIG[environment]['be']['api_key_file']
     api_key = None
-    if os.path.exists(api_key_file):
+    if not reauthenticate and os.path.exists(api_key_file):
         with open(api_key_file, 'r') as f:
             api_key = f.read().strip()
 
     if not api_key:
-        print("No valid API key found. Starting authentication...", file=sys.stderr)
+        if not reauthenticate:
+            print("No valid API key found. Starting authentication...", file=sys.stderr)
         authenticate_be(api_key_file=api_key_file, environment=environment)
         with open(api_key_file, 'r') as f:
             api_key = f.read().strip()
+    return api_key
+
+
+def token_curl_command(api_key, args):
+    """Return the curl command for a BE request with a token."""
+    return [
+        'curl',
+        '-s',
+        '-w', STATUS_WRITE_OUT,
+        '-H', f'Authorization: Token {api_key}',
+        '-H', 'Content-Type: application/json'
+    ] + args
+
+
+class CurlResponse:
+    """Outcome of one curl request sent by send_curl."""
+
+    def __init__(self, result, retry_after=None):
+        self.body, status_code, self.elapsed = split_status_marker(result.stdout)
+        self.status_code = status_code
+        # None when curl got no response (connection refused, timeout...)
+        self.status = int(status_code) if result.returncode == 0 and status_code and status_code != '000' else None
+        self.retry_after = retry_after
+        self.returncode = result.returncode
+        self.stderr = result.stderr
+        self.attempts = 1
+
+
+def read_retry_after(header_file):
+    """Return the Retry-After value of the last response in a curl -D dump."""
+    retry_after = None
+    try:
+        with open(header_file, 'r', errors='replace') as f:
+            for line in f:
+                if line.startswith('HTTP/'):
+                    retry_after = None
+                name, _, value = line.partition(':')
+                if name.strip().lower() == 'retry-after':
+                    retry_after = value.strip()
+    except FileNotFoundError:
+        pass
+    return retry_after
+
+
+async def send_curl(curl_cmd):
+    """Run a curl command once (see run_curl), keeping the Retry-After header.
+
+    Returns:
+        CurlResponse
+    """
+    fd, header_file = tempfile.mkstemp(prefix='fc-api-headers-')
+    os.close(fd)
+    try:
+        result = await run_curl(curl_cmd[:1] + ['-D', header_file] + curl_cmd[1:])
+        return CurlResponse(result, read_retry_after(header_file))
+    finally:
+        os.remove(header_file)
+
+
+def run_curl_with_token_auth(environment='local', record=None, select=None):
+    """Execute curl with Authorization Token header.
 
-    result = execute_curl(api_key)
+    Automatically authenticates if receiving 401 UNAUTHORIZED response.
 
-    status_code = None
-    output = result.stdout
-    if '__HTTP_STATUS__:' in output:
-        parts = output.rsplit('__HTTP_STATUS__:', 1)
-        output = parts[0]
-        status_code = parts[1].strip() if len(parts) > 1 else None
+    Args:
+        environment: Environment to use ('local', 'test', 'prod')
+        record: Optional cassette file to append the request/response to
+        select: Optional selector; only the matching values of the JSON body
+            are printed, one compact JSON value per line (see json_select)
+    """
+    check_selector(select)
+    filtered_args = filter_auth_headers(filter_wrapper_args(sys.argv[1:]), r'^[Aa]uthorization:.*')
+
+    def execute_curl(api_key):
+        """Execute curl command with given API key."""
+        curl_cmd = token_curl_command(api_key, filtered_args)
+        if select is not None:
+            return stream_curl_select(curl_cmd, select, keep_body=bool(record))
+        return aio.run(run_curl(curl_cmd))
+
+    result = execute_curl(load_api_key(environment))
+    output, status_code, elapsed = split_status_marker(result.stdout)
 
     if status_code == '401':
         print("Received 401 UNAUTHORIZED. Re-authenticating...", file=sys.stderr)
-        authenticate_be(api_key_file=api_key_file, environment=environment)
-        with open(api_key_file, 'r') as f:
-            api_key = f.read().strip()
+        result = execute_curl(load_api_key(environment, reauthenticate=True))
+        output, status_code, elapsed = split_status_marker(result.stdout)
 
-        result = execute_curl(api_key)
+    if record and result.returncode == 0:
+        record_exchange(record, 'be', environment, filtered_args, output, status_code, elapsed)
 
-        output = result.stdout
-        if '__HTTP_STATUS__:' in output:
-            parts = output.rsplit('__HTTP_STATUS__:', 1)
-            output = parts[0]
-
-    if output:
+    if output and select is None:
         print(format_json_output(output))
 
     if result.stderr:
@@ -159,38 +484,357 @@ def run_curl_with_token_auth(environment='local'):
     sys.exit(result.returncode)
 
 
-def run_curl_with_api_key(environment='local'):
+def format_size(size):
+    """Format a byte count for the latency table."""
+    return f"{size / 1024:.1f} KB" if size >= 1024 else f"{size} B"
+
+
+def print_latency_table(environments, responses):
+    """Print status, total time and size of every environment's response to stderr."""
+    fastest = min((r['elapsed'] for r in responses.values() if r['elapsed']), default=None)
+    env_width = max(len(env) for env in environments)
+    print(label(f"{'ENV':<{env_width}}  STATUS  TIME      SIZE"), file=sys.stderr)
+    for env in environments:
+        response = responses[env]
+        elapsed = response['elapsed']
+        time_text = f"{elapsed:.3f}s" if elapsed is not None else "-"
+        line = f"{env:<{env_width}}  {response['status'] or '-':<6}  {time_text:<8}  {format_size(len(response['body'].encode('utf-8')))}"
+        if fastest and elapsed and elapsed > fastest:
+            line += f"  ({elapsed / fastest:.1f}x)"
+        print(line, file=sys.stderr)
+    print("", file=sys.stderr)
+
+
+def _preview(value):
+    text = json_codec.dumps_str(value)
+    return text if len(text) <= 80 else text[:77] + "..."
+
+
+def print_diff(base_env, env, base_response, response, select, ignore):
+    """Print the structural diff of two environments' responses.
+
+    Returns:
+        Number of differences found (up to DIFF_LIMIT + 1)
+    """
+    print(label(f"--- {base_env}  +++ {env}"))
+    count = 0
+    if base_response['status'] != response['status']:
+        print(colored(f"~ HTTP status: {base_response['status']} → {response['status']}", Colors.YELLOW))
+        count += 1
+
+    def decode(body):
+        return select_values(select, body) if select is not None else json_codec.loads(body)
+
+    try:
+        differences = iter_diff(decode(base_response['body']), decode(response['body']), ignore)
+    except (ValueError, *json_codec.DecodeError):
+        # Not JSON: compare the text
+        same = base_response['body'] == response['body']
+        differences = iter(() if same else [('changed', '', '(body)', '(body)')])
+
+    for kind, path, left, right in differences:
+        count += 1
+        if count > DIFF_LIMIT:
+            print(info(f"... stopping after {DIFF_LIMIT} differences"))
+            break
+        path = path or '$'
+        if kind == 'removed':
+            print(error(f"- {path}: {_preview(left)}"))
+        elif kind == 'added':
+            print(success(f"+ {path}: {_preview(right)}"))
+        else:
+            print(colored(f"~ {path}: {_preview(left)} → {_preview(right)}", Colors.YELLOW))
+    if not count:
+        print(success("✓ No differences"))
+    print("")
+    return count
+
+
+def run_fanout_with_token_auth(environments, record=None, select=None, ignore=VOLATILE_FIELDS):
+    """Send a BE request to several environments concurrently and diff the responses.
+
+    Every environment gets the request with its own token (the URL may be a
+    path or any environment's URL). The latency table goes to stderr and the
+    structural diff of each environment against the first to stdout; fields
+    matching ignore are left out of the diff.
+
+    Exits with status 0 when all responses match, 1 otherwise.
+
+    Args:
+        environments: Environment names (at least two)
+        record: Optional cassette file to append every exchange to
+        select: Optional selector; only the selected values are compared
+        ignore: Key or path glob patterns ignored by the diff
+    """
+    check_selector(select)
+    filtered_args = filter_auth_headers(filter_wrapper_args(sys.argv[1:]), r'^[Aa]uthorization:.*')
+    url_index = find_url_index(filtered_args)
+    if url_index is None:
+        print("Error: No URL given", file=sys.stderr)
+        sys.exit(1)
+
+    env_args = {}
+    for env in environments:
+        url = map_url_to_env(filtered_args[url_index], 'be', env)
+        if url is None:
+            print(f"Error: Cannot map {filtered_args[url_index]} to the {env} environment "
+                  "(use a path or a known base URL)", file=sys.stderr)
+            sys.exit(1)
+        env_args[env] = filtered_args[:url_index] + [url] + filtered_args[url_index + 1:]
+
+    # Authentication prompts are interactive, so they run one at a time
+    api_keys = {env: load_api_key(env) for env in environments}
+
+    method = parse_curl_request(filtered_args)['method']
+
+    async def execute_all(envs):
+        scheduler = RequestScheduler(concurrency=len(envs))
+        requests = [(method, token_curl_command(api_keys[env], env_args[env])) for env in envs]
+        return {envs[index]: response async for index, response in scheduler.run(requests, send_curl)}
+
+    results = aio.run(execute_all(environments))
+    unauthorized = [env for env, response in results.items() if response.status == 401]
+    for env in unauthorized:
+        print(f"Received 401 UNAUTHORIZED from {env}. Re-authenticating...", file=sys.stderr)
+        api_keys[env] = load_api_key(env, reauthenticate=True)
+    if unauthorized:
+        results.update(aio.run(execute_all(unauthorized)))
+
+    responses = {}
+    returncode = 0
+    for env in environments:
+        result = results[env]
+        responses[env] = {'body': result.body, 'status': result.status_code, 'elapsed': result.elapsed}
+        if result.returncode != 0:
+            print(f"{env}: {result.stderr.strip() or f'curl exited with {result.returncode}'}", file=sys.stderr)
+            returncode = returncode or result.returncode
+        elif record:
+            record_exchange(record, 'be', env, env_args[env], result.body, result.status_code, result.elapsed)
+
+    print_latency_table(environments, responses)
+    if returncode:
+        sys.exit(returncode)
+
+    base_env = environments[0]
+    differences = 0
+    for env in environments[1:]:
+        differences += print_diff(base_env, env, responses[base_env], responses[env], select, ignore)
+    sys.exit(1 if differences else 0)
+
+
+def parse_batch_line(line):
+    """Parse one request of a --batch file.
+
+    Lines are either JSON objects with 'method', 'url' (or 'path', as in
+    cassettes), optional 'body' (string or JSON value) and 'headers' (dict),
+    or plain "METHOD URL [BODY]" text.
+
+    Returns:
+        Dict with 'method', 'url', 'body' and 'headers' keys, or None for
+        blank and comment lines
+
+    Raises:
+        ValueError: The line is not a valid request
+    """
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+    if line.startswith('{'):
+        try:
+            entry = json_codec.loads(line)
+        except json_codec.DecodeError as e:
+            raise ValueError(f"invalid JSON: {e}") from e
+        url = entry.get('url') or entry.get('path')
+        body = entry.get('body')
+        if body is not None and not isinstance(body, str):
+            body = json_codec.dumps_str(body)
+        headers = entry.get('headers') or {}
+    else:
+        parts = line.split(None, 2)
+        if len(parts) < 2:
+            raise ValueError("expected METHOD URL [BODY]")
+        entry = {'method': parts[0]}
+        url = parts[1]
+        body = parts[2] if len(parts) == 3 else None
+        headers = {}
+    if not url:
+        raise ValueError("missing url")
+    method = (entry.get('method') or ('POST' if body is not None else 'GET')).upper()
+    return {'method': method, 'url': url, 'body': body, 'headers': headers}
+
+
+def load_batch(batch_file, service, environment):
+    """Read the requests of a --batch file ('-' for stdin), mapped to an environment.
+
+    Exits with an error message on invalid lines.
+
+    Returns:
+        List of request dicts (see parse_batch_line)
+    """
+    try:
+        f = sys.stdin if batch_file == '-' else open(batch_file, 'r')
+    except OSError as e:
+        print(f"Error: Cannot read {batch_file}: {e.strerror}", file=sys.stderr)
+        sys.exit(1)
+
+    requests = []
+    with f:
+        for line_number, line in enumerate(f, 1):
+            try:
+                request = parse_batch_line(line)
+            except ValueError as e:
+                print(f"Error: {batch_file}:{line_number}: {e}", file=sys.stderr)
+                sys.exit(1)
+            if request is None:
+                continue
+            url = map_url_to_env(request['url'], service, environment)
+            if url is None:
+                print(f"Error: {batch_file}:{line_number}: cannot map {request['url']} to the "
+                      f"{environment} environment", file=sys.stderr)
+                sys.exit(1)
+            request['url'] = url
+            requests.append(request)
+    return requests
+
+
+def batch_curl_args(request, common_args):
+    """Return the curl arguments of a batch request."""
+    args = ['-X', request['method'], request['url']]
+    for name, value in request['headers'].items():
+        args += ['-H', f"{name}: {value}"]
+    if request['body'] is not None:
+        args += ['--data-raw', request['body']]
+    return args + common_args
+
+
+def run_batch(service, environment='local', batch_file='-', rate=DEFAULT_RATE,
+              concurrency=DEFAULT_CONCURRENCY, select=None, record=None):
+    """Send the requests of a batch file through the request scheduler.
+
+    Results are written to stdout as JSON Lines in completion order, one
+    {"index", "method", "url", "status", "elapsed", "attempts", "response"}
+    object per request (response: decoded JSON body, or the selected
+    values with select). A summary goes to stderr.
+
+    Exits with status 0 when every request got a 2xx/3xx response, 1 otherwise.
+
+    Args:
+        service: 'be' (token auth, re-authenticates on 401) or 'dpl' (API key)
+        environment: Environment to use
+        batch_file: File with one request per line (see parse_batch_line)
+        rate: Requests per second (0: unlimited)
+        concurrency: Maximum requests in flight
+        select: Optional selector applied to every response
+        record: Optional cassette file to append every exchange to
+    """
+    check_selector(select)
+    if service == 'be':
+        common_args = filter_auth_headers(filter_wrapper_args(sys.argv[1:]), r'^[Aa]uthorization:.*')
+    else:
+        common_args = filter_auth_headers(filter_wrapper_args(sys.argv[1:]), r'^[Xx]-[Aa][Pp][Ii]-[Kk][Ee][Yy]:.*')
+    requests = load_batch(batch_file, service, environment)
+    if not requests:
+        print(info("No requests in batch"), file=sys.stderr)
+        return
+
+    def curl_command(credential, request):
+        args = batch_curl_args(request, common_args)
+        if service == 'be':
+            return token_curl_command(credential, args)
+        return ['curl', '-s', '-w', STATUS_WRITE_OUT, '-H', f'X-API-KEY: {credential}',
+                '-H', 'Content-Type: application/json'] + args
+
+    def write_result(index, response):
+        request = requests[index]
+        body = response.body
+        try:
+            value = select_values(select, body) if select is not None else json_codec.loads(body)
+        except (ValueError, *json_codec.DecodeError):
+            value = body
+        sys.stdout.write(json_codec.dumps_str({
+            'index': index, 'method': request['method'], 'url': request['url'],
+            'status': response.status, 'elapsed': response.elapsed, 'attempts': response.attempts,
+            'response': value,
+        }) + "\n")
+        if record and response.returncode == 0:
+            record_exchange(record, service, environment, batch_curl_args(request, common_args),
+                            body, response.status_code, response.elapsed)
+
+    scheduler = RequestScheduler(rate=rate, concurrency=concurrency)
+    statuses = {}
+
+    async def execute(indexes, credential):
+        unauthorized = []
+        batch = [(requests[i]['method'], curl_command(credential, requests[i])) for i in indexes]
+        async for position, response in scheduler.run(batch, send_curl):
+            index = indexes[position]
+            if service == 'be' and response.status == 401 and credential_state['retry']:
+                unauthorized.append(index)
+                continue
+            statuses[index] = response.status
+            write_result(index, response)
+        return unauthorized
+
+    credential_state = {'retry': service == 'be'}
+    credential = load_api_key(environment) if service == 'be' else ENV_CONFIG[environment]['dpl']['api_key']
+    started = time.monotonic()
+    unauthorized = aio.run(execute(list(range(len(requests))), credential))
+    if unauthorized:
+        print(f"Received 401 UNAUTHORIZED for {len(unauthorized)} request(s). Re-authenticating...", file=sys.stderr)
+        credential_state['retry'] = False
+        aio.run(execute(unauthorized, load_api_key(environment, reauthenticate=True)))
+    sys.stdout.flush()
+
+    duration = time.monotonic() - started
+    counts = {}
+    for status in statuses.values():
+        counts[status or 'failed'] = counts.get(status or 'failed', 0) + 1
+    summary = ", ".join(f"{count}×{status}" for status, count in sorted(counts.items(), key=lambda item: str(item[0])))
+    stats = scheduler.stats
+    rate_text = f"{len(statuses) / duration:.1f} req/s" if duration > 0 else "- req/s"
+    print(success(f"✓ {len(statuses)} requests in {duration:.1f}s ({rate_text}): {summary}"), file=sys.stderr)
+    print(info(f"{stats['retries']} retries, {stats['throttled']} throttled responses, "
+               f"final concurrency {int(scheduler.limiter.limit)}"), file=sys.stderr)
+    failed = any(status is None or status >= 400 for status in statuses.values())
+    sys.exit(1 if failed else 0)
+
+
+def run_curl_with_api_key(environment='local', record=None, select=None):
     """Execute curl with X-API-KEY header.
 
     Args:
         environment: Environment to use ('local', 'test', 'prod')
+        record: Optional cassette file to append the request/response to
+        select: Optional selector (see run_curl_with_token_auth)
     """
+    check_selector(select)
     config = ENV_CONFIG[environment]['dpl']
     api_key = config['api_key']
 
-    args = sys.argv[1:]
-    # Filter out --env flag from curl args
-    filtered_args = [arg for i, arg in enumerate(args)
-                    if not (arg == '--env' or (i > 0 and args[i-1] == '--env'))]
+    filtered_args = filter_wrapper_args(sys.argv[1:])
     filtered_args = filter_auth_headers(filtered_args, r'^[Xx]-[Aa][Pp][Ii]-[Kk][Ee][Yy]:.*')
 
     curl_cmd = [
         'curl',
         '-s',
+        '-w', STATUS_WRITE_OUT,
         '-H', f'X-API-KEY: {api_key}',
         '-H', 'Content-Type: application/json'
     ] + filtered_args
 
-    try:
-        result = subprocess.run(curl_cmd, capture_output=True, text=True)
+    if select is not None:
+        result = stream_curl_select(curl_cmd, select, keep_body=bool(record))
+    else:
+        result = aio.run(run_curl(curl_cmd))
+    output, status_code, elapsed = split_status_marker(result.stdout)
 
-        if result.stdout:
-            print(format_json_output(result.stdout))
+    if record and result.returncode == 0:
+        record_exchange(record, 'dpl', environment, filtered_args, output, status_code, elapsed)
 
-        if result.stderr:
-            print(result.stderr, file=sys.stderr)
+    if output and select is None:
+        print(format_json_output(output))
 
-        sys.exit(result.returncode)
-    except FileNotFoundError:
-        print("Error: curl not found", file=sys.stderr)
-        sys.exit(1)
+    if result.stderr:
+        print(result.stderr, file=sys.stderr)
+
+    sys.exit(result.returncode)
@@ -0,0 +1,344 @@
+"""Precomputed endpoint index for the fzf endpoint picker.
+
+The index lives next to the schema caches in a "<first cache>.index"
+directory and is rebuilt whenever one of the source schema files changes:
+
+    endpoints.txt    fzf input, one "<key>\\t<offset>\\t<length>\\t<METHOD> <path>
+                     -- <summary>" line per operation (the first three columns
+                     are hidden from fzf)
+    previews.txt     rendered preview of every operation; <offset>/<length>
+                     locate an operation's preview so the fzf --preview command
+                     is a plain tail/head instead of a Python process
+    operations.json  source file stamps, the key -> (method, path) table and
+                     the origin (schema number, unprefixed path) of every
+                     operation
+    hashes.json      hash table of the merged schema the index was rendered
+                     from (see schema_diff)
+    search.txt       BM25 inverted index over the operations' text, keyed
+                     like endpoints.txt (see search_index)
+    paths.txt        sorted paths and query parameter names read by the
+                     be-curl/dpl-curl shell completion (see completion)
+
+With a fresh index the explorer never loads the full schemas: it selects an
+endpoint from endpoints.txt and decodes only that operation and the
+components it references from the schema's mmap container (schema_store).
+
+Rebuilds are incremental: the schema containers' hashes are compared with
+hashes.json and only the previews of added and changed operations are
+rendered again, the others are copied from the previous previews.txt.
+
+uuid_prefetch keeps its uuid field -> table mapping (uuid-fields.json) in the
+same directory and patches it whenever operations.json is rewritten.
+"""
+
+import os
+
+from fc_api_helper import json_codec
+from fc_api_helper.completion import COMPLETION_FILE, render_completion_paths
+from fc_api_helper.profiling import span
+from fc_api_helper.schema_diff import diff_hashes, merge_hashes
+from fc_api_helper.schema_store import (
+    HTTP_METHODS,
+    SchemaContainer,
+    container_is_fresh,
+    get_container_file,
+    read_container_hashes,
+    write_container
+)
+from fc_api_helper.search_index import SEARCH_FILE, render_search_index
+
+
+INDEX_VERSION = 7
+ENDPOINTS_FILE = 'endpoints.txt'
+PREVIEWS_FILE = 'previews.txt'
+OPERATIONS_FILE = 'operations.json'
+HASHES_FILE = 'hashes.json'
+
+
+def get_index_dir(config):
+    """Return the index directory for an explorer config."""
+    first_cache = config['schemas'][0]['cache_file']
+    return os.path.splitext(first_cache)[0] + '.index'
+
+
+def get_source_stamps(config):
+    """Return (path, mtime_ns, size) stamps of the config's schema caches."""
+    stamps = []
+    for schema_config in config['schemas']:
+        cache_file = schema_config['cache_file']
+        try:
+            stat = os.stat(cache_file)
+        except FileNotFoundError:
+            return None
+        stamps.append([cache_file, stat.st_mtime_ns, stat.st_size])
+    return stamps
+
+
+def iter_operations(schema):
+    """Yield (method, path, details) for every operation in a schema."""
+    for path, methods in schema.get('paths', {}).items():
+        for method, details in methods.items():
+            if method in HTTP_METHODS and isinstance(details, dict):
+                yield method, path, details
+
+
+def summarize(details):
+    """Return the one-line, fzf-safe summary of an operation."""
+    summary = details.get('summary') or details.get('description') or "No description"
+    summary = summary.partition('\n')[0].strip().replace('\t', ' ')
+    if len(summary) > 100:
+        summary = summary[:97] + "..."
+    return summary
+
+
+def format_parameter_table(parameters):
+    """Format OpenAPI parameters as aligned preview table lines."""
+    rows = []
+    for param in parameters:
+        param_type = param.get('schema', {}).get('type', 'string')
+        required = 'REQUIRED' if param.get('required') else 'optional'
+        description = (param.get('description') or '').partition('\n')[0]
+        rows.append((param.get('name', ''), param_type, required, description))
+
+    name_width = max(len(r[0]) for r in rows)
+    type_width = max(len(r[1]) for r in rows)
+    return [f"  {n:<{name_width}}  {t:<{type_width}}  {r:<8}  {d}".rstrip() for n, t, r, d in rows]
+
+
+def render_operation_preview(schema, method, path, details):
+    """Render the fzf preview text of one operation.
+
+    Shows the summary/description, parameter tables per location and the
+    commented example body from generate_body_with_comments.
+    """
+    from fc_api_helper.api_explorer import get_request_body_schema, generate_body_with_comments
+    from fc_api_helper.colors import header, info
+
+    lines = [header(f"{method.upper()} {path}")]
+    for key in ('summary', 'description'):
+        text = (details.get(key) or '').strip()
+        if text and text not in lines:
+            lines.append(text)
+
+    parameters = details.get('parameters', [])
+    for param_in, title in (('path', 'Path Parameters'), ('query', 'Query Parameters'),
+                            ('header', 'Header Parameters')):
+        params = [p for p in parameters if isinstance(p, dict) and p.get('in') == param_in]
+        if params:
+            lines.append("")
+            lines.append(header(title))
+            lines.extend(format_parameter_table(params))
+
+    if 'requestBody' in details:
+        lines.append("")
+        lines.append(header("Request Body"))
+        try:
+            body_schema = get_request_body_schema(schema, path, method)
+            lines.append(generate_body_with_comments(body_schema, schema))
+        except (AttributeError, KeyError, TypeError):
+            lines.append(info("(preview unavailable for this body schema)"))
+
+    return "\n".join(lines) + "\n"
+
+
+def render_index(schema, reusable_previews=None):
+    """Render endpoint lines and previews together.
+
+    Args:
+        schema: Merged schema
+        reusable_previews: Optional dict of "<METHOD> <path>" -> preview
+            bytes still valid for the schema, used instead of rendering
+
+    Returns:
+        Tuple of (operations, endpoints_bytes, previews_bytes)
+    """
+    reusable_previews = reusable_previews or {}
+    operations = []
+    lines = []
+    previews = []
+    offset = 0
+    for method, path, details in iter_operations(schema):
+        method = method.upper()
+        preview = reusable_previews.get(f"{method} {path}")
+        if preview is None:
+            preview = render_operation_preview(schema, method, path, details).encode('utf-8')
+        # tail -c +N is 1-based
+        lines.append(f"{len(operations)}\t{offset + 1}\t{len(preview)}\t{method} {path} -- {summarize(details)}")
+        operations.append([method, path])
+        previews.append(preview)
+        offset += len(preview)
+    return operations, "\n".join(lines).encode('utf-8'), b"".join(previews)
+
+
+def get_operation_origins(schema, schema_entries):
+    """Locate every operation of a merged schema in its source schema.
+
+    Later schemas win when several define the same method on a path, as in
+    merge_schemas.
+
+    Returns:
+        List of [schema number, unprefixed path], in iter_operations order
+    """
+    origins = {}
+    for number, entry in enumerate(schema_entries):
+        prefix = entry.get('path_prefix', '')
+        for method, path, _ in iter_operations(entry['schema']):
+            origins[(method, f"{prefix}{path}")] = [number, path]
+    return [origins[(method, path)] for method, path, _ in iter_operations(schema)]
+
+
+def get_preview_command(index_dir):
+    """Return the fzf --preview command for an index directory."""
+    previews_file = os.path.join(index_dir, PREVIEWS_FILE).replace("'", "'\\''")
+    return f"tail -c +{{2}} '{previews_file}' | head -c {{3}}"
+
+
+def _write_atomic(path, data):
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    mode = 'wb' if isinstance(data, bytes) else 'w'
+    with open(tmp_path, mode) as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def load_previous_index(index_dir):
+    """Load the hashes and previews of an existing (possibly stale) index.
+
+    Returns:
+        Tuple of (hash table, dict of "<METHOD> <path>" -> preview bytes), or
+        None if there is no usable index
+    """
+    try:
+        index = json_codec.load_file(os.path.join(index_dir, OPERATIONS_FILE))
+        hashes = json_codec.load_file(os.path.join(index_dir, HASHES_FILE))
+        with open(os.path.join(index_dir, ENDPOINTS_FILE), 'rb') as f:
+            endpoint_lines = f.read().splitlines()
+        with open(os.path.join(index_dir, PREVIEWS_FILE), 'rb') as f:
+            previews_data = f.read()
+    except (FileNotFoundError, *json_codec.DecodeError):
+        return None
+    if index.get('version') != INDEX_VERSION:
+        return None
+
+    previews = {}
+    for line in endpoint_lines:
+        key, offset, length, _ = line.split(b"\t", 3)
+        method, path = index['operations'][int(key)]
+        start = int(offset) - 1
+        previews[f"{method} {path}"] = previews_data[start:start + int(length)]
+    return hashes, previews
+
+
+def build_endpoint_index(config, schema, schema_entries):
+    """Render the endpoint index for a merged schema and write it to disk.
+
+    Missing or stale schema containers are written as well. When an older
+    index exists, only the previews of the operations added or changed
+    since are rendered.
+
+    Args:
+        config: Explorer config (see run_api_explorer)
+        schema: Merged schema for the config
+        schema_entries: The merged schemas, in config order (see merge_schemas)
+
+    Returns:
+        Dict with 'operations', 'origins', 'containers', 'endpoints_file',
+        'index_dir' and 'changes' keys; changes is the schema_diff.diff_hashes
+        result against the previous index (None without one)
+    """
+    index_dir = get_index_dir(config)
+    os.makedirs(index_dir, exist_ok=True)
+
+    for schema_config, entry in zip(config['schemas'], schema_entries):
+        if not container_is_fresh(schema_config['cache_file']):
+            write_container(schema_config['cache_file'], entry['schema'])
+
+    with span('schema_diff'):
+        hashes = merge_hashes(
+            [read_container_hashes(container_file) for container_file in get_container_files(config)],
+            [entry.get('path_prefix', '') for entry in schema_entries]
+        )
+        previous = load_previous_index(index_dir)
+        changes = None
+        reusable_previews = None
+        if previous is not None:
+            previous_hashes, reusable_previews = previous
+            changes = diff_hashes(previous_hashes, hashes)
+            for key in changes['added'] + changes['changed']:
+                reusable_previews.pop(key, None)
+
+    with span('format'):
+        operations, endpoints, previews = render_index(schema, reusable_previews)
+        origins = get_operation_origins(schema, schema_entries)
+    with span('search_index'):
+        search = render_search_index(schema)
+    completion_paths = render_completion_paths(schema)
+
+    endpoints_file = os.path.join(index_dir, ENDPOINTS_FILE)
+    _write_atomic(os.path.join(index_dir, PREVIEWS_FILE), previews)
+    _write_atomic(endpoints_file, endpoints)
+    _write_atomic(os.path.join(index_dir, SEARCH_FILE), search)
+    _write_atomic(os.path.join(index_dir, COMPLETION_FILE), completion_paths)
+    _write_atomic(os.path.join(index_dir, HASHES_FILE), json_codec.dumps(hashes))
+    _write_atomic(os.path.join(index_dir, OPERATIONS_FILE), json_codec.dumps({
+        'version': INDEX_VERSION,
+        'sources': get_source_stamps(config),
+        'operations': operations,
+        'origins': origins,
+    }))
+
+    return {'operations': operations, 'origins': origins, 'containers': get_container_files(config),
+            'endpoints_file': endpoints_file, 'index_dir': index_dir, 'changes': changes}
+
+
+def get_container_files(config):
+    """Return the schema container paths of a config, in config order."""
+    return [get_container_file(c['cache_file']) for c in config['schemas']]
+
+
+def load_endpoint_index(config):
+    """Load the endpoint index if it is up to date with the schema caches.
+
+    Returns:
+        Dict with 'operations', 'origins', 'containers', 'endpoints_file',
+        'index_dir' and 'changes' (None) keys, or None if the index or a
+        schema container is missing or stale
+    """
+    index_dir = get_index_dir(config)
+    try:
+        index = json_codec.load_file(os.path.join(index_dir, OPERATIONS_FILE))
+    except (FileNotFoundError, *json_codec.DecodeError):
+        return None
+
+    if index.get('version') != INDEX_VERSION or index.get('sources') != get_source_stamps(config):
+        return None
+
+    endpoints_file = os.path.join(index_dir, ENDPOINTS_FILE)
+    if not all(os.path.exists(os.path.join(index_dir, name)) for name in (PREVIEWS_FILE, SEARCH_FILE, COMPLETION_FILE)) \
+            or not os.path.exists(endpoints_file):
+        return None
+    if not all(container_is_fresh(c['cache_file']) for c in config['schemas']):
+        return None
+
+    return {'operations': index['operations'], 'origins': index['origins'],
+            'containers': get_container_files(config), 'endpoints_file': endpoints_file,
+            'index_dir': index_dir, 'changes': None}
+
+
+def load_operation_slice(endpoint_index, key):
+    """Read the self-contained schema of one operation from its schema container.
+
+    Args:
+        endpoint_index: Result of load_endpoint_index / build_endpoint_index
+        key: Operation key (index into endpoint_index['operations'])
+
+    Returns:
+        Schema dict holding only that operation (under its prefixed path)
+        and the components it uses
+    """
+    method, path = endpoint_index['operations'][key]
+    number, source_path = endpoint_index['origins'][key]
+    with span('load_schema'), SchemaContainer(endpoint_index['containers'][number]) as container:
+        operation_slice = container.operation_slice(source_path, method.lower())
+    operation_slice['paths'] = {path: operation_slice['paths'][source_path]}
+    return operation_slice
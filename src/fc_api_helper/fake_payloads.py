@@ -0,0 +1,516 @@
+"""Schema-driven fake payload generation for load and seed testing.
+
+A schema is compiled once into a tree of closures (one per schema node,
+one per $ref component) bound to a seeded random generator, so producing
+each payload is just a few calls per field:
+
+    generate = compile_generator(body_schema, full_schema, seed=1)
+    payload = generate()
+
+Payloads are valid against the schema: enums, formats (uuid, date,
+date-time, email, uri, decimal...), min/max lengths, values and items,
+nested $ref objects, allOf/oneOf/anyOf, nullable fields and readOnly
+properties (left out of request bodies) are honoured. Optional properties
+are only included some of the time. Recursive components are expanded
+MAX_DEPTH levels, then only as far as the schema requires (required
+properties, minItems). The one exception is a schema that cannot be
+satisfied by a finite payload (a component that requires itself): it is
+cut off after MINIMAL_DEPTH more levels, leaving the required value out.
+uuid fields are filled from fc-uuid samples when available, and with
+random UUIDs otherwise.
+
+compile_operation_generator produces whole requests (method, path with
+parameters filled in, headers, body), which write_payloads streams in
+batches to a JSON Lines file that `be-curl --batch` / `dpl-curl --batch`
+can send.
+"""
+
+import datetime
+import random
+import re
+import sys
+from urllib.parse import quote, urlencode
+
+from fc_api_helper import json_codec
+from fc_api_helper.uuid_prefetch import is_uuid_field
+
+
+# Payloads serialized per write
+BATCH_SIZE = 1000
+
+# Share of payloads including a given optional property
+OPTIONAL_RATE = 0.7
+
+# Share of nullable values generated as null
+NULL_RATE = 0.1
+
+# Levels of recursion allowed through recursive $ref components (trees
+# grow exponentially with it)
+MAX_DEPTH = 1
+
+# Further levels generated as minimal objects (required properties only,
+# minItems items) when the schema requires them, before giving up
+MINIMAL_DEPTH = 3
+
+# Items per array when the schema does not bound them; arrays nested in
+# another array get one item, so nested lists do not grow exponentially
+DEFAULT_MIN_ITEMS = 1
+DEFAULT_MAX_ITEMS = 3
+NESTED_MAX_ITEMS = 1
+
+# Range of integers and numbers when the schema does not bound them
+DEFAULT_RANGE = 1000
+
+DATE_START = datetime.date(2020, 1, 1).toordinal()
+DATE_SPAN_DAYS = 6 * 365
+
+WORDS = (
+    'alpha', 'bravo', 'charlie', 'delta', 'echo', 'foxtrot', 'golf', 'hotel',
+    'india', 'juliett', 'kilo', 'lima', 'mike', 'november', 'oscar', 'papa',
+)
+
+DECIMAL_PLACES_PATTERN = re.compile(r'\\\.\\d\{0,(\d+)\}')
+
+# Returned by generators of recursive components past MAX_DEPTH +
+# MINIMAL_DEPTH; the enclosing object or array leaves the value out
+_OMIT = object()
+
+
+def _get_type(schema):
+    """Return (type, nullable) of a schema node (OpenAPI 3.0 and 3.1 forms)."""
+    schema_type = schema.get('type')
+    nullable = bool(schema.get('nullable'))
+    if isinstance(schema_type, list):
+        nullable = nullable or 'null' in schema_type
+        schema_type = next((t for t in schema_type if t != 'null'), None)
+    if schema_type is None:
+        if 'properties' in schema or 'additionalProperties' in schema:
+            schema_type = 'object'
+        elif 'items' in schema:
+            schema_type = 'array'
+    return schema_type, nullable
+
+
+def _get_bounds(schema, step=1):
+    """Return the inclusive (low, high) bounds of a numeric schema node.
+
+    Exclusive bounds are moved inwards by step (1 for integers, the
+    precision of generated numbers otherwise).
+    """
+    low, high = schema.get('minimum'), schema.get('maximum')
+    exclusive_low, exclusive_high = schema.get('exclusiveMinimum'), schema.get('exclusiveMaximum')
+    # OpenAPI 3.0 flags vs 3.1 numbers
+    if isinstance(exclusive_low, bool):
+        low = low + step if exclusive_low and low is not None else low
+    elif exclusive_low is not None:
+        low = exclusive_low + step
+    if isinstance(exclusive_high, bool):
+        high = high - step if exclusive_high and high is not None else high
+    elif exclusive_high is not None:
+        high = exclusive_high - step
+    if low is None:
+        low = 0 if high is None or high >= 0 else high - DEFAULT_RANGE
+    if high is None:
+        high = low + DEFAULT_RANGE
+    if step == 1:
+        return -int(-low // 1), int(high // 1)
+    return low, high
+
+
+class PayloadCompiler:
+    """Compile schema nodes into generator functions sharing one random generator."""
+
+    def __init__(self, full_schema=None, rng=None, uuid_samples=None):
+        """Set up a compiler.
+
+        Args:
+            full_schema: Schema $refs are resolved against
+            rng: random.Random instance (default: a new unseeded one)
+            uuid_samples: Optional dict of field name -> list of UUIDs used for
+                that field (e.g. fc-uuid samples)
+        """
+        self.full_schema = full_schema or {}
+        self.rng = rng or random.Random()
+        self.uuid_samples = {name: list(uuids) for name, uuids in (uuid_samples or {}).items() if uuids}
+        self._refs = {}
+        self._compiling = {}
+        self._depth = [0]
+        self._array_nesting = [0]
+
+        # random.randint/choice go through several Python-level calls;
+        # scaling random() is a few times faster
+        rand = self.rng.random
+        self._randint = lambda low, high: low + int(rand() * (high - low + 1))
+        self._choice = lambda values: values[int(rand() * len(values))]
+
+    def compile(self, schema, name=''):
+        """Return a function generating values valid against schema.
+
+        Args:
+            schema: Schema node (may be a $ref)
+            name: Property or parameter name, used for uuid samples and
+                readable strings
+        """
+        if not schema:
+            return self._compile_string({}, name)
+        if '$ref' in schema:
+            return self._compile_ref(schema['$ref'], name)
+        if 'allOf' in schema:
+            return self.compile(self._merge_all_of(schema), name)
+
+        schema_type, nullable = _get_type(schema)
+        if 'const' in schema:
+            value = schema['const']
+            generate = lambda: value
+        elif schema.get('enum'):
+            generate = self._compile_enum(schema['enum'])
+        elif 'oneOf' in schema or 'anyOf' in schema:
+            generate = self._compile_choice(schema.get('oneOf') or schema.get('anyOf'), name)
+        elif schema_type == 'object':
+            generate = self._compile_object(schema)
+        elif schema_type == 'array':
+            generate = self._compile_array(schema, name)
+        elif schema_type == 'integer':
+            generate = self._compile_integer(schema)
+        elif schema_type == 'number':
+            generate = self._compile_number(schema)
+        elif schema_type == 'boolean':
+            rand = self.rng.random
+            generate = lambda: rand() < 0.5
+        else:
+            generate = self._compile_string(schema, name)
+
+        if nullable:
+            rand = self.rng.random
+            non_null = generate
+            generate = lambda: None if rand() < NULL_RATE else non_null()
+        return generate
+
+    def _resolve(self, ref):
+        if not ref.startswith('#/'):
+            return None
+        current = self.full_schema
+        for part in ref[2:].split('/'):
+            if not isinstance(current, dict) or part not in current:
+                return None
+            current = current[part]
+        return current
+
+    def _compile_ref(self, ref, name):
+        # Components are compiled once; name-dependent uuid samples only
+        # apply to inline fields
+        if ref in self._refs:
+            return self._refs[ref]
+        if ref in self._compiling:
+            # Recursive component: resolved lazily, minimal past MAX_DEPTH
+            # (see _compile_object, _compile_array) and cut off after that
+            cell, depth = self._compiling[ref], self._depth
+
+            def generate_recursive():
+                if depth[0] >= MAX_DEPTH + MINIMAL_DEPTH:
+                    return _OMIT
+                depth[0] += 1
+                try:
+                    return cell[0]()
+                finally:
+                    depth[0] -= 1
+            return generate_recursive
+
+        resolved = self._resolve(ref)
+        if resolved is None:
+            return lambda: None
+        cell = self._compiling[ref] = [None]
+        try:
+            cell[0] = self.compile(resolved, name)
+        finally:
+            del self._compiling[ref]
+        self._refs[ref] = cell[0]
+        return cell[0]
+
+    def _merge_all_of(self, schema):
+        merged = {key: value for key, value in schema.items() if key != 'allOf'}
+        properties, required = {}, []
+        for part in schema['allOf']:
+            if '$ref' in part:
+                part = self._resolve(part['$ref']) or {}
+            if 'allOf' in part:
+                part = self._merge_all_of(part)
+            properties.update(part.get('properties', {}))
+            required.extend(part.get('required', []))
+            for key, value in part.items():
+                if key not in ('properties', 'required'):
+                    merged.setdefault(key, value)
+        properties.update(schema.get('properties', {}))
+        required.extend(schema.get('required', []))
+        if properties:
+            merged['properties'] = properties
+        if required:
+            merged['required'] = list(dict.fromkeys(required))
+        return merged
+
+    def _compile_enum(self, values):
+        values = list(values)
+        if len(values) == 1:
+            value = values[0]
+            return lambda: value
+        rand, count = self.rng.random, len(values)
+        return lambda: values[int(rand() * count)]
+
+    def _compile_choice(self, schemas, name):
+        choice = self._choice
+        generators = [self.compile(schema, name) for schema in schemas]
+        if len(generators) == 1:
+            return generators[0]
+        return lambda: choice(generators)()
+
+    def _compile_object(self, schema):
+        required_names = set(schema.get('required', []))
+        required, optional = [], []
+        for prop_name, prop_schema in (schema.get('properties') or {}).items():
+            if prop_schema.get('readOnly'):
+                continue
+            generator = self.compile(prop_schema, prop_name)
+            (required if prop_name in required_names else optional).append((prop_name, generator))
+
+        extra = schema.get('additionalProperties')
+        if not required and not optional and isinstance(extra, dict) and extra:
+            value_generator = self.compile(extra)
+            randint = self._randint
+            return lambda: {f"key{i}": value_generator() for i in range(randint(1, 2))}
+
+        rand = self.rng.random
+        depth = self._depth
+
+        def generate_object():
+            obj = {}
+            for prop_name, generator in required:
+                value = generator()
+                if value is not _OMIT:
+                    obj[prop_name] = value
+            if depth[0] > MAX_DEPTH:
+                # Minimal object past the recursion limit
+                return obj
+            for prop_name, generator in optional:
+                if rand() < OPTIONAL_RATE:
+                    value = generator()
+                    if value is not _OMIT:
+                        obj[prop_name] = value
+            return obj
+        return generate_object
+
+    def _compile_array(self, schema, name):
+        items = schema.get('items') or {}
+        low = schema.get('minItems', DEFAULT_MIN_ITEMS if schema.get('maxItems', 1) else 0)
+        high = schema.get('maxItems', max(low, DEFAULT_MAX_ITEMS))
+        nested_high = schema.get('maxItems', max(low, NESTED_MAX_ITEMS))
+        randint = self._randint
+        nesting = self._array_nesting
+        depth = self._depth
+        minimal = schema.get('minItems', 0)
+
+        resolved = self._resolve(items['$ref']) if '$ref' in items else items
+        if schema.get('uniqueItems') and resolved and resolved.get('enum'):
+            values = list(resolved['enum'])
+            sample = self.rng.sample
+            high = min(high, len(values))
+            return lambda: sample(values, randint(min(low, high), high))
+
+        generator = self.compile(items, name)
+        if schema.get('uniqueItems'):
+            warned = []
+
+            def generate_unique():
+                count = minimal if depth[0] > MAX_DEPTH else randint(low, high)
+                seen, result = set(), []
+                # Give up on duplicates after a few tries (tiny value spaces)
+                for _ in range(count * 4):
+                    value = generator()
+                    if value is _OMIT:
+                        continue
+                    key = json_codec.dumps(value)
+                    if key not in seen:
+                        seen.add(key)
+                        result.append(value)
+                        if len(result) == count:
+                            break
+                if len(result) < minimal and not warned:
+                    warned.append(True)
+                    print(f"Warning: {name or 'array'} got {len(result)} unique items, fewer than "
+                          f"its minItems ({minimal}); the payloads will not validate", file=sys.stderr)
+                return result
+            return generate_unique
+
+        def generate_array():
+            if depth[0] > MAX_DEPTH:
+                count = minimal
+            else:
+                count = randint(low, nested_high if nesting[0] else high)
+            nesting[0] += 1
+            try:
+                values = [generator() for _ in range(count)]
+            finally:
+                nesting[0] -= 1
+            return [value for value in values if value is not _OMIT]
+        return generate_array
+
+    def _compile_integer(self, schema):
+        low, high = _get_bounds(schema)
+        randint = self._randint
+        step = schema.get('multipleOf')
+        if isinstance(step, int) and step > 1:
+            first, last = -(-low // step), high // step
+            return lambda: randint(first, last) * step
+        rand, size = self.rng.random, high - low + 1
+        return lambda: low + int(rand() * size)
+
+    def _compile_number(self, schema):
+        low, high = _get_bounds(schema, step=0.01)
+        uniform = self.rng.uniform
+        return lambda: min(high, max(low, round(uniform(low, high), 2)))
+
+    def _compile_string(self, schema, name):
+        rng = self.rng
+        string_format = schema.get('format', '')
+        samples = self.uuid_samples.get(name)
+
+        if string_format == 'uuid' or (not string_format and is_uuid_field(name)):
+            if samples:
+                choice = self._choice
+                return lambda: choice(samples)
+            getrandbits = rng.getrandbits
+
+            def generate_uuid():
+                # Version 4 layout
+                h = '%032x' % getrandbits(128)
+                return f"{h[:8]}-{h[8:12]}-4{h[13:16]}-{'89ab'[int(h[16], 16) & 3]}{h[17:20]}-{h[20:]}"
+            return generate_uuid
+
+        randint = self._randint
+        choice = self._choice
+        if string_format == 'date':
+            return lambda: datetime.date.fromordinal(DATE_START + randint(0, DATE_SPAN_DAYS)).isoformat()
+        if string_format == 'date-time':
+            return lambda: (datetime.date.fromordinal(DATE_START + randint(0, DATE_SPAN_DAYS)).isoformat()
+                            + 'T%02d:%02d:%02dZ' % (randint(0, 23), randint(0, 59), randint(0, 59)))
+        if string_format == 'time':
+            return lambda: '%02d:%02d:%02d' % (randint(0, 23), randint(0, 59), randint(0, 59))
+        if string_format == 'email':
+            return lambda: f"{choice(WORDS)}.{choice(WORDS)}{randint(1, 999)}@example.com"
+        if string_format in ('uri', 'url'):
+            return lambda: f"https://example.com/{choice(WORDS)}/{randint(1, 99999)}"
+        if string_format == 'ipv4':
+            return lambda: '%d.%d.%d.%d' % (randint(1, 254), randint(0, 255), randint(0, 255), randint(1, 254))
+        if string_format == 'decimal':
+            # DRF decimals: string with a \d{0,N}(?:\.\d{0,M})? pattern
+            places_match = DECIMAL_PLACES_PATTERN.search(schema.get('pattern', ''))
+            places = int(places_match.group(1)) if places_match else 2
+            low, high = _get_bounds(schema, step=10 ** -places)
+            scale = 10 ** places
+            low, high = -int(-low * scale // 1), int(high * scale // 1)
+            return lambda: f"{randint(low, high) / scale:.{places}f}"
+        if string_format == 'binary':
+            return lambda: ''
+
+        min_length = schema.get('minLength', 0)
+        max_length = schema.get('maxLength')
+        prefix = re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-') or 'value'
+        rand, words, word_count = self.rng.random, WORDS, len(WORDS)
+        if not min_length and max_length is None:
+            # Hot path: most string fields are unconstrained
+            return lambda: f"{prefix}-{words[int(rand() * word_count)]}-{int(rand() * 99999) + 1}"
+
+        def generate_string():
+            value = f"{prefix}-{words[int(rand() * word_count)]}-{int(rand() * 99999) + 1}"
+            if len(value) < min_length:
+                value += 'x' * (min_length - len(value))
+            return value[:max_length] if max_length is not None else value
+        return generate_string
+
+
+def compile_generator(body_schema, full_schema=None, uuid_samples=None, seed=None):
+    """Compile a schema into a function returning a new fake value per call.
+
+    Args:
+        body_schema: Schema to generate values for
+        full_schema: Schema holding the components $refs point to
+        uuid_samples: Optional dict of field name -> UUIDs to use for it
+        seed: Optional seed, for reproducible payloads
+
+    Returns:
+        Function of no arguments
+    """
+    compiler = PayloadCompiler(full_schema, random.Random(seed), uuid_samples)
+    return compiler.compile(body_schema or {})
+
+
+def compile_operation_generator(schema, path, method, headers=None, uuid_samples=None, seed=None):
+    """Compile a generator of whole fake requests for an operation.
+
+    Required query and header parameters and every path parameter get fake
+    values; the body is generated for methods sending one.
+
+    Args:
+        schema: Schema holding the operation (full schema or its slice)
+        path: Operation path
+        method: Operation method
+        headers: Fixed headers added to every request (e.g. the client UUID)
+        uuid_samples: Optional dict of field name -> UUIDs to use for it
+        seed: Optional seed, for reproducible payloads
+
+    Returns:
+        Function returning {"method", "path", "headers", "body"} dicts, the
+        request format of `be-curl --batch`
+    """
+    # Imported lazily: api_explorer imports this module
+    from fc_api_helper.api_explorer import get_parameters, get_request_body_schema
+
+    compiler = PayloadCompiler(schema, random.Random(seed), uuid_samples)
+    method = method.upper()
+    headers = dict(headers or {})
+
+    def compile_params(param_in, required_only=True):
+        return [(param['name'], compiler.compile(param.get('schema') or {}, param['name']))
+                for param in get_parameters(schema, path, method, param_in)
+                if param.get('required') or not required_only]
+
+    path_params = compile_params('path', required_only=False)
+    query_params = compile_params('query')
+    header_params = [(name, generator) for name, generator in compile_params('header')
+                     if name.lower() not in {h.lower() for h in headers}]
+    body_generator = None
+    if method in ('POST', 'PUT', 'PATCH', 'DELETE'):
+        body_schema = get_request_body_schema(schema, path, method)
+        if body_schema:
+            body_generator = compiler.compile(body_schema)
+
+    def generate_request():
+        request_path = path
+        for name, generator in path_params:
+            request_path = request_path.replace(f"{{{name}}}", quote(str(generator()), safe=''))
+        if query_params:
+            request_path += '?' + urlencode([(name, generator()) for name, generator in query_params])
+        request = {'method': method, 'path': request_path}
+        if headers or header_params:
+            request['headers'] = dict(headers, **{name: str(generator()) for name, generator in header_params})
+        if body_generator is not None:
+            request['body'] = body_generator()
+        return request
+    return generate_request
+
+
+def write_payloads(f, generate, count, batch_size=BATCH_SIZE):
+    """Write count generated values to a binary file as JSON Lines.
+
+    Values are generated and serialized in batches of batch_size so the
+    file is written in large chunks.
+
+    Returns:
+        Number of values written
+    """
+    dumps = json_codec.dumps
+    written = 0
+    while written < count:
+        size = min(batch_size, count - written)
+        f.write(b"\n".join([dumps(generate()) for _ in range(size)]) + b"\n")
+        written += size
+    return written
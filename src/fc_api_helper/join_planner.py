@@ -0,0 +1,171 @@
+"""Client join-path planning over the fc-uuid foreign-key graph.
+
+Tables are described by their foreign-key edges (see fc_uuid.TABLE_CONFIG):
+
+    "fks": {"<column>": "<target_table>.<target_column>"}
+
+A column may list several targets when it is polymorphic (e.g. a document's
+entity_uuid pointing at a company, investor or person); such a column
+reaches the client when any of its targets does.
+
+The planner finds the cheapest path from a table to fundcraft_client, where
+the cost is the number of tables that must be visited. A reference to
+fundcraft_client.uuid is free: the column already holds the client UUID.
+The path is compiled into nested IN (...) semi-joins so Postgres can hash
+the (small) set of client-owned parent ids instead of joining full tables.
+Compiled filters quote every identifier and reference the client UUID as the
+CLIENT_PARAM query parameter, so their text does not depend on the client.
+"""
+
+import heapq
+
+from fc_api_helper.psql import param, quote_ident
+
+
+CLIENT_TABLE = 'fundcraft_client'
+CLIENT_KEY = 'uuid'
+SCHEMA = 'django'
+
+# Query parameter holding the client UUID in compiled filters
+CLIENT_PARAM = 'client_uuid'
+CLIENT_PLACEHOLDER = param(CLIENT_PARAM)
+
+
+def parse_target(target):
+    """Split "table.column" into a (table, column) tuple."""
+    table, _, column = target.partition('.')
+    return table, column
+
+
+def iter_fks(table_config, table):
+    """Yield (column, [(target_table, target_column), ...]) for a table."""
+    config = table_config.get(table) or {}
+    for column, targets in (config.get('fks') or {}).items():
+        if isinstance(targets, str):
+            targets = [targets]
+        yield column, [parse_target(t) for t in targets]
+
+
+class JoinPlanner:
+    """Compute and cache client filters for every table of a TABLE_CONFIG."""
+
+    def __init__(self, table_config):
+        self.table_config = table_config
+        self._costs = None
+        self._compiled = {}
+
+    def _hop_cost(self, target_table, target_column):
+        if target_table == CLIENT_TABLE and target_column == CLIENT_KEY:
+            return 0
+        if target_table == CLIENT_TABLE:
+            return 1
+        return 1 + self._costs.get(target_table, float('inf'))
+
+    def _column_cost(self, targets):
+        # A polymorphic column has to check every target
+        return max(self._hop_cost(t, c) for t, c in targets)
+
+    def compute_costs(self):
+        """Compute the cheapest client path cost of every table.
+
+        Runs Dijkstra backwards from fundcraft_client over the reversed
+        foreign-key graph; polymorphic columns are settled once all their
+        targets are.
+
+        Returns:
+            Dict mapping table to cost (tables without a path are absent)
+        """
+        if self._costs is not None:
+            return self._costs
+
+        referrers = {}
+        for table in self.table_config:
+            for column, targets in iter_fks(self.table_config, table):
+                for target_table, _ in targets:
+                    referrers.setdefault(target_table, set()).add(table)
+
+        self._costs = {CLIENT_TABLE: 0}
+        queue = [(0, CLIENT_TABLE)]
+        settled = set()
+
+        while queue:
+            cost, table = heapq.heappop(queue)
+            if table in settled:
+                continue
+            settled.add(table)
+
+            for referrer in referrers.get(table, ()):
+                if referrer in settled:
+                    continue
+                best = min(
+                    (self._column_cost(targets) for _, targets in iter_fks(self.table_config, referrer)),
+                    default=float('inf'),
+                )
+                if best < self._costs.get(referrer, float('inf')):
+                    self._costs[referrer] = best
+                    heapq.heappush(queue, (best, referrer))
+
+        return self._costs
+
+    def find_client_path(self, table):
+        """Return the cheapest client path of a table.
+
+        Returns:
+            Nested plan (column, [(target_table, target_column, subplan)])
+            where subplan is None once the target is fundcraft_client, a
+            plan of None for fundcraft_client itself, or False if the table
+            has no path to fundcraft_client
+        """
+        costs = self.compute_costs()
+        if table == CLIENT_TABLE:
+            return None
+        if table not in costs:
+            return False
+
+        best = None
+        for column, targets in iter_fks(self.table_config, table):
+            cost = self._column_cost(targets)
+            if best is None or cost < best[0]:
+                best = (cost, column, targets)
+
+        _, column, targets = best
+        branches = []
+        for target_table, target_column in targets:
+            subplan = None if target_table == CLIENT_TABLE else self.find_client_path(target_table)
+            branches.append((target_table, target_column, subplan))
+        return column, branches
+
+    def _compile(self, plan, alias, depth):
+        if plan is None:
+            return f"{alias}.{quote_ident(CLIENT_KEY)} = {CLIENT_PLACEHOLDER}"
+
+        column, branches = plan
+        conditions = []
+        for target_table, target_column, subplan in branches:
+            if target_table == CLIENT_TABLE and target_column == CLIENT_KEY:
+                conditions.append(f"{alias}.{quote_ident(column)} = {CLIENT_PLACEHOLDER}")
+                continue
+            sub_alias = f"j{depth}"
+            sub_condition = self._compile(subplan, sub_alias, depth + 1)
+            conditions.append(
+                f"{alias}.{quote_ident(column)} IN (SELECT {sub_alias}.{quote_ident(target_column)} "
+                f"FROM {quote_ident(SCHEMA)}.{quote_ident(target_table)} {sub_alias} WHERE {sub_condition})"
+            )
+
+        if len(conditions) == 1:
+            return conditions[0]
+        return "(" + " OR ".join(conditions) + ")"
+
+    def client_filter(self, table):
+        """Return the compiled (cached) WHERE condition filtering a table by client.
+
+        The condition uses alias "t" for the table and CLIENT_PLACEHOLDER for
+        the client UUID.
+
+        Returns:
+            SQL condition string, or None if the table has no client path
+        """
+        if table not in self._compiled:
+            plan = self.find_client_path(table)
+            self._compiled[table] = None if plan is False else self._compile(plan, 't', 1)
+        return self._compiled[table]
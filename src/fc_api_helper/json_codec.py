@@ -0,0 +1,160 @@
+"""Pluggable JSON codec: orjson or msgspec when installed, stdlib json otherwise.
+
+Schema loading, response formatting and the index files all go through this
+module. The fast backends parse bytes directly and serialize to bytes, so
+callers should hand over file or response bytes instead of decoding them
+first.
+
+Decoding a large document allocates millions of containers, which makes the
+cyclic garbage collector run over and over for nothing (a parsed document has
+no cycles); the collector is paused while such documents are decoded.
+
+Set FC_API_JSON=stdlib (or orjson / msgspec) to force a backend.
+"""
+
+import gc
+import json
+import os
+import re
+from contextlib import contextmanager
+
+
+JSON_ENV = 'FC_API_JSON'
+
+# Documents from this size on are decoded with the garbage collector paused
+GC_PAUSE_THRESHOLD = 1 << 20
+
+# Exceptions raised for invalid JSON by any backend
+DecodeError = (json.JSONDecodeError, UnicodeDecodeError)
+
+
+# What the fast backends reject in valid documents: integers over 64 bits
+# and escaped lone surrogates
+_STDLIB_ONLY = re.compile(r'\d{19}|\\u[dD][89a-fA-F]')
+_STDLIB_ONLY_BYTES = re.compile(_STDLIB_ONLY.pattern.encode('ascii'))
+
+
+def _stdlib_loads(data):
+    return json.loads(data)
+
+
+def _stdlib_dumps(obj, indent=False):
+    # Raw UTF-8 like the fast backends; lone surrogates can only be escaped
+    options = {'indent': 2} if indent else {'separators': (',', ':')}
+    try:
+        return json.dumps(obj, ensure_ascii=False, **options).encode('utf-8')
+    except UnicodeEncodeError:
+        return json.dumps(obj, **options).encode('utf-8')
+
+
+def _load_orjson():
+    import orjson
+
+    def dumps(obj, indent=False):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError
+    return orjson.loads, dumps, ()
+
+
+def _load_msgspec():
+    import msgspec
+
+    encoder = msgspec.json.Encoder()
+
+    def dumps(obj, indent=False):
+        data = encoder.encode(obj)
+        return msgspec.json.format(data, indent=2) if indent else data
+
+    return msgspec.json.decode, dumps, (msgspec.DecodeError,)
+
+
+BACKENDS = {
+    'orjson': _load_orjson,
+    'msgspec': _load_msgspec,
+}
+
+
+def get_backend(name=None):
+    """Return (name, loads, dumps, decode_errors) of the best available backend.
+
+    Args:
+        name: Backend to use ('orjson', 'msgspec' or 'stdlib'); default: the
+            FC_API_JSON environment variable, else the first installed one
+    """
+    name = name or os.environ.get(JSON_ENV, '').strip().lower() or None
+    candidates = [name] if name else list(BACKENDS)
+    for candidate in candidates:
+        if candidate in BACKENDS:
+            try:
+                return (candidate,) + BACKENDS[candidate]()
+            except ImportError:
+                continue
+    return 'stdlib', _stdlib_loads, _stdlib_dumps, ()
+
+
+BACKEND, _loads, _dumps, _decode_errors = get_backend()
+DecodeError = DecodeError + _decode_errors
+
+
+@contextmanager
+def gc_paused():
+    """Pause the cyclic garbage collector (e.g. while processing decoded documents)."""
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def loads(data):
+    """Parse JSON from bytes or str.
+
+    Raises:
+        DecodeError: data is not valid JSON
+    """
+    if len(data) >= GC_PAUSE_THRESHOLD:
+        with gc_paused():
+            return _loads_with_fallback(data)
+    return _loads_with_fallback(data)
+
+
+def _loads_with_fallback(data):
+    try:
+        return _loads(data)
+    except DecodeError:
+        if BACKEND == 'stdlib':
+            raise
+        # Fast backends reject some valid documents (e.g. integers over
+        # 64 bits); only those are worth parsing again
+        pattern = _STDLIB_ONLY if isinstance(data, str) else _STDLIB_ONLY_BYTES
+        if pattern.search(data) is None:
+            raise
+        return _stdlib_loads(data)
+
+
+def dumps(obj, indent=False):
+    """Serialize to UTF-8 JSON bytes (compact, or indented by 2 spaces)."""
+    try:
+        return _dumps(obj, indent)
+    except (TypeError, OverflowError):
+        # e.g. non-str keys or integers over 64 bits
+        return _stdlib_dumps(obj, indent)
+
+
+def dumps_str(obj, indent=False):
+    """Serialize to a JSON str."""
+    return dumps(obj, indent).decode('utf-8')
+
+
+def load_file(path):
+    """Read and parse a JSON file.
+
+    Raises:
+        FileNotFoundError: The file does not exist
+        DecodeError: The file is not valid JSON
+    """
+    with open(path, 'rb') as f:
+        return loads(f.read())
@@ -0,0 +1,120 @@
+"""Structural diff of two decoded JSON documents.
+
+Differences are yielded one at a time while the documents are walked, so
+the caller can print them as they are found and stop early. Paths use the
+json_select syntax and can be passed to `--select` as they are; list
+elements carrying a unique 'uuid' (or 'id') are matched by it instead of
+by position and addressed as `results[?uuid==...]`.
+
+Volatile fields (timestamps...) are ignored by key or path glob patterns.
+"""
+
+import fnmatch
+import re
+
+
+# Key patterns ignored by default: values that differ on every environment
+VOLATILE_FIELDS = ('*_at', 'timestamp', 'last_login', 'date_joined')
+
+# Keys used to match list elements across documents, by preference
+IDENTITY_KEYS = ('uuid', 'id')
+
+SIMPLE_KEY = re.compile(r'^[A-Za-z_][\w-]*$')
+
+
+def join_key(path, key):
+    """Append an object key to a json_select path."""
+    if SIMPLE_KEY.match(key):
+        return f"{path}.{key}" if path else key
+    quoted = key.replace('\\', '\\\\').replace("'", "\\'")
+    return f"{path}['{quoted}']"
+
+
+def is_ignored(path, key, patterns):
+    """Return whether a key (at path) matches one of the ignore patterns."""
+    return any(fnmatch.fnmatchcase(key, pattern) or fnmatch.fnmatchcase(path, pattern)
+               for pattern in patterns)
+
+
+def _same_type(left, right):
+    if isinstance(left, bool) or isinstance(right, bool):
+        return type(left) is type(right)
+    if isinstance(left, (int, float)) and isinstance(right, (int, float)):
+        return True
+    return type(left) is type(right)
+
+
+def _identity_key(left, right):
+    """Return the key identifying the elements of both lists, if any."""
+    if not left or not right:
+        return None
+    for key in IDENTITY_KEYS:
+        identities = []
+        for items in (left, right):
+            values = [item.get(key) if isinstance(item, dict) else None for item in items]
+            if None in values or len(set(map(repr, values))) != len(values):
+                break
+            identities.append(values)
+        else:
+            return key
+    return None
+
+
+def _element_path(path, key, identity):
+    value = identity if isinstance(identity, str) and SIMPLE_KEY.match(identity) else repr(identity)
+    return f"{path}[?{key}=={value}]"
+
+
+def iter_diff(left, right, ignore=VOLATILE_FIELDS, path=''):
+    """Yield the differences between two decoded JSON values.
+
+    Args:
+        left: First document
+        right: Second document
+        ignore: Key or path glob patterns to skip (see VOLATILE_FIELDS)
+        path: Path of left/right (json_select syntax, '' for the root)
+
+    Yields:
+        Tuples of (kind, path, left_value, right_value) where kind is
+        'changed', 'removed' (only in left) or 'added' (only in right);
+        the missing side is None
+    """
+    if isinstance(left, dict) and isinstance(right, dict):
+        for key, value in left.items():
+            key_path = join_key(path, key)
+            if is_ignored(key_path, key, ignore):
+                continue
+            if key not in right:
+                yield 'removed', key_path, value, None
+            else:
+                yield from iter_diff(value, right[key], ignore, key_path)
+        for key, value in right.items():
+            if key not in left:
+                key_path = join_key(path, key)
+                if not is_ignored(key_path, key, ignore):
+                    yield 'added', key_path, None, value
+    elif isinstance(left, list) and isinstance(right, list):
+        identity = _identity_key(left, right)
+        if identity:
+            right_by_id = {repr(item[identity]): item for item in right}
+            left_ids = set()
+            for item in left:
+                item_id = repr(item[identity])
+                left_ids.add(item_id)
+                item_path = _element_path(path, identity, item[identity])
+                if item_id in right_by_id:
+                    yield from iter_diff(item, right_by_id[item_id], ignore, item_path)
+                else:
+                    yield 'removed', item_path, item, None
+            for item in right:
+                if repr(item[identity]) not in left_ids:
+                    yield 'added', _element_path(path, identity, item[identity]), None, item
+        else:
+            for index, (left_item, right_item) in enumerate(zip(left, right)):
+                yield from iter_diff(left_item, right_item, ignore, f"{path}[{index}]")
+            for index in range(len(right), len(left)):
+                yield 'removed', f"{path}[{index}]", left[index], None
+            for index in range(len(left), len(right)):
+                yield 'added', f"{path}[{index}]", None, right[index]
+    elif not _same_type(left, right) or left != right:
+        yield 'changed', path, left, right
@@ -0,0 +1,520 @@
+"""Streaming JSONPath-ish selection of values from a JSON document.
+
+Used by `be-curl --select` / `dpl-curl --select`: the response is tokenized
+as it arrives from curl and only the matching values are decoded, so large
+list responses never become a full in-memory tree.
+
+Selector syntax:
+
+    results[*].uuid           every uuid of the results list
+    count                     one top-level key ($ and a leading dot are optional)
+    results[0].name           list index
+    results[:10].name         index range (start and stop optional)
+    ..uuid                    'uuid' keys at any depth
+    data.*                    every value of an object
+    ['odd.key']               quoted key
+    results[?status==active].uuid
+                              elements whose (dotted) field compares with
+                              ==, !=, <, <=, > or >= to a JSON or bare-word
+                              value; [?field] keeps elements where it is truthy
+
+Objects are walked token by token and unselected values are skipped
+without being decoded. Selected array elements (the items of a list
+response) are decoded with the JSON codec, all complete elements of the
+current input chunk at once, and searched in memory, which is much faster
+than walking their tokens in Python; memory use is bounded by the chunk
+(or the largest element), not the document.
+"""
+
+import codecs
+import operator
+import re
+
+from fc_api_helper import json_codec
+
+
+CHUNK_SIZE = 1 << 16
+
+SELECTOR_PATTERN = re.compile(r"""
+    (?P<descend>\.\.)
+  | \.
+  | \[\s*(?:
+        (?P<star>\*)
+      | (?P<start>\d*):(?P<stop>\d*)
+      | (?P<index>\d+)
+      | (?P<quoted>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+      | \?(?P<filter>[^\]]+)
+    )\s*\]
+  | (?P<name>[^.\[\]\s]+)
+""", re.X)
+
+FILTER_PATTERN = re.compile(r'\s*(?P<field>[^=!<>\s]+)\s*(?:(?P<op>==|!=|<=|>=|<|>)\s*(?P<value>.*?))?\s*$')
+
+FILTER_OPERATORS = {
+    '==': operator.eq, '!=': operator.ne,
+    '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge,
+}
+
+TOKEN_PATTERN = re.compile(r"""\s*(?:
+    (?P<open>[{\[])
+  | (?P<close>[}\]])
+  | (?P<comma>,)
+  | (?P<colon>:)
+  | (?P<string>"[^"\\]*(?:\\.[^"\\]*)*")
+  | (?P<scalar>(?:-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?|true|false|null)(?![\w.+-]))
+)""", re.X)
+
+# An object key with its colon, or the end of an empty object
+KEY_PATTERN = re.compile(r'\s*(?:(?P<string>"[^"\\]*(?:\\.[^"\\]*)*")\s*:|(?P<close>\}))')
+
+# Used to skip unselected values: everything up to the next bracket outside
+# strings is consumed in one match (or up to the end of the buffer, or a
+# string continuing in the next chunk)
+SKIP_PATTERN = re.compile(r'[^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]{}]*)*(?:(?P<open>[\[{])|(?P<close>[\]}]))?')
+
+VALUE_START = frozenset('{["-0123456789tfn')
+
+_STRING = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+_PLAIN = r'[^"\[\]{}]*'
+
+
+def _container_pattern(depth):
+    """Pattern of a container nested at most depth levels deep (not validated)."""
+    container = None
+    for _ in range(depth):
+        inner = _STRING if container is None else f"{_STRING}|{container}"
+        container = rf"[\[{{]{_PLAIN}(?:(?:{inner}){_PLAIN})*[\]}}]"
+    return container
+
+
+# A run of complete array elements (containers nested up to 4 levels);
+# the lookahead keeps elements that may continue in the next chunk out
+_ELEMENT = rf'\s*(?:{_container_pattern(4)}|{_STRING}|[^"\[\]{{}},\s]+)(?=\s*[,\]])'
+ELEMENTS_PATTERN = re.compile(rf"{_ELEMENT}(?:\s*,{_ELEMENT})*")
+
+
+class Step:
+    """One selector step, matching object keys or array indexes."""
+
+    def __init__(self, kind, arg=None, recursive=False):
+        self.kind = kind
+        self.arg = arg
+        self.recursive = recursive
+
+    def matches(self, key, value=None):
+        if self.kind == 'key':
+            return key == self.arg
+        if self.kind == 'any':
+            return True
+        if self.kind == 'index':
+            return key == self.arg
+        if self.kind == 'range':
+            start, stop = self.arg
+            return isinstance(key, int) and key >= start and (stop is None or key < stop)
+        # filter
+        return isinstance(key, int) and self.arg(value)
+
+
+def _unquote(text):
+    return re.sub(r'\\(.)', r'\1', text[1:-1])
+
+
+def _parse_filter(text):
+    match = FILTER_PATTERN.match(text)
+    if not match:
+        raise ValueError(f"Invalid filter: [?{text}]")
+    fields = match.group('field').split('.')
+    op = match.group('op')
+    expected = None
+    if op:
+        raw = match.group('value')
+        if raw[:1] == "'" and raw[-1:] == "'":
+            expected = _unquote(raw)
+        else:
+            try:
+                expected = json_codec.loads(raw)
+            except json_codec.DecodeError:
+                expected = raw
+    compare = FILTER_OPERATORS.get(op)
+
+    def predicate(element):
+        value = element
+        for field in fields:
+            if not isinstance(value, dict) or field not in value:
+                return op == '!='
+            value = value[field]
+        if compare is None:
+            return bool(value)
+        try:
+            return compare(value, expected)
+        except TypeError:
+            return False
+
+    return predicate
+
+
+def parse_selector(expression):
+    """Parse a selector expression into steps (see module docstring).
+
+    Raises:
+        ValueError: The expression is not a valid selector
+    """
+    text = expression.strip()
+    if text.startswith('$'):
+        text = text[1:]
+    steps = []
+    recursive = False
+    pos = 0
+    while pos < len(text):
+        match = SELECTOR_PATTERN.match(text, pos)
+        if not match:
+            raise ValueError(f"Invalid selector {expression!r} at {text[pos:]!r}")
+        pos = match.end()
+        kind = match.lastgroup
+        if kind == 'descend':
+            recursive = True
+            continue
+        if kind is None:
+            continue
+        if kind == 'name':
+            name = match.group('name')
+            step = Step('any') if name == '*' else Step('key', name)
+        elif kind == 'star':
+            step = Step('any')
+        elif kind == 'index':
+            step = Step('index', int(match.group('index')))
+        elif kind in ('start', 'stop'):
+            start, stop = match.group('start'), match.group('stop')
+            step = Step('range', (int(start or 0), int(stop) if stop else None))
+        elif kind == 'quoted':
+            step = Step('key', _unquote(match.group('quoted')))
+        else:
+            step = Step('filter', _parse_filter(match.group('filter')))
+        step.recursive = recursive
+        recursive = False
+        steps.append(step)
+    if recursive:
+        raise ValueError(f"Invalid selector {expression!r}: trailing '..'")
+    return steps
+
+
+class _TokenStream:
+    """Incremental reader over UTF-8 byte chunks."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        # Text of the value being captured, and where it continues in buf
+        self._capture_parts = None
+        self._capture_start = 0
+
+    def _fill(self, min_length=0):
+        """Read at least one chunk, and more until min_length characters are unconsumed."""
+        parts = []
+        length = len(self.buf) - self.pos
+        while not self.eof and (not parts or length < min_length):
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                parts.append(self._decoder.decode(b'', final=True))
+                self.eof = True
+            else:
+                parts.append(self._decoder.decode(chunk))
+            length += len(parts[-1])
+        text = "".join(parts)
+        if self._capture_parts is not None:
+            self._capture_parts.append(self.buf[self._capture_start:self.pos])
+            self._capture_start = 0
+        self.buf = self.buf[self.pos:] + text
+        self.pos = 0
+
+    def match(self, pattern):
+        """Match pattern at the current position, reading more input as needed.
+
+        A match running to the end of the buffer is retried with more input,
+        since the token may continue in the next chunk.
+
+        Returns:
+            re.Match, or None if the pattern does not match before EOF
+        """
+        match = pattern.match(self.buf, self.pos)
+        if match is not None and match.end() < len(self.buf):
+            self.pos = match.end()
+            return match
+        while True:
+            match = pattern.match(self.buf, self.pos)
+            if match is not None and (match.end() < len(self.buf) or self.eof):
+                self.pos = match.end()
+                return match
+            if self.eof:
+                return None
+            # Fail fast on non-JSON (HTML error pages...) instead of reading it all
+            rest = self.buf[self.pos:self.pos + 64].lstrip()
+            if rest and match is None and rest[0] not in VALUE_START and rest[0] not in '}],:"':
+                return None
+            # Grow geometrically so a token spanning many chunks is rescanned
+            # O(log n) times
+            self._fill(2 * (len(self.buf) - self.pos))
+
+    def next_token(self):
+        """Return the next token match; its lastgroup names the token kind.
+
+        Raises:
+            ValueError: Invalid JSON or unexpected end of input
+        """
+        match = self.match(TOKEN_PATTERN)
+        if match is None:
+            rest = self.buf[self.pos:self.pos + 40].strip()
+            raise ValueError(f"Invalid JSON near {rest!r}" if rest else "Unexpected end of JSON input")
+        return match
+
+    def start_capture(self, token):
+        self._capture_parts = []
+        self._capture_start = token.start(token.lastgroup)
+
+    def end_capture(self):
+        parts = self._capture_parts
+        parts.append(self.buf[self._capture_start:self.pos])
+        self._capture_parts = None
+        return "".join(parts)
+
+    def skip(self, token):
+        """Consume the rest of the value starting with token."""
+        kind = token.lastgroup
+        if kind != 'open':
+            if kind in ('string', 'scalar'):
+                return
+            raise ValueError(f"Unexpected {token.group(kind)!r} in JSON")
+        self.skip_rest()
+
+    def skip_rest(self, depth=1):
+        """Consume input up to the end of the depth enclosing containers."""
+        while depth:
+            match = SKIP_PATTERN.match(self.buf, self.pos)
+            self.pos = match.end()
+            if match.lastgroup == 'open':
+                depth += 1
+            elif match.lastgroup == 'close':
+                depth -= 1
+            elif self.eof:
+                raise ValueError("Unexpected end of JSON input")
+            else:
+                self._fill()
+
+    def remainder(self):
+        """Return all text left after the current position (reads to EOF)."""
+        parts = [self.buf[self.pos:]]
+        self.buf = ''
+        self.pos = 0
+        while not self.eof:
+            self._fill()
+            parts.append(self.buf)
+            self.buf = ''
+        return "".join(parts)
+
+
+def _decode(text):
+    try:
+        return json_codec.loads(text)
+    except json_codec.DecodeError as e:
+        raise ValueError(str(e)) from e
+
+
+def _decode_key(text):
+    return text[1:-1] if '\\' not in text else _decode(text)
+
+
+class JsonSelector:
+    """Select values matching a selector from a streamed JSON document.
+
+    Usage:
+        selector = JsonSelector('results[*].uuid')
+        for value in selector.iter_matches(chunks):
+            ...
+        trailer = selector.remainder()   # text after the JSON document
+    """
+
+    def __init__(self, expression):
+        self.steps = parse_selector(expression)
+        self._final = len(self.steps)
+        self._stream = None
+        self._key_transitions = {}
+
+    def _advance_key(self, states, key):
+        """_advance for object keys, cached (keys repeat in every element)."""
+        transition = (states, key)
+        next_states = self._key_transitions.get(transition)
+        if next_states is None:
+            next_states = self._key_transitions[transition] = self._advance(states, key)
+        return next_states
+
+    def _advance(self, states, key, value=None):
+        next_states = set()
+        for i in states:
+            if i == self._final:
+                continue
+            step = self.steps[i]
+            if step.matches(key, value):
+                next_states.add(i + 1)
+            if step.recursive:
+                next_states.add(i)
+        return frozenset(next_states)
+
+    def _needs_value(self, states):
+        return any(i < self._final and self.steps[i].kind == 'filter' for i in states)
+
+    def _uses_index(self, states):
+        return any(i < self._final and self.steps[i].kind in ('index', 'range') for i in states)
+
+    def iter_matches(self, chunks):
+        """Yield the decoded values matching the selector, in document order.
+
+        Args:
+            chunks: Iterable of UTF-8 byte chunks holding one JSON document
+                (more text may follow it, see remainder)
+
+        Raises:
+            ValueError: The input is not valid JSON
+        """
+        self._stream = _TokenStream(chunks)
+        yield from self._walk(self._stream.next_token(), frozenset([0]))
+
+    def remainder(self):
+        """Return the text following the JSON document (call after iter_matches)."""
+        return self._stream.remainder() if self._stream else ''
+
+    def _capture(self, token):
+        stream = self._stream
+        stream.start_capture(token)
+        stream.skip(token)
+        return _decode(stream.end_capture())
+
+    def _walk(self, token, states):
+        kind = token.lastgroup
+        if self._final in states:
+            if kind in ('string', 'scalar'):
+                yield _decode(token.group(kind))
+                return
+            value = self._capture(token)
+            yield value
+            # A recursive step may also match inside the selected value
+            inner_states = states - {self._final}
+            if inner_states:
+                yield from self._select_in_memory(value, inner_states)
+            return
+        if kind != 'open':
+            self._stream.skip(token)
+        elif token.group('open') == '{':
+            yield from self._walk_object(states)
+        else:
+            yield from self._walk_array(states)
+
+    def _walk_object(self, states):
+        stream = self._stream
+        while True:
+            key_match = stream.match(KEY_PATTERN)
+            if key_match is None:
+                raise ValueError("Expected an object key in JSON")
+            if key_match.lastgroup == 'close':
+                # Empty object (or a trailing comma, accepted)
+                return
+            key = _decode_key(key_match.group('string'))
+            value_token = stream.next_token()
+            child_states = self._advance_key(states, key)
+            if child_states:
+                yield from self._walk(value_token, child_states)
+            else:
+                stream.skip(value_token)
+            token = stream.next_token()
+            if token.lastgroup == 'close':
+                return
+            if token.lastgroup != 'comma':
+                raise ValueError("Expected ',' or '}' in JSON object")
+
+    def _walk_array(self, states):
+        stream = self._stream
+        if self._uses_index(states) and not self._needs_value(states):
+            yield from self._walk_elements(states)
+            return
+
+        # Every element gets the same states unless a filter looks at it
+        element_states = None if self._needs_value(states) else self._advance(states, 0)
+        if element_states is not None and not element_states:
+            stream.skip_rest()
+            return
+        index = 0
+        while True:
+            # Decode the complete elements in the buffer at once, or else
+            # read the next element on its own
+            match = ELEMENTS_PATTERN.match(stream.buf, stream.pos)
+            if match is not None:
+                stream.pos = match.end()
+                elements = _decode("[" + match.group() + "]")
+            else:
+                token = stream.next_token()
+                if token.lastgroup == 'close':
+                    # Empty array (or a trailing comma, accepted)
+                    return
+                elements = [self._capture(token)]
+            for value in elements:
+                child_states = element_states if element_states is not None else self._advance(states, index, value)
+                if child_states:
+                    yield from self._select_in_memory(value, child_states)
+                index += 1
+            separator = stream.next_token()
+            if separator.lastgroup == 'close':
+                return
+            if separator.lastgroup != 'comma':
+                raise ValueError("Expected ',' or ']' in JSON array")
+
+    def _walk_elements(self, states):
+        """Walk an array element by element (index or range steps)."""
+        stream = self._stream
+        token = stream.next_token()
+        if token.lastgroup == 'close':
+            return
+        index = 0
+        while True:
+            child_states = self._advance(states, index)
+            if child_states:
+                yield from self._walk(token, child_states)
+            else:
+                stream.skip(token)
+            index += 1
+            token = stream.next_token()
+            if token.lastgroup == 'close':
+                return
+            if token.lastgroup != 'comma':
+                raise ValueError("Expected ',' or ']' in JSON array")
+            token = stream.next_token()
+
+    def _select_in_memory(self, value, states):
+        if self._final in states:
+            yield value
+            states = states - {self._final}
+            if not states:
+                return
+        if isinstance(value, dict):
+            items = value.items()
+        elif isinstance(value, list):
+            items = enumerate(value)
+        else:
+            return
+        for key, child in items:
+            child_states = self._advance(states, key, child)
+            if child_states:
+                yield from self._select_in_memory(child, child_states)
+
+
+def select_values(expression, data):
+    """Select values from a JSON document held in bytes or str.
+
+    Returns:
+        List of decoded matching values
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    chunks = (data[i:i + CHUNK_SIZE] for i in range(0, len(data), CHUNK_SIZE))
+    return list(JsonSelector(expression).iter_matches(chunks))
@@ -0,0 +1,207 @@
+"""Opt-in phase timing and profiling for the console scripts.
+
+Enable with the FC_API_PROFILE environment variable, a comma-separated list
+of outputs:
+
+    FC_API_PROFILE=1                                 phase summary table on stderr
+    FC_API_PROFILE=summary,cprofile                  + cProfile stats (.pstats)
+    FC_API_PROFILE=summary,trace=/tmp/be-api.json    + Chrome trace (chrome://tracing)
+
+"cprofile" and "trace" accept an optional "=path"; the default is
+/tmp/fc-api-<command>-<pid>.<ext>. Child processes started by a profiled
+command (e.g. fc-uuid under be-api) suffix explicit paths with their pid.
+"""
+
+import atexit
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+
+PROFILE_ENV = 'FC_API_PROFILE'
+_PARENT_ENV = '_FC_API_PROFILE_PARENT'
+
+_enabled = False
+_options = {}
+_events = []
+_events_lock = threading.Lock()
+_start = None
+_profiler = None
+_command = None
+
+
+def parse_profile_options(value):
+    """Parse an FC_API_PROFILE value into an options dict.
+
+    Args:
+        value: Environment variable value
+
+    Returns:
+        Dict with optional 'summary', 'cprofile' and 'trace' keys (the latter
+        two map to an output path or None for the default), or {} if disabled
+    """
+    value = (value or '').strip()
+    if value.lower() in ('', '0', 'false', 'no', 'off'):
+        return {}
+
+    options = {}
+    for token in value.split(','):
+        name, _, path = token.strip().partition('=')
+        name = name.lower()
+        if name in ('1', 'true', 'yes', 'on', 'summary'):
+            options['summary'] = True
+        elif name in ('cprofile', 'pstats'):
+            options['cprofile'] = path or None
+        elif name in ('trace', 'chrome'):
+            options['trace'] = path or None
+        elif name:
+            print(f"Warning: unknown {PROFILE_ENV} option '{name}'", file=sys.stderr)
+    return options
+
+
+def is_enabled():
+    """Return True when phase spans are being recorded."""
+    return _enabled
+
+
+@contextmanager
+def _record_span(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        with _events_lock:
+            _events.append((name, start, end, threading.get_ident()))
+
+
+@contextmanager
+def _noop_span():
+    yield
+
+
+def span(name):
+    """Time a named phase (no-op unless profiling is enabled).
+
+    Usage:
+        with span('load_schema'):
+            schema = json.load(f)
+    """
+    if not _enabled:
+        return _noop_span()
+    return _record_span(name)
+
+
+def _output_path(option, extension):
+    path = _options.get(option)
+    if path is None:
+        return f"/tmp/fc-api-{_command}-{os.getpid()}.{extension}"
+    if os.environ.get(_PARENT_ENV) not in (None, str(os.getpid())):
+        return f"{path}.{os.getpid()}"
+    return path
+
+
+def format_summary(events, wall_time):
+    """Aggregate span events into a summary table string."""
+    totals = {}
+    for name, start, end, _ in events:
+        count, total, longest = totals.get(name, (0, 0.0, 0.0))
+        duration = end - start
+        totals[name] = (count + 1, total + duration, max(longest, duration))
+
+    lines = [
+        f"{'phase':<16} {'calls':>6} {'total ms':>10} {'max ms':>10} {'% wall':>7}",
+        '-' * 53,
+    ]
+    for name, (count, total, longest) in sorted(totals.items(), key=lambda kv: -kv[1][1]):
+        share = total / wall_time * 100 if wall_time else 0.0
+        lines.append(f"{name:<16} {count:>6} {total * 1e3:>10.1f} {longest * 1e3:>10.1f} {share:>6.1f}%")
+    lines.append('-' * 53)
+    lines.append(f"{'wall':<16} {'':>6} {wall_time * 1e3:>10.1f}")
+    return '\n'.join(lines)
+
+
+def write_chrome_trace(events, path):
+    """Write span events as a Chrome trace (Trace Event Format) JSON file."""
+    import json
+
+    pid = os.getpid()
+    trace_events = [
+        {
+            'name': name,
+            'ph': 'X',
+            'ts': (start - _start) * 1e6,
+            'dur': (end - start) * 1e6,
+            'pid': pid,
+            'tid': tid,
+        }
+        for name, start, end, tid in events
+    ]
+    trace_events.append({'name': 'process_name', 'ph': 'M', 'pid': pid, 'args': {'name': _command}})
+
+    with open(path, 'w') as f:
+        json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, f)
+
+
+def _report():
+    wall_time = time.perf_counter() - _start
+
+    if _profiler is not None:
+        _profiler.disable()
+        path = _output_path('cprofile', 'pstats')
+        _profiler.dump_stats(path)
+        print(f"[profile] cProfile stats written to {path}", file=sys.stderr)
+
+    with _events_lock:
+        events = list(_events)
+
+    if 'trace' in _options:
+        path = _output_path('trace', 'json')
+        write_chrome_trace(events, path)
+        print(f"[profile] Chrome trace written to {path}", file=sys.stderr)
+
+    if _options.get('summary'):
+        print(f"\n[profile] {_command}", file=sys.stderr)
+        print(format_summary(events, wall_time), file=sys.stderr)
+
+
+def install(command):
+    """Enable profiling for this process if FC_API_PROFILE is set.
+
+    Args:
+        command: Name of the running console script (used in reports)
+    """
+    global _enabled, _options, _start, _profiler, _command
+
+    if _enabled:
+        return
+
+    _options = parse_profile_options(os.environ.get(PROFILE_ENV))
+    if not _options:
+        return
+
+    _enabled = True
+    _command = command
+    _start = time.perf_counter()
+    os.environ.setdefault(_PARENT_ENV, str(os.getpid()))
+
+    if 'cprofile' in _options:
+        import cProfile
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+
+    atexit.register(_report)
+
+
+def profiled(command):
+    """Decorator enabling FC_API_PROFILE instrumentation for a CLI main()."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            install(command)
+            return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,144 @@
+"""Offline replay of recorded API exchanges (cassettes written by --record)."""
+
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from fc_api_helper import json_codec
+
+
+def load_cassettes(cassette_files, service=None):
+    """Load recorded exchanges from one or more cassette files.
+
+    Args:
+        cassette_files: List of cassette paths (JSON Lines)
+        service: Only keep exchanges recorded for this service ('be', 'dpl')
+
+    Returns:
+        Dict mapping (method, path) to the list of recorded exchanges
+    """
+    exchanges = {}
+
+    for cassette_file in cassette_files:
+        with open(cassette_file, 'r') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json_codec.loads(line)
+                except json_codec.DecodeError:
+                    print(f"Warning: skipping invalid line {line_number} in {cassette_file}", file=sys.stderr)
+                    continue
+                if service and entry.get('service') != service:
+                    continue
+                key = (entry['method'].upper(), entry['path'])
+                exchanges.setdefault(key, []).append(entry)
+
+    return exchanges
+
+
+class ReplayStore:
+    """Thread-safe lookup of recorded exchanges.
+
+    Repeated requests to the same endpoint cycle through the recorded
+    responses in recording order, so paginated or stateful sequences replay
+    deterministically.
+    """
+
+    def __init__(self, exchanges, static_files=None):
+        self.exchanges = exchanges
+        self.static_files = static_files or {}
+        self._positions = {}
+        self._lock = threading.Lock()
+
+    def match(self, method, path, body):
+        """Return the recorded exchange for a request, or None."""
+        candidates = self.exchanges.get((method, path))
+        if not candidates:
+            return None
+
+        # Prefer exchanges recorded with the same request body
+        same_body = [e for e in candidates if (e.get('body') or '') == (body or '')]
+        if same_body:
+            candidates = same_body
+
+        key = (method, path, body if same_body else None)
+        with self._lock:
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+        return candidates[position % len(candidates)]
+
+
+def make_handler(store, latency_scale=1.0):
+    """Build a request handler class serving from a ReplayStore."""
+
+    class ReplayHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _send(self, status, body, content_type='application/json'):
+            payload = body.encode('utf-8') if isinstance(body, str) else body
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            # HEAD responses announce the body's length but carry none
+            if self.command != 'HEAD':
+                self.wfile.write(payload)
+
+        def _handle(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            body = self.rfile.read(length).decode('utf-8') if length else None
+            method = self.command.upper()
+
+            entry = store.match(method, self.path, body)
+            if entry is None and method == 'HEAD':
+                entry = store.match('GET', self.path, body)
+            if entry is None:
+                static_file = store.static_files.get(urlsplit(self.path).path)
+                if method in ('GET', 'HEAD') and static_file and os.path.exists(static_file):
+                    with open(static_file, 'rb') as f:
+                        self._send(200, f.read())
+                    return
+                self._send(404, json_codec.dumps({'detail': f"No recorded response for {method} {self.path}"}))
+                return
+
+            if latency_scale > 0 and entry.get('elapsed'):
+                time.sleep(entry['elapsed'] * latency_scale)
+
+            self._send(entry.get('status') or 200, entry.get('response') or '')
+
+        do_GET = _handle
+        do_POST = _handle
+        do_PUT = _handle
+        do_PATCH = _handle
+        do_DELETE = _handle
+        do_OPTIONS = _handle
+        do_HEAD = _handle
+
+        def log_message(self, format, *args):
+            print(f"[replay:{self.server.server_port}] {format % args}", file=sys.stderr)
+
+    return ReplayHandler
+
+
+def start_replay_server(host, port, store, latency_scale=1.0):
+    """Start a replay server in a background thread.
+
+    Args:
+        host: Interface to bind
+        port: Port to bind
+        store: ReplayStore to serve from
+        latency_scale: Multiplier applied to recorded latencies (0 disables)
+
+    Returns:
+        The running ThreadingHTTPServer
+    """
+    server = ThreadingHTTPServer((host, port), make_handler(store, latency_scale))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
@@ -0,0 +1,281 @@
+"""Rate limiting, adaptive concurrency and retries for multi-request modes.
+
+A RequestScheduler runs many requests on one event loop:
+
+- a token bucket caps the request rate (requests per second, with bursts),
+- an AIMD limiter adapts the number of requests in flight: it grows by one
+  per window of successful responses and halves when a response is
+  throttled (429/503) or much slower than the best latency seen,
+- 429/503 responses with Retry-After pause every request until then,
+- failed requests (transport errors, 429, 502, 503, 504) of idempotent
+  methods are retried with jittered exponential backoff.
+
+Requests are sent by a caller-provided coroutine returning a response
+object with `status` (int, None on transport errors) and `retry_after`
+(header value or None) attributes.
+"""
+
+import asyncio
+import collections
+import functools
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+
+# Methods that can be retried safely (RFC 9110)
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE', 'TRACE'])
+
+# Statuses retried (None: transport error, no response)
+RETRY_STATUSES = frozenset([None, 429, 502, 503, 504])
+
+# Statuses meaning the server asks clients to slow down
+THROTTLE_STATUSES = frozenset([429, 503])
+
+DEFAULT_RATE = 20.0
+DEFAULT_CONCURRENCY = 16
+INITIAL_CONCURRENCY = 4
+MAX_RETRIES = 3
+
+# Backoff: base * 2^attempt seconds, full jitter, capped
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 30.0
+
+# Longest Retry-After honoured, in seconds
+MAX_RETRY_AFTER = 120.0
+
+# A response this many times slower than the best latency seen counts as
+# congestion
+LATENCY_FACTOR = 3.0
+
+
+def parse_retry_after(value, now=None):
+    """Return the delay in seconds requested by a Retry-After header value.
+
+    Accepts delay-seconds and HTTP-date forms; returns None for a missing
+    or invalid value.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - (now if now is not None else time.time()))
+
+
+def backoff_delay(attempt):
+    """Return the jittered delay before retry number attempt (0-based)."""
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+
+class TokenBucket:
+    """Token bucket rate limiter: rate tokens per second, up to burst saved."""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    async def acquire(self):
+        """Wait until a token is available and take it."""
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AimdLimiter:
+    """Concurrency limit with additive increase and multiplicative decrease."""
+
+    def __init__(self, initial=INITIAL_CONCURRENCY, maximum=DEFAULT_CONCURRENCY, minimum=1,
+                 latency_factor=LATENCY_FACTOR, backoff=0.5):
+        self.limit = float(min(initial, maximum))
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency_factor = latency_factor
+        self.backoff = backoff
+        self.in_flight = 0
+        self.baseline = None
+        # Bumped on every decrease; requests started before the last
+        # decrease do not decrease the limit again
+        self.epoch = 0
+        # Futures of the acquire() calls waiting for a slot, oldest first.
+        # Created by the waiting coroutines, so a limiter is not bound to
+        # one event loop.
+        self._waiters = collections.deque()
+
+    def _wake(self):
+        """Wake one waiter per free slot."""
+        free = int(self.limit) - self.in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    async def acquire(self):
+        """Wait for a free slot.
+
+        Returns:
+            Epoch to pass to release()
+        """
+        while self.in_flight >= int(self.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # Pass a wakeup received while being cancelled on
+                if waiter.done() and not waiter.cancelled():
+                    self._wake()
+                raise
+        self.in_flight += 1
+        return self.epoch
+
+    def release(self, epoch, latency=None, throttled=False):
+        """Free a slot and adapt the limit to the response.
+
+        Args:
+            epoch: Value returned by acquire()
+            latency: Response time in seconds (None if there was no response)
+            throttled: The server asked to slow down (429/503)
+        """
+        self.in_flight -= 1
+        congested = throttled or (
+            latency is not None and self.baseline is not None
+            and latency > self.latency_factor * self.baseline
+        )
+        if congested:
+            if epoch == self.epoch:
+                self.limit = max(self.minimum, self.limit * self.backoff)
+                self.epoch += 1
+        elif latency is not None:
+            # +1 per limit successful responses, i.e. per round trip
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+        if latency is not None:
+            # Best latency seen, drifting up slowly so it can recover
+            self.baseline = latency if self.baseline is None else min(latency, self.baseline * 1.01)
+        self._wake()
+
+
+class RequestScheduler:
+    """Send requests through a rate limit, an AIMD limiter and retries.
+
+    Usage:
+        scheduler = RequestScheduler(rate=10)
+        response = await scheduler.submit('GET', lambda: send(request))
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, concurrency=DEFAULT_CONCURRENCY, max_retries=MAX_RETRIES):
+        self.bucket = TokenBucket(rate) if rate else None
+        self.limiter = AimdLimiter(maximum=concurrency)
+        self.max_retries = max_retries
+        self.paused_until = 0.0
+        self.stats = {'sent': 0, 'retries': 0, 'throttled': 0}
+
+    async def _wait_for_pause(self):
+        while True:
+            delay = self.paused_until - time.monotonic()
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
+
+    async def submit(self, method, send):
+        """Send one request, retrying it if it fails and method is idempotent.
+
+        Args:
+            method: HTTP method
+            send: Callable returning a coroutine that sends the request once
+                and returns a response (see module docstring)
+
+        Returns:
+            The last response, with an `attempts` attribute set
+        """
+        attempt = 0
+        while True:
+            await self._wait_for_pause()
+            if self.bucket:
+                await self.bucket.acquire()
+            epoch = await self.limiter.acquire()
+            started = time.monotonic()
+            try:
+                response = await send()
+            except BaseException:
+                self.limiter.release(epoch)
+                raise
+            latency = time.monotonic() - started if response.status is not None else None
+            throttled = response.status in THROTTLE_STATUSES
+            self.limiter.release(epoch, latency, throttled)
+            self.stats['sent'] += 1
+
+            retry_after = parse_retry_after(response.retry_after)
+            if throttled:
+                self.stats['throttled'] += 1
+                if retry_after is not None:
+                    # The server's requested pause applies to every request
+                    self.paused_until = max(self.paused_until,
+                                            time.monotonic() + min(retry_after, MAX_RETRY_AFTER))
+
+            if (attempt < self.max_retries and method.upper() in IDEMPOTENT_METHODS
+                    and response.status in RETRY_STATUSES):
+                delay = min(retry_after, MAX_RETRY_AFTER) if retry_after is not None else backoff_delay(attempt)
+                attempt += 1
+                self.stats['retries'] += 1
+                await asyncio.sleep(delay)
+                continue
+
+            response.attempts = attempt + 1
+            return response
+
+    async def run(self, requests, send):
+        """Send requests concurrently, yielding responses as they complete.
+
+        A pool of limiter.maximum workers pulls the requests from the
+        iterable, so requests is consumed lazily and scheduling costs the
+        same per request however long the batch is.
+
+        Args:
+            requests: Iterable of (method, request) pairs
+            send: Coroutine function sending one request once
+
+        Yields:
+            (index, response) pairs, in completion order
+        """
+        pending = enumerate(requests)
+        results = asyncio.Queue()
+
+        async def worker():
+            try:
+                for index, (method, request) in pending:
+                    response = await self.submit(method, functools.partial(send, request))
+                    results.put_nowait((index, response))
+            except Exception as e:
+                results.put_nowait(e)
+            else:
+                results.put_nowait(None)
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(self.limiter.maximum)]
+        try:
+            running = len(workers)
+            while running:
+                result = await results.get()
+                if result is None:
+                    running -= 1
+                elif isinstance(result, Exception):
+                    raise result
+                else:
+                    yield result
+        finally:
+            for task in workers:
+                task.cancel()
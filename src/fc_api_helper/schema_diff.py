@@ -0,0 +1,95 @@
+"""Hash-based structural diff of two versions of a schema.
+
+Schema containers (schema_store) record a subtree hash and the directly
+referenced components of every path item, operation and component. Two
+versions are compared from these tables alone, without decoding either
+schema:
+
+    {'operations': {"<METHOD> <path>": [hash, refs]},
+     'components': {"<kind>/<name>": [hash, refs]}}
+
+An operation changed when its own hash differs or when a component in its
+$ref closure was added, removed or changed. Instead of computing every
+operation's closure, the changed components are propagated once through the
+reversed reference graph of the new version. This is enough: if an operation's
+closure differs between versions, the first component along the differing
+reference chain has different refs, hence a different hash.
+"""
+
+
+def diff_hashes(old, new):
+    """Compare the hash tables of two schema versions.
+
+    Args:
+        old: Hash table of the previous version (refs are not used)
+        new: Hash table of the new version
+
+    Returns:
+        Dict with sorted 'added', 'removed' and 'changed' operation keys,
+        and a 'components' dict with sorted 'added', 'removed' and
+        'changed' component keys (directly changed ones only)
+    """
+    old_components, new_components = old['components'], new['components']
+    added_components = [key for key in new_components if key not in old_components]
+    removed_components = [key for key in old_components if key not in new_components]
+    changed_components = [key for key, (hash_value, _) in new_components.items()
+                          if key in old_components and old_components[key][0] != hash_value]
+
+    # Components reaching a dirty one (removed ones may still be referenced)
+    referrers = {}
+    for key, (_, refs) in new_components.items():
+        for ref in refs:
+            referrers.setdefault(ref, []).append(key)
+    tainted = set()
+    pending = added_components + removed_components + changed_components
+    while pending:
+        key = pending.pop()
+        if key not in tainted:
+            tainted.add(key)
+            pending.extend(referrers.get(key, ()))
+
+    old_operations, new_operations = old['operations'], new['operations']
+    changed = [key for key, (hash_value, refs) in new_operations.items()
+               if key in old_operations
+               and (old_operations[key][0] != hash_value or any(ref in tainted for ref in refs))]
+    return {
+        'added': sorted(key for key in new_operations if key not in old_operations),
+        'removed': sorted(key for key in old_operations if key not in new_operations),
+        'changed': sorted(changed),
+        'components': {
+            'added': sorted(added_components),
+            'removed': sorted(removed_components),
+            'changed': sorted(changed_components),
+        },
+    }
+
+
+def merge_hashes(hash_tables, prefixes):
+    """Merge the hash tables of several schemas as merge_schemas merges them.
+
+    Operation paths are prefixed and later schemas win; only 'schemas'
+    components are kept, the other kinds are dropped by the merge.
+
+    Args:
+        hash_tables: Hash tables, in config order
+        prefixes: Path prefix of each schema
+
+    Returns:
+        Hash table of the merged schema
+    """
+    operations = {}
+    components = {}
+    for table, prefix in zip(hash_tables, prefixes):
+        for key, value in table['operations'].items():
+            method, _, path = key.partition(' ')
+            operations[f"{method} {prefix}{path}"] = value
+        for key, value in table['components'].items():
+            if key.startswith('schemas/'):
+                components[key] = value
+    return {'operations': operations, 'components': components}
+
+
+def has_changes(changes):
+    """Return whether a diff_hashes result holds any endpoint or component change."""
+    return any(changes[kind] for kind in ('added', 'removed', 'changed')) or \
+        any(changes['components'].values())
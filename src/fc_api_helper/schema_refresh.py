@@ -1,11 +1,19 @@
 """OpenAPI schema fetching and caching utilities."""
 
-import json
+import asyncio
 import os
 import sys
 import subprocess
 import requests
-from fc_api_helper.colors import Colors, success, error, info
+from fc_api_helper import aio, json_codec
+from fc_api_helper.schema_diff import has_changes
+from fc_api_helper.schema_store import store_schema_async
+from fc_api_helper.colors import Colors, colored, success, error, info, label
+from fc_api_helper.profiling import span
+
+
+# Changed endpoints listed per refreshed schema
+CHANGE_LIMIT = 20
 
 
 def fetch_openapi_schema(schema_url, cache_file, base_url=None):
@@ -16,6 +24,28 @@ def fetch_openapi_schema(schema_url, cache_file, base_url=None):
         cache_file: Path to save the cached schema
         base_url: Base URL of the API (for error messages)
     """
+    aio.run(fetch_openapi_schema_async(schema_url, cache_file, base_url))
+
+
+def fetch_openapi_schemas(schema_configs, base_url=None):
+    """Fetch several OpenAPI schemas concurrently and save them to their caches.
+
+    Args:
+        schema_configs: List of dicts with 'schema_url' and 'cache_file' keys
+        base_url: Base URL of the API (for error messages)
+    """
+    async def fetch_all():
+        await asyncio.gather(*(
+            fetch_openapi_schema_async(c['schema_url'], c['cache_file'], base_url)
+            for c in schema_configs
+        ))
+
+    if schema_configs:
+        aio.run(fetch_all())
+
+
+async def fetch_openapi_schema_async(schema_url, cache_file, base_url=None):
+    """Fetch OpenAPI schema from URL and save to cache (see fetch_openapi_schema)."""
     cache_dir = os.path.dirname(cache_file)
     if cache_dir:
         os.makedirs(cache_dir, exist_ok=True)
@@ -23,9 +53,10 @@ def fetch_openapi_schema(schema_url, cache_file, base_url=None):
     print(info(f"Fetching schema from {schema_url}..."), file=sys.stderr)
 
     try:
-        response = requests.get(schema_url, timeout=30)
+        with span('fetch_schema'):
+            response = await aio.http_request('GET', schema_url, timeout=30)
         response.raise_for_status()
-        schema = response.text
+        schema = response.content
     except requests.exceptions.RequestException as e:
         print(error(f"Error: Failed to fetch schema from {schema_url}"), file=sys.stderr)
         if base_url:
@@ -38,19 +69,55 @@ def fetch_openapi_schema(schema_url, cache_file, base_url=None):
         sys.exit(1)
 
     try:
-        schema_json = json.loads(schema)
-    except json.JSONDecodeError:
+        schema_json = json_codec.loads(schema)
+    except json_codec.DecodeError:
         print(error(f"Error: Invalid JSON response from {schema_url}"), file=sys.stderr)
         sys.exit(1)
 
-    with open(cache_file, 'w') as f:
+    # Cache the response bytes as received (no decode/re-encode)
+    tmp_file = f"{cache_file}.tmp{os.getpid()}"
+    with open(tmp_file, 'wb') as f:
         f.write(schema)
+    os.replace(tmp_file, cache_file)
+
+    # mmap container for single-operation reads, compressed copy for archival
+    container_file, archive_file, changes = await store_schema_async(cache_file, schema, schema_json)
 
     endpoint_count = len(schema_json.get('paths', {}))
 
     print(success(f"✓ Fetched schema from {schema_url}"), file=sys.stderr)
     print(success(f"✓ Saved complete schema to {cache_file}"), file=sys.stderr)
+    print(success(f"✓ Wrote container {container_file} and archive {archive_file}"), file=sys.stderr)
     print(success(f"✓ Schema contains {endpoint_count} endpoints"), file=sys.stderr)
+    print_schema_changes(changes)
+
+
+def print_schema_changes(changes, limit=CHANGE_LIMIT):
+    """Print the endpoints added, removed and changed by a refresh to stderr.
+
+    Args:
+        changes: schema_diff.diff_hashes result, or None without a previous version
+        limit: Maximum number of endpoints listed
+    """
+    if changes is None:
+        print(info("No previous version to compare with"), file=sys.stderr)
+        return
+    if not has_changes(changes):
+        print(success("✓ No changes since the previous fetch"), file=sys.stderr)
+        return
+
+    components = changes['components']
+    component_count = sum(len(keys) for keys in components.values())
+    print(label(f"Changes since the previous fetch: {len(changes['added'])} added, "
+                f"{len(changes['removed'])} removed, {len(changes['changed'])} changed endpoints "
+                f"({component_count} components changed)"), file=sys.stderr)
+    lines = [colored(f"  + {key}", Colors.GREEN) for key in changes['added']]
+    lines += [colored(f"  - {key}", Colors.RED) for key in changes['removed']]
+    lines += [colored(f"  ~ {key}", Colors.YELLOW) for key in changes['changed']]
+    for line in lines[:limit]:
+        print(line, file=sys.stderr)
+    if len(lines) > limit:
+        print(info(f"  ... and {len(lines) - limit} more"), file=sys.stderr)
 
 
 def refresh_be_schema():
@@ -0,0 +1,535 @@
+"""On-disk schema formats next to the raw JSON caches in ~/.cache/api-schemas.
+
+Every fetched schema is also stored as:
+
+    <schema>.mmap            uncompressed container: a fixed header, one
+                             compact JSON blob per path item and component,
+                             and a table of contents (TOC) locating them.
+                             Readers mmap the file and decode only the
+                             blobs they need.
+    archive/<schema>/*.json.zst (or .json.gz)
+                             compressed copies of the last ARCHIVE_KEEP
+                             fetches, for archival and later comparison.
+
+Container layout:
+
+    header      magic b'FCSC', format version, then (offset, length) of the
+                root blob, the path TOC, the component TOC and the operation
+                TOC, and the source cache's mtime_ns and size (little
+                endian, see HEADER)
+    blobs       compact JSON, back to back; the root blob holds every
+                top-level key except 'paths' and 'components'
+    path TOC    "<path>\t<offset>\t<length>\t<hash>\t<refs>\n" lines,
+                sorted by key bytes
+    component TOC
+                the same for "<kind>/<name>" keys
+    operation TOC
+                the same for "<METHOD> <path>" keys, locating the path item;
+                hash and refs cover the operation and the path-level
+                parameters only
+
+hash is a BLAKE2b digest of the blob (a subtree hash, see schema_diff) and
+refs are the space-separated "kind/name" components it references
+directly, so the $ref closure of an operation is computed from the TOC.
+The TOCs are binary-searched in place (like look(1)): opening a container
+parses nothing, whatever the schema size.
+
+zstd is used when the zstandard package is installed, gzip otherwise.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import mmap
+import os
+import re
+import struct
+import time
+
+from fc_api_helper import json_codec
+from fc_api_helper.profiling import span
+from fc_api_helper.schema_diff import diff_hashes
+
+
+CONTAINER_SUFFIX = '.mmap'
+CONTAINER_MAGIC = b'FCSC'
+CONTAINER_VERSION = 2
+HEADER = struct.Struct('<4sIQQQQQQQQqQ')
+
+# Methods that are operations (paths may also hold 'parameters', 'summary'...)
+HTTP_METHODS = ('get', 'put', 'post', 'delete', 'options', 'head', 'patch', 'trace')
+
+ARCHIVE_DIR = 'archive'
+# Compressed copies kept per schema
+ARCHIVE_KEEP = 5
+
+REF_PATTERN = re.compile(rb'"\$ref":\s*"#/components/([^/"]+)/([^"]+)"')
+
+
+def get_container_file(cache_file):
+    """Return the container path of a schema cache."""
+    return os.path.splitext(cache_file)[0] + CONTAINER_SUFFIX
+
+
+def get_source_stamp(cache_file):
+    """Return (mtime_ns, size) of a schema cache, or None if it is missing."""
+    try:
+        stat = os.stat(cache_file)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _ref_keys(blob):
+    return sorted({f"{kind.decode('utf-8')}/{name.decode('utf-8')}"
+                   for kind, name in REF_PATTERN.findall(blob)})
+
+
+def _blob_hash(blob):
+    return hashlib.blake2b(blob, digest_size=8).hexdigest()
+
+
+def _render_toc(entries):
+    lines = sorted(f"{key}\t{offset}\t{length}\t{hash_value}\t{' '.join(refs)}\n".encode('utf-8')
+                   for key, (offset, length, hash_value, refs) in entries.items())
+    return b"".join(lines)
+
+
+def _operation_blob(path_item, method):
+    operation = {method: path_item[method]}
+    if 'parameters' in path_item:
+        operation['parameters'] = path_item['parameters']
+    return json_codec.dumps(operation)
+
+
+def render_container(schema, source_stamp=(0, 0)):
+    """Render a schema as container bytes.
+
+    Args:
+        schema: Parsed OpenAPI schema
+        source_stamp: (mtime_ns, size) of the cache the schema was read from
+
+    Returns:
+        Container bytes (see module docstring)
+    """
+    blobs = []
+    offset = HEADER.size
+
+    def add(node):
+        nonlocal offset
+        blob = json_codec.dumps(node)
+        blobs.append(blob)
+        entry = (offset, len(blob), _blob_hash(blob), _ref_keys(blob))
+        offset += len(blob)
+        return entry
+
+    root = {key: value for key, value in schema.items() if key not in ('paths', 'components')}
+    root_offset, root_length, _, _ = add(root)
+    paths = {}
+    operations = {}
+    for path, path_item in schema.get('paths', {}).items():
+        paths[path] = entry = add(path_item)
+        if not isinstance(path_item, dict):
+            continue
+        for method, details in path_item.items():
+            if method in HTTP_METHODS and isinstance(details, dict):
+                blob = _operation_blob(path_item, method)
+                operations[f"{method.upper()} {path}"] = entry[:2] + (_blob_hash(blob), _ref_keys(blob))
+    components = {}
+    for kind, kind_components in schema.get('components', {}).items():
+        if isinstance(kind_components, dict):
+            for name, component in kind_components.items():
+                components[f"{kind}/{name}"] = add(component)
+
+    path_toc = _render_toc(paths)
+    component_toc = _render_toc(components)
+    operation_toc = _render_toc(operations)
+    component_offset = offset + len(path_toc)
+    operation_offset = component_offset + len(component_toc)
+    header = HEADER.pack(CONTAINER_MAGIC, CONTAINER_VERSION, root_offset, root_length,
+                         offset, len(path_toc), component_offset, len(component_toc),
+                         operation_offset, len(operation_toc), *source_stamp)
+    return b"".join([header, *blobs, path_toc, component_toc, operation_toc])
+
+
+def write_container(cache_file, schema):
+    """Write the container of a schema cache, stamped with the cache's mtime/size.
+
+    Returns:
+        Container path
+    """
+    container_file = get_container_file(cache_file)
+    with span('write_container'):
+        data = render_container(schema, get_source_stamp(cache_file))
+        _write_atomic(container_file, data)
+    return container_file
+
+
+def container_is_fresh(cache_file):
+    """Return whether a cache's container exists and matches the cache file."""
+    stamp = get_source_stamp(cache_file)
+    try:
+        with open(get_container_file(cache_file), 'rb') as f:
+            header = f.read(HEADER.size)
+    except FileNotFoundError:
+        return False
+    if stamp is None or len(header) != HEADER.size:
+        return False
+    magic, version, *_, mtime_ns, size = HEADER.unpack(header)
+    return magic == CONTAINER_MAGIC and version == CONTAINER_VERSION and (mtime_ns, size) == stamp
+
+
+class SchemaContainer:
+    """Read-only, memory-mapped view of a schema container.
+
+    Usage:
+        with SchemaContainer(get_container_file(cache_file)) as container:
+            operation = container.operation_slice('/api/funds/', 'get')
+    """
+
+    def __init__(self, container_file):
+        with open(container_file, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < HEADER.size:
+            self.close()
+            raise ValueError(f"Not a schema container: {container_file}")
+        magic, version, *sections = HEADER.unpack_from(self._mmap)
+        if magic != CONTAINER_MAGIC or version != CONTAINER_VERSION:
+            self.close()
+            raise ValueError(f"Not a schema container (or an old format): {container_file}")
+        self._root, self._path_toc, self._component_toc, self._operation_toc = _get_sections(sections)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._mmap.close()
+
+    def _read(self, offset, length):
+        return json_codec.loads(self._mmap[offset:offset + length])
+
+    def _lookup(self, toc, key):
+        """Binary-search a sorted TOC section for key.
+
+        Returns:
+            Tuple of (offset, length, hash, refs)
+
+        Raises:
+            KeyError: key is not in the section
+        """
+        start, end = toc
+        line = find_line(self._mmap, start, end, key.encode('utf-8'))
+        if line is None:
+            raise KeyError(key)
+        return _parse_toc_line(line)[1]
+
+    def _iter_toc(self, toc):
+        return _iter_toc(self._mmap, toc)
+
+    def paths(self):
+        """Return the schema's paths, sorted."""
+        return [key for key, _ in self._iter_toc(self._path_toc)]
+
+    def read_path(self, path):
+        """Return one path item.
+
+        Raises:
+            KeyError: The path is not in the schema
+        """
+        offset, length, _, _ = self._lookup(self._path_toc, path)
+        return self._read(offset, length)
+
+    def read_component(self, kind, name):
+        """Return one component (e.g. kind 'schemas').
+
+        Raises:
+            KeyError: The component is not in the schema
+        """
+        offset, length, _, _ = self._lookup(self._component_toc, f"{kind}/{name}")
+        return self._read(offset, length)
+
+    def component_closure(self, refs):
+        """Return the components transitively referenced from refs.
+
+        Args:
+            refs: Iterable of "kind/name" keys
+
+        Returns:
+            Dict of "kind/name" -> (offset, length) for every component found
+        """
+        pending = list(refs)
+        closure = {}
+        while pending:
+            ref = pending.pop()
+            if ref in closure:
+                continue
+            try:
+                offset, length, _, ref_refs = self._lookup(self._component_toc, ref)
+            except KeyError:
+                continue
+            closure[ref] = (offset, length)
+            pending.extend(ref_refs)
+        return closure
+
+    def operation_slice(self, path, method):
+        """Build the self-contained schema of one operation.
+
+        Only the operation's path item and the transitive closure of the
+        components it references are decoded.
+
+        Args:
+            path: Operation path as it appears in this schema
+            method: Lowercase HTTP method
+
+        Returns:
+            Schema dict with the operation (and path-level parameters), its
+            components, and the schema's 'openapi' and 'info'
+
+        Raises:
+            KeyError: The path or method is not in the schema
+        """
+        path_item = self.read_path(path)
+        operation = {method: path_item[method]}
+        if 'parameters' in path_item:
+            operation['parameters'] = path_item['parameters']
+
+        components = {}
+        _, _, _, refs = self._lookup(self._operation_toc, f"{method.upper()} {path}")
+        closure = self.component_closure(refs)
+        for key, (offset, length) in sorted(closure.items()):
+            kind, name = key.split('/', 1)
+            components.setdefault(kind, {})[name] = self._read(offset, length)
+
+        root = self._read(*self._root)
+        operation_slice = {'paths': {path: operation}, 'components': components}
+        for key in ('openapi', 'info'):
+            if key in root:
+                operation_slice[key] = root[key]
+        return operation_slice
+
+    def hashes(self):
+        """Return the schema's hash table (see schema_diff)."""
+        return _read_hashes(self._mmap)
+
+    def load(self):
+        """Decode the whole schema."""
+        schema = self._read(*self._root)
+        schema['paths'] = {path: self._read(offset, length)
+                           for path, (offset, length, _, _) in self._iter_toc(self._path_toc)}
+        components = {}
+        for key, (offset, length, _, _) in self._iter_toc(self._component_toc):
+            kind, name = key.split('/', 1)
+            components.setdefault(kind, {})[name] = self._read(offset, length)
+        if components:
+            schema['components'] = components
+        return schema
+
+
+def bisect_lines(data, start, end, key):
+    """Binary-search sorted "<key>\\t..." lines for the first key >= key.
+
+    Like look(1), nothing is parsed but the few lines visited.
+
+    Args:
+        data: bytes or mmap holding the lines
+        start: Offset of the first line
+        end: Offset just after the last line's newline
+        key: Key bytes (keys sort before their tab, so lines sorted as
+            bytes are sorted by key)
+
+    Returns:
+        Offset of the first line whose key is >= key (end if there is none)
+    """
+    low, high = start, end
+    # low and high always sit at line starts
+    while low < high:
+        middle = (low + high) // 2
+        line_start = data.rfind(b"\n", start, middle) + 1 or start
+        line_end = data.find(b"\n", line_start, end)
+        line_key = data[line_start:data.find(b"\t", line_start, line_end)]
+        if line_key < key:
+            low = line_end + 1
+        else:
+            high = line_start
+    return low
+
+
+def find_line(data, start, end, key):
+    """Return the line (without newline) of key in sorted lines, or None (see bisect_lines)."""
+    line_start = bisect_lines(data, start, end, key)
+    if line_start >= end:
+        return None
+    line_end = data.find(b"\n", line_start, end)
+    line = data[line_start:line_end]
+    return line if line.partition(b"\t")[0] == key else None
+
+
+def _get_sections(sections):
+    """Split the header fields following the version.
+
+    Returns:
+        List of the root blob's (offset, length) and the (start, end) byte
+        ranges of the path, component and operation TOCs
+    """
+    root_offset, root_length, *tocs = sections[:8]
+    return [(root_offset, root_length)] + [(offset, offset + length)
+                                           for offset, length in zip(tocs[0::2], tocs[1::2])]
+
+
+def _parse_toc_line(line):
+    key, offset, length, hash_value, refs = line.decode('utf-8').split('\t')
+    return key, (int(offset), int(length), hash_value, refs.split())
+
+
+def _iter_toc(data, toc):
+    start, end = toc
+    for line in data[start:end].splitlines():
+        yield _parse_toc_line(line)
+
+
+def _read_hashes(data):
+    """Return the hash table (see schema_diff) of container bytes or mmap."""
+    _, _, *sections = HEADER.unpack_from(data)
+    _, _, component_toc, operation_toc = _get_sections(sections)
+    return {
+        'operations': {key: [hash_value, refs] for key, (_, _, hash_value, refs) in _iter_toc(data, operation_toc)},
+        'components': {key: [hash_value, refs] for key, (_, _, hash_value, refs) in _iter_toc(data, component_toc)},
+    }
+
+
+def read_container_hashes(container_file):
+    """Return the hash table of a container, or None if it is missing or in an old format."""
+    try:
+        with SchemaContainer(container_file) as container:
+            return container.hashes()
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def hash_schema(schema):
+    """Return the hash table of a parsed schema (as its container would hold)."""
+    return _read_hashes(render_container(schema))
+
+
+def load_previous_hashes(cache_file):
+    """Return the hash table of the last stored version of a schema cache.
+
+    Reads the current container, or decodes the newest archive when the
+    container is missing or in an old format. Call it before storing a new
+    version.
+
+    Returns:
+        Hash table, or None if no previous version is available
+    """
+    hashes = read_container_hashes(get_container_file(cache_file))
+    if hashes is not None:
+        return hashes
+    archives = list_archives(cache_file)
+    if not archives:
+        return None
+    try:
+        return hash_schema(read_archive(archives[-1]))
+    except (OSError, ImportError, EOFError, *json_codec.DecodeError):
+        return None
+
+
+def _get_compressor():
+    """Return (suffix, compress) of the best available codec."""
+    try:
+        import zstandard
+    except ImportError:
+        return '.json.gz', lambda data: gzip.compress(data, compresslevel=6)
+    return '.json.zst', zstandard.ZstdCompressor(level=10).compress
+
+
+def get_archive_dir(cache_file):
+    """Return the archive directory of a schema cache."""
+    stem = os.path.splitext(os.path.basename(cache_file))[0]
+    return os.path.join(os.path.dirname(cache_file), ARCHIVE_DIR, stem)
+
+
+def list_archives(cache_file):
+    """Return the archived copies of a schema cache, oldest first."""
+    archive_dir = get_archive_dir(cache_file)
+    try:
+        names = os.listdir(archive_dir)
+    except FileNotFoundError:
+        return []
+    return [os.path.join(archive_dir, name) for name in sorted(names)
+            if name.endswith(('.json.gz', '.json.zst'))]
+
+
+def write_archive(cache_file, data):
+    """Store a compressed copy of fetched schema bytes and prune old copies.
+
+    Returns:
+        Archive path
+    """
+    suffix, compress = _get_compressor()
+    archive_dir = get_archive_dir(cache_file)
+    os.makedirs(archive_dir, exist_ok=True)
+    archive_file = os.path.join(archive_dir, time.strftime('%Y%m%d-%H%M%S') + suffix)
+    with span('archive'):
+        _write_atomic(archive_file, compress(data))
+
+    for old_file in list_archives(cache_file)[:-ARCHIVE_KEEP]:
+        os.remove(old_file)
+    return archive_file
+
+
+def read_archive(archive_file):
+    """Decompress and parse an archived schema.
+
+    Raises:
+        ImportError: The archive is zstd-compressed and zstandard is missing
+        DecodeError: The archive does not hold valid JSON
+    """
+    with open(archive_file, 'rb') as f:
+        data = f.read()
+    if archive_file.endswith('.zst'):
+        import zstandard
+        data = zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    else:
+        data = gzip.decompress(data)
+    return json_codec.loads(data)
+
+
+def store_schema(cache_file, data, schema):
+    """Write the container and an archive copy of a freshly cached schema.
+
+    The new version is compared with the previously stored one (see
+    load_previous_hashes and schema_diff.diff_hashes).
+
+    Args:
+        cache_file: Raw JSON cache, already written
+        data: The cache's bytes
+        schema: Parsed schema
+
+    Returns:
+        Tuple of (container_file, archive_file, changes) where changes is
+        the diff_hashes result, or None without a previous version
+    """
+    with span('schema_diff'):
+        previous = load_previous_hashes(cache_file)
+    container_file = write_container(cache_file, schema)
+    archive_file = write_archive(cache_file, data)
+    changes = None
+    if previous is not None:
+        with span('schema_diff'):
+            changes = diff_hashes(previous, read_container_hashes(container_file))
+    return container_file, archive_file, changes
+
+
+async def store_schema_async(cache_file, data, schema):
+    """Run store_schema in a worker thread (compression releases the GIL)."""
+    return await asyncio.to_thread(store_schema, cache_file, data, schema)
+
+
+def _write_atomic(path, data):
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
@@ -0,0 +1,270 @@
+"""BM25 full-text search over the operations of the endpoint index.
+
+Every operation is indexed as one document made of its method and path
+segments, operationId, tags, summary, description, parameter names and
+descriptions, and the field names of its request body (nested $ref objects
+included). Words are split on camelCase and snake_case boundaries, lowercased
+and reduced to their singular, so "capitalCallNav", "capital_calls" and
+"/capital-calls/{uuid}/nav/" all contain "capital", "call" and "nav". Fields
+that name an operation (path, summary, tags, parameter and body field names)
+count double against free-text descriptions.
+
+The index is a single sorted text file, written with the endpoint index:
+
+    #bm25\\t<documents>
+    <term>\\t<key>,<key>,...\\t<weight>,<weight>,...
+
+where weight is the BM25 term weight of the term in the document without
+the idf (which only depends on the number of postings), in thousandths.
+
+Like the schema containers' tables of contents (schema_store.bisect_lines),
+it is memory-mapped and binary-searched, so a query reads only the posting
+lines of its own terms.
+"""
+
+import functools
+import math
+import mmap
+import re
+from collections import Counter
+
+from fc_api_helper.profiling import span
+from fc_api_helper.schema_store import bisect_lines, find_line
+
+
+SEARCH_FILE = 'search.txt'
+HEADER_MARKER = b'#bm25'
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Term weights are stored as integers, in thousandths
+WEIGHT_SCALE = 1000
+
+# Weight of the fields naming an operation against free-text descriptions
+NAME_WEIGHT = 2
+TEXT_WEIGHT = 1
+
+# Levels of nested objects whose field names are indexed (1: the body's
+# fields and those of the objects they hold)
+BODY_DEPTH = 1
+
+# Terms a query word that is not a term itself expands to as a prefix
+PREFIX_EXPANSIONS = 20
+
+DEFAULT_LIMIT = 100
+
+# Keys of the schemas that have fields of their own
+NESTED_KEYS = frozenset(['$ref', 'properties', 'items', 'allOf', 'oneOf', 'anyOf'])
+
+STOPWORDS = frozenset([
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'if', 'in', 'is', 'it',
+    'of', 'on', 'or', 'the', 'this', 'that', 'to', 'with',
+])
+
+CAMEL_BOUNDARY = re.compile(r'(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])')
+WORD = re.compile(r'[a-z0-9]+')
+
+
+@functools.lru_cache(maxsize=None)
+def normalize_term(word):
+    """Reduce a lowercase word to its singular ("entities" -> "entity")."""
+    if len(word) > 4 and word.endswith('ies'):
+        return word[:-3] + 'y'
+    if len(word) > 3 and word.endswith('s') and not word.endswith(('ss', 'us', 'is')):
+        return word[:-1]
+    return word
+
+
+def tokenize(text):
+    """Split text into normalized search terms.
+
+    Args:
+        text: Any text: prose, a path, an identifier...
+
+    Returns:
+        List of terms in text order, repetitions included, stopwords removed
+    """
+    words = WORD.findall(CAMEL_BOUNDARY.sub(' ', text).lower())
+    return [normalize_term(word) for word in words if word not in STOPWORDS]
+
+
+class DocumentBuilder:
+    """Collect the terms of the operations of one schema.
+
+    Field weights are applied by repeating terms. The terms of every text
+    and of every request body component (with its nested fields) are
+    computed once and shared by all the operations using them.
+    """
+
+    def __init__(self, schema):
+        # Imported lazily: api_explorer imports this module
+        from fc_api_helper.api_explorer import resolve_ref
+
+        self.schema = schema
+        self._resolve_ref = resolve_ref
+        self._text_terms = {}
+        self._component_terms = {}
+
+    def _add(self, terms, text, weight):
+        text_terms = self._text_terms.get((text, weight))
+        if text_terms is None:
+            text_terms = self._text_terms[(text, weight)] = tokenize(text) * weight
+        terms.extend(text_terms)
+
+    def _add_body_fields(self, terms, body_schema, depth):
+        """Add the field names of a request body schema, BODY_DEPTH levels deep."""
+        ref = body_schema.get('$ref')
+        if ref:
+            key = (ref, depth)
+            component_terms = self._component_terms.get(key)
+            if component_terms is None:
+                # Placeholder: a recursive reference adds nothing more
+                self._component_terms[key] = []
+                component_terms = []
+                self._add(component_terms, ref.rpartition('/')[2], NAME_WEIGHT)
+                component = self._resolve_ref(self.schema, ref)
+                if isinstance(component, dict):
+                    self._add_body_fields(component_terms, component, depth)
+                self._component_terms[key] = component_terms
+            terms.extend(component_terms)
+            return
+        for key in ('allOf', 'oneOf', 'anyOf'):
+            for part in body_schema.get(key, ()):
+                if isinstance(part, dict):
+                    self._add_body_fields(terms, part, depth)
+        items = body_schema.get('items')
+        if isinstance(items, dict):
+            self._add_body_fields(terms, items, depth)
+        properties = body_schema.get('properties')
+        if not properties:
+            return
+        text_terms = self._text_terms
+        for name, prop_schema in properties.items():
+            name_terms = text_terms.get((name, NAME_WEIGHT))
+            if name_terms is None:
+                self._add(terms, name, NAME_WEIGHT)
+            else:
+                terms.extend(name_terms)
+            # Only properties that are objects, arrays or references have fields
+            if depth > 0 and isinstance(prop_schema, dict) and not NESTED_KEYS.isdisjoint(prop_schema):
+                self._add_body_fields(terms, prop_schema, depth - 1)
+
+    def operation_terms(self, method, path, details):
+        """Return the weighted term frequencies of an operation."""
+        terms = []
+        self._add(terms, method, NAME_WEIGHT)
+        self._add(terms, path, NAME_WEIGHT)
+        self._add(terms, details.get('operationId') or '', NAME_WEIGHT)
+        self._add(terms, details.get('summary') or '', NAME_WEIGHT)
+        self._add(terms, details.get('description') or '', TEXT_WEIGHT)
+        for tag in details.get('tags') or ():
+            self._add(terms, str(tag), NAME_WEIGHT)
+        for param in details.get('parameters') or ():
+            if isinstance(param, dict) and '$ref' in param:
+                param = self._resolve_ref(self.schema, param['$ref'])
+            if isinstance(param, dict):
+                self._add(terms, param.get('name') or '', NAME_WEIGHT)
+                self._add(terms, param.get('description') or '', TEXT_WEIGHT)
+
+        request_body = details.get('requestBody')
+        if isinstance(request_body, dict):
+            body_schema = request_body.get('content', {}).get('application/json', {}).get('schema')
+            if isinstance(body_schema, dict):
+                self._add_body_fields(terms, body_schema, BODY_DEPTH)
+        return Counter(terms)
+
+
+def render_search_index(schema):
+    """Render the search index of a merged schema.
+
+    Documents are keyed like the endpoint index: by position in
+    endpoint_index.iter_operations order. Postings hold the BM25 term weight
+    of the document (everything but the idf), so queries do not need the
+    document lengths.
+
+    Returns:
+        The index file contents (bytes)
+    """
+    # Imported lazily: endpoint_index imports this module
+    from fc_api_helper.endpoint_index import iter_operations
+
+    builder = DocumentBuilder(schema)
+    documents = [builder.operation_terms(method, path, details)
+                 for method, path, details in iter_operations(schema)]
+    lengths = [sum(frequencies.values()) for frequencies in documents]
+    average = sum(lengths) / len(lengths) if lengths else 1.0
+
+    postings = {}
+    for key, (frequencies, length) in enumerate(zip(documents, lengths)):
+        norm = K1 * (1 - B + B * length / average)
+        for term, frequency in frequencies.items():
+            weight = int(frequency * (K1 + 1) * WEIGHT_SCALE / (frequency + norm))
+            entries = postings.get(term)
+            if entries is None:
+                entries = postings[term] = ([], [])
+            entries[0].append(str(key))
+            entries[1].append(str(weight))
+
+    lines = [f"#bm25\t{len(documents)}"]
+    lines.extend(sorted(f"{term}\t{','.join(keys)}\t{','.join(weights)}"
+                        for term, (keys, weights) in postings.items()))
+    return ("\n".join(lines) + "\n").encode('utf-8')
+
+
+def _match_terms(data, start, end, word):
+    """Return the posting lines of a query word: its own, or its prefix expansions."""
+    line = find_line(data, start, end, word)
+    if line is not None:
+        return [line]
+    lines = []
+    position = bisect_lines(data, start, end, word)
+    while position < end and len(lines) < PREFIX_EXPANSIONS:
+        line_end = data.find(b"\n", position, end)
+        line = data[position:line_end]
+        if not line.startswith(word):
+            break
+        lines.append(line)
+        position = line_end + 1
+    return lines
+
+
+def search_index_file(search_file, query, limit=DEFAULT_LIMIT):
+    """Rank the operations of a search index against a query with BM25.
+
+    Query words that are not indexed terms match the terms they prefix
+    ("cap" finds "capital"), so partial words work too.
+
+    Args:
+        search_file: Path of the search index (see render_search_index)
+        query: Free-text query
+        limit: Maximum number of results
+
+    Returns:
+        List of (key, score) pairs, best first
+    """
+    words = list(dict.fromkeys(tokenize(query)))
+    if not words:
+        return []
+
+    with span('search'), open(search_file, 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        header_end = data.find(b"\n") + 1
+        marker, documents = data[:header_end - 1].split(b"\t")
+        if marker != HEADER_MARKER:
+            raise ValueError(f"{search_file} is not a search index")
+        documents = int(documents)
+
+        scores = {}
+        for word in words:
+            for line in _match_terms(data, header_end, len(data), word.encode('utf-8')):
+                _, keys, weights = line.split(b"\t")
+                keys = keys.split(b",")
+                idf = math.log(1 + (documents - len(keys) + 0.5) / (len(keys) + 0.5))
+                for key, weight in zip(keys, map(int, weights.split(b","))):
+                    scores[key] = scores.get(key, 0.0) + idf * weight
+
+    ranked = sorted(((int(key), score / WEIGHT_SCALE) for key, score in scores.items()),
+                    key=lambda item: (-item[1], item[0]))
+    return ranked[:limit]
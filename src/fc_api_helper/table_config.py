@@ -0,0 +1,366 @@
+"""Built-in fc-uuid table configuration.
+
+Used when no introspected table cache exists (see table_introspect); kept in
+its own module so it is only evaluated when needed.
+"""
+
+# =============================================================================
+# TABLE CONFIGURATION
+# =============================================================================
+# Unified mapping of table names to their metadata:
+#   - "identifier": the most readable column to display (for fzf selection)
+#   - "fks": foreign-key edges used to reach fundcraft_client, as
+#            {"<column>": "<target_table>.<target_column>"} (omitted if none).
+#            A list of targets marks a polymorphic column (any target may match).
+#            A reference to "fundcraft_client.uuid" means the column holds the client UUID.
+#
+# The shortest path to fundcraft_client is computed per table by JoinPlanner
+# and compiled (once, cached) into a semi-join filter, e.g. for fundcraft_fund:
+#   t."company_id" IN (SELECT j1."id" FROM "django"."fundcraft_company" j1 WHERE j1."owner_client_id" = :'client_uuid')
+#
+# Usage:
+#   config = TABLE_CONFIG["fundcraft_capitalcall"]
+#   identifier = config["identifier"]  # "capital_call_code"
+#   query, params = build_client_filtered_query("fundcraft_capitalcall", client_uuid)
+# =============================================================================
+
+TABLE_CONFIG = {
+    # DIRECT TO CLIENT (via uuid/client_id column)
+    "fundcraft_client": {"identifier": "slug"},
+    "fundcraft_admin_report": {"identifier": "id", "fks": {"client_id": "fundcraft_client.uuid"}},
+    "fundcraft_annualaccountsprocess": {"identifier": "id", "fks": {"client_id": "fundcraft_client.uuid"}},
+    "fundcraft_apiclientintegration": {"identifier": "service_name", "fks": {"client_id": "fundcraft_client.uuid"}},
+    "fundcraft_billableevent": {"identifier": "currency_code", "fks": {"client_uuid": "fundcraft_client.uuid"}},
+    "fundcraft_client_employees": {"identifier": "id", "fks": {"client_id": "fundcraft_client.uuid"}},
+    "fundcraft_dataroom": {"identifier": "name", "fks": {"client_id": "fundcraft_client.uuid"}},
+    "fundcraft_eventactionlog": {"identifier": "id", "fks": {"client_id": "fundcraft_client.uuid"}},
+    "fundcraft_fcprocessexecution": {"identifier": "codename", "fks": {"client_id": "fundcraft_client.uuid"}},
+    "fundcraft_freescoutmailbox": {"identifier": "name", "fks": {"owner_client_id": "fundcraft_client.uuid"}},
+    "fundcraft_investortype": {"identifier": "name", "fks": {"client_id": "fundcraft_client.uuid"}},
+    "fundcraft_kpi_report": {"identifier": "id", "fks": {"client_id": "fundcraft_client.uuid"}},
+    "fundcraft_kyc_document_type_master": {"identifier": "status", "fks": {"client_id": "fundcraft_client.uuid"}},
+    "fundcraft_kyccorporateprocess": {"identifier": "id", "fks": {"client_id": "fundcraft_client.uuid"}},
+    "fundcraft_kycindividualprocess": {"identifier": "id", "fks": {"client_id": "fundcraft_client.uuid"}},
+    "fundcraft_lpportaltask": {"identifier": "status", "fks": {"client_id": "fundcraft_client.uuid"}},
+    "fundcraft_nomineebeneficiary": {"identifier": "identifier", "fks": {"client_id": "fundcraft_client.uuid"}},
+    "fundcraft_redemptionprocess": {"identifier": "redemption_code", "fks": {"client_id": "fundcraft_client.uuid"}},
+    "fundcraft_reportingtype_clients": {"identifier": "id", "fks": {"client_id": "fundcraft_client.uuid"}},
+
+    # DIRECT TO CLIENT (via id - needs join to get uuid)
+    "fundcraft_classofshares": {"identifier": "share_name", "fks": {"client_id": "fundcraft_client.id"}},
+    "fundcraft_companyexternalinfo": {"identifier": "id", "fks": {"client_id": "fundcraft_client.id"}},
+    "fundcraft_emailinbox": {"identifier": "email", "fks": {"client_id": "fundcraft_client.id"}},
+    "fundcraft_fundclassofshares": {"identifier": "share_name", "fks": {"client_id": "fundcraft_client.id", "fund_id": "fundcraft_fund.id"}},
+    "fundcraft_fundexternalinfo": {"identifier": "id", "fks": {"client_id": "fundcraft_client.id"}},
+    "fundcraft_integrations_vestlane_credentials": {"identifier": "id", "fks": {"client_id": "fundcraft_client.id"}},
+    "fundcraft_personexternalinfo": {"identifier": "id", "fks": {"client_id": "fundcraft_client.id"}},
+
+    # VIA owner_client_id
+    "fundcraft_company": {"identifier": "name", "fks": {"owner_client_id": "fundcraft_client.uuid"}},
+    "fundcraft_investment": {"identifier": "full_name", "fks": {"owner_client_id": "fundcraft_client.uuid"}},
+    "fundcraft_investor": {"identifier": "full_name", "fks": {"owner_client_id": "fundcraft_client.uuid"}},
+    "fundcraft_lp_portal_lp_account_structure": {"identifier": "name", "fks": {"owner_client_id": "fundcraft_client.uuid"}},
+    "fundcraft_person": {"identifier": "name", "fks": {"owner_client_id": "fundcraft_client.uuid"}},
+
+    # VIA company -> client
+    "fundcraft_accountingtransactionsjournal": {"identifier": "reference", "fks": {"company_id": "fundcraft_company.id"}},
+    "fundcraft_annualaccount": {"identifier": "id", "fks": {"company_id": "fundcraft_company.id"}},
+    "fundcraft_bank": {"identifier": "bic_swift", "fks": {"company_id": "fundcraft_company.id"}},
+    "fundcraft_companybankaccountinformation": {"identifier": "bank_name", "fks": {"company_id": "fundcraft_company.id"}},
+    "fundcraft_companyblocked": {"identifier": "reason", "fks": {"company_id": "fundcraft_company.id"}},
+    "fundcraft_companycontact": {"identifier": "full_name", "fks": {"company_id": "fundcraft_company.id"}},
+    "fundcraft_companydocumentnotification": {"identifier": "id", "fks": {"company_id": "fundcraft_company.id"}},
+    "fundcraft_companyexternaldocumenttargetssession": {"identifier": "status", "fks": {"company_id": "fundcraft_company.id"}},
+    "fundcraft_companyimportlog": {"identifier": "id", "fks": {"company_id": "fundcraft_company.id"}},
+    "fundcraft_companykycstatus": {"identifier": "id", "fks": {"company_id": "fundcraft_company.id"}},
+    "fundcraft_companyscreeningongoingmonitoringrequestlog": {"identifier": "status", "fks": {"company_id": "fundcraft_company.id"}},
+    "fundcraft_companystockexchangerelationship": {"identifier": "id", "fks": {"company_id": "fundcraft_company.id"}},
+    "fundcraft_companysuspended": {"identifier": "reason", "fks": {"company_id": "fundcraft_company.id"}},
+    "fundcraft_companyvaluation": {"identifier": "id", "fks": {"target_company_id": "fundcraft_company.id"}},
+    "fundcraft_governingcompany": {"identifier": "id", "fks": {"governed_company_id": "fundcraft_company.id"}},
+    "fundcraft_governingperson": {"identifier": "id", "fks": {"governed_company_id": "fundcraft_company.id"}},
+    "fundcraft_legalcompanyresponsible": {"identifier": "classification", "fks": {"company_id": "fundcraft_company.id"}},
+    "fundcraft_structure": {"identifier": "name", "fks": {"company_id": "fundcraft_company.id"}},
+
+    # VIA fund -> company -> client
+    "fundcraft_fund": {"identifier": "aifm_code", "fks": {"company_id": "fundcraft_company.id"}},
+    "fundcraft_capitalcallshareholder": {"identifier": "payment_reference_code", "fks": {"fund_id": "fundcraft_fund.id"}},
+    # VIA structure_investment_vehicle -> structure -> company -> client
+    "fundcraft_capitalcall": {"identifier": "capital_call_code", "fks": {"structure_investment_vehicle_id": "fundcraft_structureinvestmentvehicle.id"}},
+    "fundcraft_distribution": {"identifier": "distribution_code", "fks": {"structure_investment_vehicle_id": "fundcraft_structureinvestmentvehicle.id"}},
+    # VIA investor (investor_id INTEGER) -> client
+    "fundcraft_distributionshareholder": {"identifier": "payment_reference_code", "fks": {"investor_id": "fundcraft_investor.id"}},
+    "fundcraft_fundclassofsharescategory": {"identifier": "category_name", "fks": {"fund_id": "fundcraft_fund.id"}},
+    "fundcraft_fundclassofsharesgroup": {"identifier": "name", "fks": {"fund_id": "fundcraft_fund.id"}},
+    "fundcraft_fundcommitmentfacility": {"identifier": "id", "fks": {"fund_id": "fundcraft_fund.id"}},
+    "fundcraft_fundcustodian": {"identifier": "id", "fks": {"fund_id": "fundcraft_fund.id"}},
+    "fundcraft_fundexcludablefromequalisation": {"identifier": "id", "fks": {"fund_id": "fundcraft_fund.id"}},
+    "fundcraft_fundfcosrelationship": {"identifier": "id", "fks": {"fund_id": "fundcraft_fund.id"}},
+    "fundcraft_investorfundbalance": {"identifier": "id", "fks": {"fund_id": "fundcraft_fund.id"}},
+    "fundcraft_kpi_report_fund": {"identifier": "id", "fks": {"fund_id": "fundcraft_fund.id"}},
+    "fundcraft_partneragreement": {"identifier": "id", "fks": {"fund_id": "fundcraft_fund.id"}},
+    "fundcraft_paymentissuesresolutionprocess": {"identifier": "fc_template_code", "fks": {"fund_id": "fundcraft_fund.id"}},
+    "fundcraft_compartmentrelationship": {"identifier": "id", "fks": {"umbrella_id": "fundcraft_fund.id"}},
+    "fundcraft_navchecklist": {"identifier": "is_discarded", "fks": {"fund_id": "fundcraft_fund.id"}},
+    "fundcraft_navchecklistcheck": {"identifier": "title", "fks": {"nav_checklist_id": "fundcraft_navchecklist.id"}},
+    "fundcraft_navchecklistcheckcomment": {"identifier": "id", "fks": {"check_id": "fundcraft_navchecklistcheck.id"}},
+    "fundcraft_valuationprocess": {"identifier": "id", "fks": {"fund_id": "fundcraft_fund.id"}},
+    "fundcraft_valuationstatement": {"identifier": "id", "fks": {"valuation_process_id": "fundcraft_valuationprocess.id"}},
+    "fundcraft_valuationstatementline": {"identifier": "id", "fks": {"valuation_statement_id": "fundcraft_valuationstatement.id"}},
+
+    # VIA investor -> client (investor_id as UUID/varchar)
+    "fundcraft_directsubscription": {"identifier": "payment_reference_code", "fks": {"investor_id": "fundcraft_investor.uuid"}},
+    "fundcraft_investorfunddetail": {"identifier": "id", "fks": {"investor_id": "fundcraft_investor.uuid"}},
+    "fundcraft_navinvestor": {"identifier": "id", "fks": {"investor_id": "fundcraft_investor.uuid"}},
+    "fundcraft_navshareholder": {"identifier": "id", "fks": {"investor_id": "fundcraft_investor.uuid"}},
+    "fundcraft_reclassofshares": {"identifier": "id", "fks": {"investor_id": "fundcraft_investor.uuid"}},
+    "fundcraft_redemptioninvestor": {"identifier": "id", "fks": {"investor_id": "fundcraft_investor.uuid"}},
+    "fundcraft_transferofshareprocess": {"identifier": "transfer_of_shares_process_code", "fks": {"investor_id": "fundcraft_investor.uuid"}},
+    "fundcraft_valuationstatementshareholder": {"identifier": "id", "fks": {"investor_id": "fundcraft_investor.uuid"}},
+    # VIA investor -> client (investor_id as INTEGER - join on inv.id)
+    "fundcraft_investorbanckaccountinformation": {"identifier": "bank_name", "fks": {"investor_id": "fundcraft_investor.id"}},
+    "fundcraft_investorsubscription": {"identifier": "status", "fks": {"investor_id": "fundcraft_investor.id"}},
+    "fundcraft_transferofshare": {"identifier": "id", "fks": {"investor_seller_id": "fundcraft_investor.id"}},
+
+    # VIA structure -> company -> client
+    "fundcraft_conversionprocess": {"identifier": "id", "fks": {"structure_id": "fundcraft_structure.id"}},
+    "fundcraft_employeestructurerelationship": {"identifier": "id", "fks": {"structure_id": "fundcraft_structure.id"}},
+    "fundcraft_fcpermissionstructuregroupuser": {"identifier": "id", "fks": {"structure_id": "fundcraft_structure.id"}},
+    "fundcraft_fcpermissionstructureuser": {"identifier": "id", "fks": {"structure_id": "fundcraft_structure.id"}},
+    "fundcraft_investmentgroup": {"identifier": "name", "fks": {"structure_id": "fundcraft_structure.id"}},
+    "fundcraft_kycprocess": {"identifier": "id", "fks": {"kyc_structure_id": "fundcraft_structure.id"}},
+    "fundcraft_kyctargetstructure": {"identifier": "id", "fks": {"structure_id": "fundcraft_structure.id"}},
+    "fundcraft_structurecontact": {"identifier": "full_name", "fks": {"structure_id": "fundcraft_structure.id"}},
+    "fundcraft_structuredraft": {"identifier": "id", "fks": {"structure_id": "fundcraft_structure.id"}},
+    "fundcraft_structureentity": {"identifier": "entity_type", "fks": {"structure_id": "fundcraft_structure.id"}},
+    "fundcraft_structureinvestmentvehicle": {"identifier": "id", "fks": {"structure_id": "fundcraft_structure.id"}},
+
+    # VIA person -> client
+    "fundcraft_personbankaccountinformation": {"identifier": "bank_name", "fks": {"person_id": "fundcraft_person.id"}},
+    "fundcraft_personblocked": {"identifier": "reason", "fks": {"person_id": "fundcraft_person.id"}},
+    "fundcraft_personkycstatus": {"identifier": "id", "fks": {"person_id": "fundcraft_person.id"}},
+    "fundcraft_personscreeningongoingmonitoringrequestlog": {"identifier": "status", "fks": {"person_id": "fundcraft_person.id"}},
+    "fundcraft_personsuspended": {"identifier": "reason", "fks": {"person_id": "fundcraft_person.id"}},
+    "fundcraft_personverification": {"identifier": "last_name", "fks": {"person_id": "fundcraft_person.id"}},
+
+    # VIA closingprocess -> fcos -> fund -> company -> client
+    "fundcraft_closingprocess": {"identifier": "closing_code", "fks": {"fund_class_of_shares_id": "fundcraft_fundclassofshares.id"}},
+    "fundcraft_closingprocessdocumentsrelationship": {"identifier": "id", "fks": {"closing_process_id": "fundcraft_closingprocess.id"}},
+    "fundcraft_closingprocessshare": {"identifier": "share_name", "fks": {"closing_process_id": "fundcraft_closingprocess.id"}},
+
+    # VIA document (polymorphic entity)
+    "fundcraft_document": {"identifier": "name", "fks": {"entity_uuid": ["fundcraft_company.uuid", "fundcraft_investor.uuid", "fundcraft_person.uuid"]}},
+
+    # VIA bankaccount -> company -> client
+    "fundcraft_bankaccount": {"identifier": "iban", "fks": {"entity_uuid": "fundcraft_company.uuid"}},
+    "fundcraft_bankaccountbalance": {"identifier": "id", "fks": {"bank_account_id": "fundcraft_bankaccount.uuid"}},
+
+    # VIA asset -> investment -> client
+    "fundcraft_asset": {"identifier": "asset_name", "fks": {"investment_id": "fundcraft_investment.uuid"}},
+    "fundcraft_equityasset": {"identifier": "internal_code", "fks": {"asset_ptr_id": "fundcraft_asset.id"}},
+    "fundcraft_debtasset": {"identifier": "internal_code", "fks": {"asset_ptr_id": "fundcraft_asset.id"}},
+    "fundcraft_convertibleasset": {"identifier": "internal_code", "fks": {"asset_ptr_id": "fundcraft_asset.id"}},
+    "fundcraft_safeasset": {"identifier": "internal_code", "fks": {"asset_ptr_id": "fundcraft_asset.id"}},
+
+    # VIA investmentprocess -> company -> client
+    "fundcraft_investmentprocess": {"identifier": "name_holding", "fks": {"target_company_id": "fundcraft_company.id"}},
+    "fundcraft_investmentprocess_v2": {"identifier": "investment_alias", "fks": {"target_company_id": "fundcraft_company.id"}},
+    "fundcraft_investmentprocessdocumentsrelationship": {"identifier": "id", "fks": {"investment_process_id": "fundcraft_investmentprocess.id"}},
+
+    # VIA divestmentprocess -> company -> client
+    "fundcraft_divestmentprocess": {"identifier": "id", "fks": {"portfolio_company_id": "fundcraft_company.id"}},
+
+    # TABLES WITHOUT CLIENT JOIN PATH (identifier only, no fks)
+    "fundcraft_accountinginstruction": {"identifier": "payment_reference_code"},
+    "fundcraft_accountinginstructionpayments": {"identifier": "name"},
+    "fundcraft_activityriskprocess": {"identifier": "id"},
+    "fundcraft_agendapoint": {"identifier": "id"},
+    "fundcraft_agendapointlog": {"identifier": "id"},
+    "fundcraft_amlglobalriskassessment": {"identifier": "id"},
+    "fundcraft_annualaccountcheck": {"identifier": "title"},
+    "fundcraft_annualaccountcheckcomment": {"identifier": "id"},
+    "fundcraft_answer": {"identifier": "content"},
+    "fundcraft_apirequestlog": {"identifier": "status"},
+    "fundcraft_approval": {"identifier": "id"},
+    "fundcraft_assetgroupvaluation": {"identifier": "id"},
+    "fundcraft_assettransaction": {"identifier": "id"},
+    "fundcraft_assistantrelationship": {"identifier": "id"},
+    "fundcraft_bankaccountholder": {"identifier": "id"},
+    "fundcraft_capitalcallequalisation": {"identifier": "id"},
+    "fundcraft_capitalcallexcludablefromequalisation": {"identifier": "id"},
+    "fundcraft_capitalcallfeelinefundclassofshares": {"identifier": "id"},
+    "fundcraft_capitalcallinvestment": {"identifier": "status"},
+    "fundcraft_capitalcallline": {"identifier": "id"},
+    "fundcraft_capitalcallshareholderaccinstexternalpayment": {"identifier": "name"},
+    "fundcraft_capitalcallshareholderequalisationline": {"identifier": "id"},
+    "fundcraft_capitalcallshareholderhistory": {"identifier": "id"},
+    "fundcraft_capitalcallshareholderjointaccount": {"identifier": "id"},
+    "fundcraft_capitalcallshareholderline": {"identifier": "id"},
+    "fundcraft_capitalcallshareholderotherline": {"identifier": "name"},
+    "fundcraft_comment": {"identifier": "content"},
+    "fundcraft_committee": {"identifier": "id"},
+    "fundcraft_committeehtml": {"identifier": "hash_code"},
+    "fundcraft_committeeparticipant": {"identifier": "id"},
+    "fundcraft_committeetypeparticipant": {"identifier": "id"},
+    "fundcraft_companydocumentrequestlog": {"identifier": "status"},
+    "fundcraft_companydocumentsrequestlog": {"identifier": "status"},
+    "fundcraft_companyexternaldocumentrequestlog": {"identifier": "status"},
+    "fundcraft_companyexternaldocumentsession": {"identifier": "provider_code"},
+    "fundcraft_companyexternaldocumentsrequestlog": {"identifier": "status"},
+    "fundcraft_convertibleassetgroupvaluation": {"identifier": "id"},
+    "fundcraft_convertibleassetownership": {"identifier": "id"},
+    "fundcraft_convertibletranche": {"identifier": "id"},
+    "fundcraft_convertibletrancheincome": {"identifier": "id"},
+    "fundcraft_countryriskprocess": {"identifier": "id"},
+    "fundcraft_debtassetgroupvaluation": {"identifier": "id"},
+    "fundcraft_debtcollateral": {"identifier": "description"},
+    "fundcraft_distributionline": {"identifier": "id"},
+    "fundcraft_distributionshareholderhistory": {"identifier": "id"},
+    "fundcraft_distributionshareholderline": {"identifier": "id"},
+    "fundcraft_distributionshareholderpayment": {"identifier": "name"},
+    "fundcraft_divestmentconvertibleasset": {"identifier": "id"},
+    "fundcraft_divestmentequityasset": {"identifier": "id"},
+    "fundcraft_divestmentprocess_assets": {"identifier": "asset_name"},
+    "fundcraft_divestmentprocess_proceeds": {"identifier": "asset_name"},
+    "fundcraft_documentsession": {"identifier": "provider_code"},
+    "fundcraft_documentsourcelog": {"identifier": "id"},
+    "fundcraft_emailmessage": {"identifier": "subject"},
+    "fundcraft_emailthread": {"identifier": "id"},
+    "fundcraft_employee": {"identifier": "id"},
+    "fundcraft_entity": {"identifier": "name"},
+    "fundcraft_entity_history": {"identifier": "id"},
+    "fundcraft_entityscreeninghitongoingmonitoring": {"identifier": "id"},
+    "fundcraft_equityassetgroupvaluation": {"identifier": "id"},
+    "fundcraft_equityassetownership": {"identifier": "id"},
+    "fundcraft_equityassetseller": {"identifier": "ai_status_code"},
+    "fundcraft_fcprocesschecklist": {"identifier": "description"},
+    "fundcraft_fcprocessmeetingassistants": {"identifier": "name"},
+    "fundcraft_fcprocessmeetings": {"identifier": "title"},
+    "fundcraft_fctaskexecution": {"identifier": "codename"},
+    "fundcraft_four_eyes_comment": {"identifier": "comment"},
+    "fundcraft_foureyespolicy": {"identifier": "id"},
+    "fundcraft_fundclassofsharescapitalcall": {"identifier": "id"},
+    "fundcraft_governingprocess": {"identifier": "id"},
+    "fundcraft_incomingemail": {"identifier": "email_id"},
+    "fundcraft_internalnote": {"identifier": "content"},
+    "fundcraft_internalnotementionedemployee": {"identifier": "id"},
+    "fundcraft_investmentprocess_assets": {"identifier": "asset_name"},
+    "fundcraft_investmentprocesscommitteeresolution": {"identifier": "id"},
+    "fundcraft_investordocumentsrelationship": {"identifier": "id"},
+    "fundcraft_investorfunddetaildocumentsrelationship": {"identifier": "id"},
+    "fundcraft_investorfunddetailjointaccount": {"identifier": "id"},
+    "fundcraft_investorsubscriptionbanckaccountinformation": {"identifier": "bank_name"},
+    "fundcraft_investorsubscriptionjointaccount": {"identifier": "id"},
+    "fundcraft_investorsubscriptionline": {"identifier": "id"},
+    "fundcraft_investorsubscriptionnominee": {"identifier": "id"},
+    "fundcraft_kyc_document_type_master_process_relation": {"identifier": "id"},
+    "fundcraft_kyc_document_type_master_variant": {"identifier": "id"},
+    "fundcraft_kyc_screeninghitsession": {"identifier": "status"},
+    "fundcraft_kyc_screeningtargetsession": {"identifier": "status"},
+    "fundcraft_kycamlanswer": {"identifier": "id"},
+    "fundcraft_kycamlquestion": {"identifier": "code"},
+    "fundcraft_kycamlquestionoption": {"identifier": "text"},
+    "fundcraft_kycamlquestionquestionoption": {"identifier": "id"},
+    "fundcraft_kyccompliancereview": {"identifier": "id"},
+    "fundcraft_kycdocumenttargetssession": {"identifier": "status"},
+    "fundcraft_kycdrawing": {"identifier": "id"},
+    "fundcraft_kycduediligenceparticipantsdocuments": {"identifier": "code"},
+    "fundcraft_kycescalationform": {"identifier": "id"},
+    "fundcraft_kycgencomment": {"identifier": "comment"},
+    "fundcraft_kychistoricdump": {"identifier": "id"},
+    "fundcraft_kycindividualamlassessment": {"identifier": "id"},
+    "fundcraft_kycindividualamlchoice": {"identifier": "id"},
+    "fundcraft_kycparticipant": {"identifier": "category"},
+    "fundcraft_kycparticipantrelationship": {"identifier": "relation_type"},
+    "fundcraft_kycparticipantscreeninghit": {"identifier": "id"},
+    "fundcraft_kycparticipantstructureentity": {"identifier": "id"},
+    "fundcraft_kycprocesscomment": {"identifier": "content"},
+    "fundcraft_kycprocessparticipant": {"identifier": "participant_category"},
+    "fundcraft_kycprocessreview": {"identifier": "review_role"},
+    "fundcraft_kycrcpfsreview": {"identifier": "id"},
+    "fundcraft_kycrequestchangereview": {"identifier": "id"},
+    "fundcraft_kycsarstrfiling": {"identifier": "status"},
+    "fundcraft_kyctargetcompany": {"identifier": "id"},
+    "fundcraft_kyctargetcompanyamlassessment": {"identifier": "id"},
+    "fundcraft_kyctargetcompanyamlchoice": {"identifier": "id"},
+    "fundcraft_kyctargetperson": {"identifier": "id"},
+    "fundcraft_kyctransaction": {"identifier": "id"},
+    "fundcraft_kycverificationsession": {"identifier": "id"},
+    "fundcraft_lpportalinvestoraccount": {"identifier": "id"},
+    "fundcraft_mitigationmeasures": {"identifier": "id"},
+    "fundcraft_mitigationmeasurescheck": {"identifier": "title"},
+    "fundcraft_mitigationmeasurescheckcomment": {"identifier": "comment"},
+    "fundcraft_notificationcontact": {"identifier": "email"},
+    "fundcraft_notificationcontact_distributionlisttype_through": {"identifier": "id"},
+    "fundcraft_notificationstatus": {"identifier": "status_code"},
+    "fundcraft_onlinedocumentation": {"identifier": "id"},
+    "fundcraft_outgoingemail": {"identifier": "status"},
+    "fundcraft_parallelfundgroup": {"identifier": "name"},
+    "fundcraft_paymentissuesresolutionmove": {"identifier": "move_name"},
+    "fundcraft_paymentissuesresolutionprocessescalation": {"identifier": "id"},
+    "fundcraft_pepmaterialityassessment": {"identifier": "id"},
+    "fundcraft_pepmaterialitychoice": {"identifier": "id"},
+    "fundcraft_pepstatus": {"identifier": "id"},
+    "fundcraft_pmqualitativepolicyrule": {"identifier": "name"},
+    "fundcraft_pmqualitativepolicyruleresult": {"identifier": "id"},
+    "fundcraft_pmreview": {"identifier": "status"},
+    "fundcraft_question": {"identifier": "content"},
+    "fundcraft_reclassofsharesline": {"identifier": "reference"},
+    "fundcraft_rmevaluation": {"identifier": "code"},
+    "fundcraft_rmqualitativepolicyrule": {"identifier": "name"},
+    "fundcraft_rmqualitativepolicyruleresult": {"identifier": "id"},
+    "fundcraft_rmreview": {"identifier": "status"},
+    "fundcraft_safeassetownership": {"identifier": "id"},
+    "fundcraft_screeningadversemedia": {"identifier": "title"},
+    "fundcraft_screeningadversemediaassessment": {"identifier": "assessment"},
+    "fundcraft_screeninghit": {"identifier": "name"},
+    "fundcraft_screeninghit_backup": {"identifier": "name"},
+    "fundcraft_screeninghitassessment": {"identifier": "assessment"},
+    "fundcraft_screeninghitrequestlog": {"identifier": "status"},
+    "fundcraft_screeningongoingmonitoringactivity": {"identifier": "entity_name"},
+    "fundcraft_screeningrequestlog": {"identifier": "status"},
+    "fundcraft_screeningsongoingmonitoringcheck": {"identifier": "error_code"},
+    "fundcraft_sessionrequestlog": {"identifier": "status"},
+    "fundcraft_sessionrequestlogsession": {"identifier": "status"},
+    "fundcraft_structurecontractualrelationship": {"identifier": "contractual_relationship_type"},
+    "fundcraft_structureentityparticipants": {"identifier": "id"},
+    "fundcraft_structurerelation": {"identifier": "relation_type"},
+    "fundcraft_tag": {"identifier": "type"},
+    "fundcraft_task": {"identifier": "title"},
+    "fundcraft_tranche": {"identifier": "tranche_name"},
+    "fundcraft_trancheactiondrivenfee": {"identifier": "reference_fee_type"},
+    "fundcraft_trancheactiondrivenfeeratchet": {"identifier": "id"},
+    "fundcraft_tranchedrawdown": {"identifier": "id"},
+    "fundcraft_tranchefinancialcovenant": {"identifier": "name"},
+    "fundcraft_tranchefixinterest": {"identifier": "id"},
+    "fundcraft_trancheprincipalrepayment": {"identifier": "id"},
+    "fundcraft_tranchevariableinterest": {"identifier": "id"},
+    "fundcraft_transferdetail": {"identifier": "ai_status_code"},
+    "fundcraft_transferofshareline": {"identifier": "id"},
+    "fundcraft_ubo": {"identifier": "ubo_type"},
+    "fundcraft_underlyingclassofshares": {"identifier": "name"},
+    "fundcraft_underlyingclosing": {"identifier": "transaction_code"},
+    "fundcraft_underlyingdistribution": {"identifier": "transaction_code"},
+    "fundcraft_underlyingdrawdown": {"identifier": "transaction_code"},
+    "fundcraft_underlyingfundcas": {"identifier": "id"},
+    "fundcraft_underlyingfundtransaction": {"identifier": "transaction_code"},
+    "fundcraft_underlyinginvestment": {"identifier": "target_investment_name"},
+    "fundcraft_underlyingportfolio": {"identifier": "id"},
+    "fundcraft_underlyingtotal": {"identifier": "id"},
+    "fundcraft_underlyingtotalgroupvaluation": {"identifier": "id"},
+    "fundcraft_valuationportfolioasset": {"identifier": "asset_name"},
+    "fundcraft_variant_document_type": {"identifier": "code"},
+    "fundcraft_vehicletyperiskprocess": {"identifier": "id"},
+    "fundcraft_verificationrequestlog": {"identifier": "status"},
+    "fundcraft_verificationsession": {"identifier": "code"},
+    "fundcraft_verificationsessioncommunication": {"identifier": "id"},
+    "fundcraft_version": {"identifier": "version"},
+    "fundcraft_versionuser": {"identifier": "user_email"},
+    "fundcraft_watchlist_subscription": {"identifier": "id"},
+    "fundcraft_workflow": {"identifier": "workflow_title"},
+    "fundcraft_workflowstep": {"identifier": "name"},
+    "fundcraft_workflowtransition": {"identifier": "id"},
+    "integrations_gmailcredential": {"identifier": "email"},
+    "integrations_imapsconfig": {"identifier": "username"},
+    "messaging_emailmessagedocumentsrelationship": {"identifier": "id"},
+}
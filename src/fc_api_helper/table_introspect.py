@@ -0,0 +1,230 @@
+"""Build the fc-uuid table configuration from the database catalog.
+
+`fc-uuid --introspect` reads every single-column foreign key and every column
+of the django schema in one query, merges the foreign keys with the edges of
+the built-in TABLE_CONFIG (which also knows references that are not declared
+as constraints), picks an identifier column per table and writes a versioned
+cache. fc-uuid loads that cache at startup instead of the built-in config and
+re-introspects when the django_migrations version changes.
+
+Tables without a uuid column cannot be picked, but those on a foreign-key
+path to the client (join tables) are kept with "join_only": True so client
+filters can go through them.
+"""
+
+import json
+import os
+import time
+
+from fc_api_helper.join_planner import JoinPlanner, iter_fks
+from fc_api_helper.psql import DB_URL, DatabaseError, fetch_csv_rows, print_error
+
+
+CACHE_VERSION = 1
+CACHE_FILE = os.path.expanduser('~/.cache/fc-api-helper/fc-uuid-tables.json')
+
+# Seconds between migration version checks of a cached config
+MIGRATION_CHECK_INTERVAL = 3600
+
+SCHEMA = 'django'
+
+# Preferred identifier columns, most readable first
+IDENTIFIER_CANDIDATES = (
+    'name', 'title', 'slug', 'code', 'reference', 'full_name', 'email', 'username',
+    'subject', 'label', 'description', 'status',
+)
+
+MIGRATION_QUERY = f"SELECT count(*)::text || ':' || coalesce(max(id), 0)::text FROM {SCHEMA}.django_migrations"
+
+INTROSPECT_QUERY = f"""
+SELECT 'fk', cl.relname::text, a.attname::text, rcl.relname::text, ra.attname::text
+FROM pg_constraint c
+JOIN pg_class cl ON cl.oid = c.conrelid
+JOIN pg_namespace n ON n.oid = cl.relnamespace
+JOIN pg_class rcl ON rcl.oid = c.confrelid
+JOIN pg_namespace rn ON rn.oid = rcl.relnamespace
+JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = c.conkey[1]
+JOIN pg_attribute ra ON ra.attrelid = c.confrelid AND ra.attnum = c.confkey[1]
+WHERE c.contype = 'f' AND n.nspname = '{SCHEMA}' AND rn.nspname = '{SCHEMA}' AND array_length(c.conkey, 1) = 1
+UNION ALL
+SELECT 'col', table_name::text, column_name::text, data_type::text, NULL
+FROM information_schema.columns
+WHERE table_schema = '{SCHEMA}'
+UNION ALL
+SELECT 'migration', ({MIGRATION_QUERY}), NULL, NULL, NULL
+"""
+
+
+def get_builtin_table_config():
+    """Return the built-in TABLE_CONFIG (imported lazily, it is large)."""
+    from fc_api_helper.table_config import TABLE_CONFIG
+    return TABLE_CONFIG
+
+
+def get_migration_version(db_url=DB_URL):
+    """Return the django_migrations version string ("<count>:<max id>")."""
+    rows = fetch_csv_rows(MIGRATION_QUERY, db_url)
+    return rows[0][0] if rows else None
+
+
+def pick_identifier(columns, fallback=None):
+    """Pick the most readable identifier column of a table.
+
+    Args:
+        columns: List of column names of the table
+        fallback: Identifier to keep if it still exists (e.g. the built-in one)
+
+    Returns:
+        Column name
+    """
+    if fallback and fallback in columns:
+        return fallback
+    for candidate in IDENTIFIER_CANDIDATES:
+        if candidate in columns:
+            return candidate
+    for column in columns:
+        if column.endswith(('_code', '_name')):
+            return column
+    return 'id' if 'id' in columns else 'uuid'
+
+
+def merge_fks(*fk_maps):
+    """Merge {"column": target or [targets]} maps into one."""
+    merged = {}
+    for fks in fk_maps:
+        for column, targets in (fks or {}).items():
+            targets = [targets] if isinstance(targets, str) else targets
+            existing = merged.setdefault(column, [])
+            existing.extend(t for t in targets if t not in existing)
+    return {column: targets[0] if len(targets) == 1 else targets for column, targets in merged.items()}
+
+
+def build_table_config(rows, builtin=None):
+    """Build a TABLE_CONFIG from introspection rows.
+
+    Tables with a uuid column are kept (fc-uuid selects t.uuid), and so are
+    the tables without one that lie on a foreign-key path to the client,
+    marked "join_only".
+
+    Args:
+        rows: Rows of INTROSPECT_QUERY
+        builtin: Built-in TABLE_CONFIG whose identifiers and edges are kept
+
+    Returns:
+        Tuple of (table_config, migration_version)
+    """
+    builtin = builtin or {}
+    columns = {}
+    fks = {}
+    migration = None
+
+    for kind, table, column, ref_table, ref_column in rows:
+        if kind == 'col':
+            columns.setdefault(table, []).append(column)
+        elif kind == 'fk':
+            fks.setdefault(table, {})[column] = f"{ref_table}.{ref_column}"
+        elif kind == 'migration':
+            migration = table
+
+    table_config = {}
+    for table in sorted(columns):
+        if 'uuid' not in columns[table]:
+            continue
+        known = builtin.get(table, {})
+        config = {'identifier': pick_identifier(columns[table], known.get('identifier'))}
+        table_fks = merge_fks(known.get('fks'), fks.get(table))
+        if table_fks:
+            config['fks'] = table_fks
+        table_config[table] = config
+
+    # Intermediate tables without a uuid column still carry edges: keep those
+    # that are referenced and reach the client
+    join_tables = {}
+    for table in sorted(columns):
+        if table in table_config:
+            continue
+        known = builtin.get(table, {})
+        table_fks = merge_fks(known.get('fks'), fks.get(table))
+        if table_fks:
+            join_tables[table] = {'identifier': pick_identifier(columns[table], known.get('identifier')),
+                                  'fks': table_fks, 'join_only': True}
+    candidates = {**table_config, **join_tables}
+    costs = JoinPlanner(candidates).compute_costs()
+    referenced = {target for table in candidates for _, targets in iter_fks(candidates, table)
+                  for target, _ in targets}
+    table_config.update((table, config) for table, config in join_tables.items()
+                        if table in costs and table in referenced)
+
+    return table_config, migration
+
+
+def pickable_tables(table_config):
+    """Return the tables of a config that have a uuid to pick (not join_only), sorted."""
+    return sorted(table for table, config in table_config.items() if not config.get('join_only'))
+
+
+def write_cache(table_config, migration, cache_file=CACHE_FILE):
+    """Write an introspected table config to the versioned cache file."""
+    cache_dir = os.path.dirname(cache_file)
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+
+    tmp_file = f"{cache_file}.tmp{os.getpid()}"
+    with open(tmp_file, 'w') as f:
+        json.dump({
+            'version': CACHE_VERSION,
+            'migration': migration,
+            'checked_at': int(time.time()),
+            'tables': table_config,
+        }, f, indent=1)
+    os.replace(tmp_file, cache_file)
+
+
+def introspect(db_url=DB_URL, cache_file=CACHE_FILE):
+    """Introspect the database and write the table config cache.
+
+    Returns:
+        The introspected table config
+
+    Raises:
+        DatabaseError: The database could not be queried
+    """
+    rows = fetch_csv_rows(INTROSPECT_QUERY, db_url)
+    table_config, migration = build_table_config(rows, get_builtin_table_config())
+    write_cache(table_config, migration, cache_file)
+    return table_config
+
+
+def load_table_config(db_url=DB_URL, cache_file=CACHE_FILE):
+    """Load the table config: introspected cache if present, else built-in.
+
+    A cached config is re-checked against the django_migrations version at
+    most every MIGRATION_CHECK_INTERVAL seconds and re-introspected when the
+    version changed. If the database cannot be queried the cached config is
+    used as is (and checked again next time), so fc-uuid works offline.
+    """
+    try:
+        with open(cache_file, 'r') as f:
+            cache = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return get_builtin_table_config()
+
+    if cache.get('version') != CACHE_VERSION:
+        return get_builtin_table_config()
+
+    if time.time() - cache.get('checked_at', 0) < MIGRATION_CHECK_INTERVAL:
+        return cache['tables']
+
+    try:
+        migration = get_migration_version(db_url)
+        if migration != cache.get('migration'):
+            print_error(f"Schema migrations changed ({cache.get('migration')} -> {migration}), "
+                        f"re-introspecting tables...")
+            return introspect(db_url, cache_file)
+    except DatabaseError as e:
+        print_error(f"Error querying database: {e}")
+        print_error("Using the cached table config")
+        return cache['tables']
+
+    write_cache(cache['tables'], migration, cache_file)
+    return cache['tables']
@@ -0,0 +1,603 @@
+"""Background UUID sample prefetching for the API explorers.
+
+Every uuid-like parameter and body field of a schema is mapped to its likely
+fc-uuid table once per schema refresh (from the field name, the path segment
+before a bare {uuid} path parameter, or the $ref component holding a bare
+"uuid" field) and the mapping is persisted next to the endpoint index:
+
+    uuid-fields.json  {"fields": {name: table}, "paths": {path: {param: table}},
+                       "components": {component: table}}
+
+Once an endpoint is selected, samples of the tables of all its uuid fields
+are loaded concurrently on a background event loop (see aio) while the user
+answers the earlier prompts, so each UUID picker opens on the right table
+without waiting for psql.
+"""
+
+import hashlib
+import io
+import json
+import os
+import asyncio
+import re
+import sys
+import threading
+
+from fc_api_helper import aio
+from fc_api_helper.profiling import span
+from fc_api_helper.psql import DatabaseError, error_output, print_error
+
+
+# Tables sampled concurrently
+MAX_WORKERS = 4
+
+# Field name suffixes that mark a reference, longest first
+REFERENCE_SUFFIXES = ('_uuids', '_uuid', '_ids', '_id', 'uuids', 'uuid')
+
+TABLE_PREFIX = 'fundcraft_'
+
+FIELD_INDEX_FILE = 'uuid-fields.json'
+FIELD_INDEX_VERSION = 1
+
+# Serializer naming noise around a component's entity name
+COMPONENT_PREFIXES = ('Patched', 'Nested')
+COMPONENT_SUFFIXES = (
+    'Serializer', 'Request', 'Response', 'Details', 'Detail', 'List', 'Create', 'Update',
+    'Input', 'Output', 'Read', 'Write', 'Summary',
+)
+
+
+def is_uuid_field(name, description=''):
+    """Return True if fc-uuid should be offered for a field (as prompt_for_value does)."""
+    return 'uuid' in name.lower() or 'uuid' in (description or '').lower()
+
+
+def normalize_field_name(name):
+    """Turn camelCase / kebab-case names into snake_case."""
+    name = re.sub(r'(?<=[a-z0-9])([A-Z])', r'_\1', name)
+    return re.sub(r'[^a-z0-9]+', '_', name.lower()).strip('_')
+
+
+def build_table_lookup(tables):
+    """Precompute entity name -> table lookups for guess_table_for_field.
+
+    Returns:
+        Tuple of (exact, suffix) dicts: exact maps table names with and
+        without the fundcraft_ prefix, suffix maps every "_"-separated tail
+        of a table name to the shortest table ending with it
+    """
+    exact = {}
+    suffix = {}
+    for table in sorted(tables, key=lambda t: (len(t), t)):
+        exact.setdefault(table, table)
+        if table.startswith(TABLE_PREFIX):
+            exact.setdefault(table[len(TABLE_PREFIX):], table)
+        parts = table.split('_')
+        for i in range(1, len(parts)):
+            suffix.setdefault('_'.join(parts[i:]), table)
+    return exact, suffix
+
+
+def _match_table(candidate, table_lookup):
+    """Find the table for a singular snake_case entity name, or None."""
+    exact, suffix = table_lookup
+    return exact.get(candidate) or exact.get(candidate.replace('_', '')) or suffix.get(candidate)
+
+
+def _singular(word):
+    if word.endswith('ies'):
+        return word[:-3] + 'y'
+    if word.endswith(('sses', 'xes')):
+        return word[:-2]
+    if word.endswith('s') and not word.endswith('ss'):
+        return word[:-1]
+    return word
+
+
+def field_stem(name):
+    """Return the snake_case entity part of a field name ("fundUuid" -> "fund")."""
+    stem = normalize_field_name(name)
+    for suffix in REFERENCE_SUFFIXES:
+        if stem.endswith(suffix):
+            return stem[:-len(suffix)].rstrip('_')
+    return stem
+
+
+def path_entity(path, name=None):
+    """Return the entity of the last resource segment of a path.
+
+    "/api/capital-calls/{uuid}/" -> "capital_call"; with a parameter name,
+    the last segment before that parameter is used.
+    """
+    placeholder = path.find(f"{{{name}}}") if name else -1
+    segments = [s for s in path[:placeholder if placeholder >= 0 else len(path)].split('/')
+                if s and not s.startswith('{')]
+    return _singular(normalize_field_name(segments[-1])) if segments else ''
+
+
+def component_entity(component):
+    """Strip serializer noise from a component name ("PatchedFundDetailRequest" -> "Fund")."""
+    for prefix in COMPONENT_PREFIXES:
+        if component.startswith(prefix) and len(component) > len(prefix):
+            component = component[len(prefix):]
+    stripped = True
+    while stripped:
+        stripped = False
+        for suffix in COMPONENT_SUFFIXES:
+            if component.endswith(suffix) and len(component) > len(suffix):
+                component = component[:-len(suffix)]
+                stripped = True
+    return component
+
+
+def guess_table_for_field(name, table_lookup, path=''):
+    """Guess the table a uuid field references.
+
+    "fund_uuid" -> fundcraft_fund, "x-sirius-client-uuid" -> fundcraft_client,
+    "capitalCallUuids" -> fundcraft_capitalcall. A bare "uuid"/"id" path
+    parameter is resolved from the path segment before it
+    ("/funds/{uuid}/" -> fundcraft_fund).
+
+    Args:
+        name: Field or parameter name
+        table_lookup: Result of build_table_lookup
+        path: Endpoint path (used for bare uuid parameters)
+
+    Returns:
+        Table name or None
+    """
+    stem = field_stem(name)
+
+    if not stem and path:
+        stem = path_entity(path, name)
+
+    # Drop leading qualifiers until a table matches ("owner_client" -> "client")
+    tokens = stem.split('_') if stem else []
+    for i in range(len(tokens)):
+        candidate = '_'.join(tokens[i:])
+        table = _match_table(candidate, table_lookup) or _match_table(_singular(candidate), table_lookup)
+        if table:
+            return table
+    return None
+
+
+def _ref_name(ref):
+    return ref.rsplit('/', 1)[-1] if ref.startswith('#/components/schemas/') else None
+
+
+def _iter_body_uuid_fields(body_schema, full_schema, resolve_ref, seen, component=None):
+    """Yield (field_name, component) for the uuid fields of a body schema.
+
+    component is the name of the $ref component holding the field (None for
+    inline schemas).
+    """
+    if not body_schema or id(body_schema) in seen:
+        return
+    seen.add(id(body_schema))
+
+    for prop_name, prop_schema in body_schema.get('properties', {}).items():
+        prop_component = component
+        if '$ref' in prop_schema and full_schema:
+            prop_component = _ref_name(prop_schema['$ref'])
+            prop_schema = resolve_ref(full_schema, prop_schema['$ref']) or prop_schema
+        prop_type = prop_schema.get('type', 'string')
+
+        if prop_type == 'object' and 'properties' in prop_schema:
+            yield from _iter_body_uuid_fields(prop_schema, full_schema, resolve_ref, seen, prop_component)
+        elif prop_type == 'array':
+            items_schema = prop_schema.get('items', {})
+            if '$ref' in items_schema and full_schema:
+                prop_component = _ref_name(items_schema['$ref'])
+                items_schema = resolve_ref(full_schema, items_schema['$ref']) or items_schema
+            if items_schema.get('type') == 'object' and 'properties' in items_schema:
+                yield from _iter_body_uuid_fields(items_schema, full_schema, resolve_ref, seen, prop_component)
+            elif is_uuid_field(prop_name, items_schema.get('description', '')):
+                yield prop_name, component
+        elif not prop_schema.get('enum') and is_uuid_field(prop_name, prop_schema.get('description', '')):
+            yield prop_name, component
+
+
+def _iter_own_uuid_fields(object_schema):
+    """Yield the uuid field names among an object schema's own properties."""
+    for prop_name, prop_schema in (object_schema.get('properties') or {}).items():
+        items_schema = prop_schema.get('items') or {}
+        description = prop_schema.get('description') or items_schema.get('description', '')
+        if not prop_schema.get('enum') and is_uuid_field(prop_name, description):
+            yield prop_name
+
+
+def _get_body_component(details):
+    body_schema = (details.get('requestBody', {}).get('content', {})
+                   .get('application/json', {}).get('schema') or {})
+    return _ref_name(body_schema.get('$ref', ''))
+
+
+def collect_uuid_fields(schema, path, method, required_headers=()):
+    """List the uuid-like headers, parameters and body fields of an operation.
+
+    Returns:
+        List of (field_name, param_in, component) tuples in prompt order,
+        without duplicate names; component is the $ref component holding a
+        body field, if any
+    """
+    # Imported lazily: api_explorer imports this module
+    from fc_api_helper.api_explorer import get_parameters, get_request_body_schema, resolve_ref
+
+    fields = [(rh['name'], 'header', None) for rh in required_headers
+              if is_uuid_field(rh['name'], rh.get('description', ''))]
+    for param_in in ('header', 'path', 'query'):
+        for param in get_parameters(schema, path, method, param_in):
+            if is_uuid_field(param['name'], param.get('description', '')):
+                fields.append((param['name'], param_in, None))
+
+    if method.upper() in ('POST', 'PUT', 'PATCH', 'DELETE'):
+        body_schema = get_request_body_schema(schema, path, method)
+        details = schema['paths'].get(path, {}).get(method.lower(), {})
+        fields.extend(
+            (name, 'body', component)
+            for name, component in _iter_body_uuid_fields(
+                body_schema, schema, resolve_ref, set(), _get_body_component(details))
+        )
+
+    unique = []
+    for field in fields:
+        if field[0] not in (f[0] for f in unique):
+            unique.append(field)
+    return unique
+
+
+def get_tables_stamp(tables):
+    """Return a stamp identifying a table config's set of tables."""
+    return hashlib.sha1("\n".join(sorted(tables)).encode('utf-8')).hexdigest()
+
+
+def build_field_index(schema, tables):
+    """Map every uuid field of a schema to its likely table.
+
+    Named fields ("fund_uuid") are mapped globally; bare "uuid"/"id" fields
+    are mapped through the path segment (path parameters) or the component
+    that holds them (body fields).
+
+    Args:
+        schema: Merged OpenAPI schema
+        tables: Collection of known table names
+
+    Returns:
+        Dict with 'fields', 'paths' and 'components' mappings
+    """
+    from fc_api_helper.endpoint_index import iter_operations
+
+    table_lookup = build_table_lookup(tables)
+    components = {}
+    names = set()
+    paths = {}
+    for component, component_schema in schema.get('components', {}).get('schemas', {}).items():
+        table = guess_table_for_field(component_entity(component), table_lookup)
+        if table:
+            components[component] = table
+        # Only the component's own properties: nested components are indexed on their own
+        names.update(_iter_own_uuid_fields(component_schema))
+
+    for method, path, details in iter_operations(schema):
+        _index_operation(path, details, table_lookup, paths, names)
+
+    fields = {}
+    _index_field_names(names, table_lookup, fields)
+    return {'fields': fields, 'paths': paths, 'components': components}
+
+
+def _index_operation(path, details, table_lookup, paths, names):
+    """Add an operation's bare path uuid parameters to paths and its other uuid field names to names."""
+    body_schema = (details.get('requestBody', {}).get('content', {})
+                   .get('application/json', {}).get('schema') or {})
+    names.update(_iter_own_uuid_fields(body_schema))
+    for param in details.get('parameters', []):
+        if not isinstance(param, dict) or not is_uuid_field(param.get('name', ''), param.get('description', '')):
+            continue
+        if param.get('in') == 'path' and not field_stem(param['name']):
+            table = guess_table_for_field(param['name'], table_lookup, path)
+            if table:
+                paths.setdefault(path, {})[param['name']] = table
+        else:
+            names.add(param['name'])
+
+
+def _index_field_names(names, table_lookup, fields):
+    """Map the named uuid fields not in fields yet to their table."""
+    for name in sorted(names):
+        if name not in fields and field_stem(name):
+            table = guess_table_for_field(name, table_lookup)
+            if table:
+                fields[name] = table
+
+
+def patch_field_index(field_index, schema, tables, changes):
+    """Update a field index for the changes of an endpoint index rebuild.
+
+    Only the changed components and the paths of added, removed and changed
+    operations are indexed again. Named fields are mapped from their name
+    alone, so mappings of names that disappeared are kept: they are still
+    right should the name come back.
+
+    Args:
+        field_index: Field index built for the previous schema (modified)
+        schema: Merged schema
+        tables: Collection of known table names
+        changes: schema_diff.diff_hashes result between both schemas
+
+    Returns:
+        The patched field index
+    """
+    from fc_api_helper.endpoint_index import HTTP_METHODS
+
+    table_lookup = build_table_lookup(tables)
+    component_schemas = schema.get('components', {}).get('schemas', {})
+    names = set()
+
+    component_changes = changes['components']
+    for key in component_changes['removed'] + component_changes['added'] + component_changes['changed']:
+        kind, _, component = key.partition('/')
+        field_index['components'].pop(component, None)
+        if kind != 'schemas' or component not in component_schemas:
+            continue
+        table = guess_table_for_field(component_entity(component), table_lookup)
+        if table:
+            field_index['components'][component] = table
+        names.update(_iter_own_uuid_fields(component_schemas[component]))
+
+    changed_paths = {key.partition(' ')[2] for key in changes['added'] + changes['removed'] + changes['changed']}
+    for path in changed_paths:
+        field_index['paths'].pop(path, None)
+        for method, details in schema.get('paths', {}).get(path, {}).items():
+            if method in HTTP_METHODS and isinstance(details, dict):
+                _index_operation(path, details, table_lookup, field_index['paths'], names)
+
+    _index_field_names(names, table_lookup, field_index['fields'])
+    return field_index
+
+
+def lookup_field_table(field_index, name, path='', component=None):
+    """Return the table of a field from a field index, or None."""
+    if name in field_index['fields']:
+        return field_index['fields'][name]
+    if name in field_index['paths'].get(path, {}):
+        return field_index['paths'][path][name]
+    if component and not field_stem(name):
+        return field_index['components'].get(component)
+    return None
+
+
+def load_field_index(index_dir, schema, tables, changes=None):
+    """Load the persisted field index, updating it when stale.
+
+    The index is rebuilt when the table config changed (fc-uuid
+    --introspect), and patched (see patch_field_index) when only the
+    endpoint index was rebuilt since (schema refresh) and its changes are
+    known.
+
+    Args:
+        index_dir: Endpoint index directory (see endpoint_index.get_index_dir)
+        schema: Merged schema, or None if it was not loaded
+        tables: Collection of known table names
+        changes: Changes of the endpoint index rebuild, if it was just
+            rebuilt (see endpoint_index.build_endpoint_index)
+
+    Returns:
+        Field index dict, or None if it is stale and no schema is available
+    """
+    from fc_api_helper.endpoint_index import OPERATIONS_FILE
+
+    index_file = os.path.join(index_dir, FIELD_INDEX_FILE)
+    try:
+        operations_mtime = os.stat(os.path.join(index_dir, OPERATIONS_FILE)).st_mtime_ns
+    except FileNotFoundError:
+        operations_mtime = None
+
+    stamps = {
+        'version': FIELD_INDEX_VERSION,
+        'operations_mtime': operations_mtime,
+        'tables': get_tables_stamp(tables),
+    }
+    field_index = None
+    try:
+        with open(index_file, 'r') as f:
+            field_index = json.load(f)
+        if all(field_index.get(key) == value for key, value in stamps.items()):
+            return field_index
+    except (FileNotFoundError, json.JSONDecodeError):
+        pass
+
+    if schema is None:
+        return None
+
+    with span('field_index'):
+        if (changes is not None and field_index is not None
+                and all(field_index.get(key) == stamps[key] for key in ('version', 'tables'))):
+            field_index = dict(patch_field_index(field_index, schema, tables, changes), **stamps)
+        else:
+            field_index = dict(stamps, **build_field_index(schema, tables))
+    os.makedirs(index_dir, exist_ok=True)
+    tmp_file = f"{index_file}.tmp{os.getpid()}"
+    with open(tmp_file, 'w') as f:
+        json.dump(field_index, f)
+    os.replace(tmp_file, index_file)
+    return field_index
+
+
+def map_field_tables(fields, path, index_dir=None, full_schema=None, changes=None):
+    """Map uuid fields to tables with the active fc-uuid table config.
+
+    Loads the table config and the join costs (before any sampling needs
+    them), then the field index.
+
+    Args:
+        fields: (name, param_in, component) tuples of collect_uuid_fields
+        path: Operation path
+        index_dir, full_schema, changes: See load_field_index
+
+    Returns:
+        Dict of field name -> table, for the fields whose table is known
+    """
+    # Imported lazily: fc_uuid is only needed once an endpoint is selected
+    from fc_api_helper.cli import fc_uuid
+    tables = fc_uuid.get_pickable_tables()
+    fc_uuid.get_planner().compute_costs()
+
+    field_index = load_field_index(index_dir, full_schema, tables, changes) if index_dir and tables else None
+    table_lookup = build_table_lookup(tables)
+
+    field_tables = {}
+    for name, param_in, component in fields:
+        table = None
+        if field_index is not None:
+            table = lookup_field_table(field_index, name, path, component)
+        if table is None and (field_index is None or param_in == 'header'):
+            # Config-provided headers are not part of the schema's index
+            table = guess_table_for_field(name, table_lookup, path if param_in == 'path' else '')
+        if table:
+            field_tables[name] = table
+    return field_tables
+
+
+async def _load_rows(table, client_uuid, limit, semaphore):
+    from fc_api_helper.cli import fc_uuid
+    try:
+        async with semaphore:
+            with span('prefetch'):
+                return await fc_uuid.fetch_uuid_rows(table, client_uuid, limit, quiet=True)
+    except DatabaseError as e:
+        print_error(f"Error querying database: {e}")
+        return None
+
+
+class UuidPrefetcher:
+    """Map uuid fields of an operation to tables and sample them in the background.
+
+    Everything touching the database runs on the background loop, including
+    loading the table config (which may check the migration version or
+    re-introspect): the first prompt never waits for psql. Database errors of
+    the background work are collected and reported once, as a short notice,
+    instead of being printed over the prompts.
+    """
+
+    def __init__(self, schema, path, method, required_headers=(), index_dir=None, full_schema=None, limit=200,
+                 changes=None):
+        """Start mapping the uuid fields of an operation to tables.
+
+        Args:
+            schema: Schema holding the operation (full schema or its slice)
+            path: Operation path
+            method: Operation method
+            required_headers: Config-provided headers prompted before the others
+            index_dir: Endpoint index directory holding the field index
+            full_schema: Full merged schema, if loaded, to rebuild a stale
+                field index (otherwise the operation's fields are guessed)
+            limit: Rows sampled per table
+            changes: Changes of a just rebuilt endpoint index, to patch the
+                field index (see load_field_index)
+        """
+        self.limit = limit
+        self._errors = io.StringIO()
+        self._notified = False
+        self._lock = threading.Lock()
+        # Prefetch requests made before the fields are mapped
+        self._pending = []
+        self._field_tables = None
+        self._semaphore = None
+        self._futures = {}
+        self._loop = aio.BackgroundLoop()
+        self._mapping = self._loop.submit(self._map_fields(
+            list(collect_uuid_fields(schema, path, method, required_headers)),
+            path, index_dir, full_schema, changes
+        ))
+
+    async def _map_fields(self, fields, path, index_dir, full_schema, changes):
+        error_output.set(self._errors)
+        try:
+            field_tables = map_field_tables(fields, path, index_dir, full_schema, changes)
+        except DatabaseError as e:
+            # Database unreachable: prompts fall back to plain fc-uuid
+            print_error(f"Error querying database: {e}")
+            field_tables = {}
+        with self._lock:
+            self._field_tables = field_tables
+            for client_uuid, names in self._pending:
+                self._start(client_uuid, names)
+            self._pending = None
+        return field_tables
+
+    @property
+    def field_tables(self):
+        """Dict of field name -> guessed table (waits for the mapping)."""
+        return self._mapping.result()
+
+    def get_table(self, name):
+        """Return the guessed table of a field, or None."""
+        return self.field_tables.get(name)
+
+    def prefetch(self, client_uuid=None, names=None):
+        """Start sampling the tables of the given fields (default: all) for a client."""
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((client_uuid, names))
+            else:
+                self._start(client_uuid, names)
+
+    def _start(self, client_uuid, names):
+        # Called with the lock held, once the fields are mapped
+        for name, table in self._field_tables.items():
+            if names is not None and name not in names:
+                continue
+            key = (table, client_uuid)
+            if key not in self._futures:
+                self._futures[key] = self._loop.submit(self._load(table, client_uuid))
+
+    async def _load(self, table, client_uuid):
+        error_output.set(self._errors)
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(MAX_WORKERS)
+        return await _load_rows(table, client_uuid, self.limit, self._semaphore)
+
+    def _notify_failure(self):
+        """Print the first collected database error once."""
+        errors = self._errors.getvalue().strip()
+        if errors and not self._notified:
+            self._notified = True
+            print(f"  UUID samples unavailable ({errors.splitlines()[0]}), using fc-uuid", file=sys.stderr)
+
+    def get_rows(self, table, client_uuid=None):
+        """Return the prefetched rows of a table (waiting if still loading).
+
+        Returns:
+            List of (uuid, identifier) rows, or None if the table was not
+            prefetched for this client or loading failed
+        """
+        self._mapping.result()
+        with self._lock:
+            future = self._futures.get((table, client_uuid))
+        if future is None:
+            return None
+        if not future.done():
+            print(f"  Waiting for {table} samples...", file=sys.stderr)
+        rows = future.result()
+        if rows is None:
+            self._notify_failure()
+        return rows
+
+    def get_samples(self, client_uuid=None):
+        """Return the prefetched UUIDs of every mapped field (waiting if still loading).
+
+        Returns:
+            Dict of field name -> list of UUIDs, for the fields whose table
+            was sampled successfully
+        """
+        samples = {}
+        for name, table in self.field_tables.items():
+            rows = self.get_rows(table, client_uuid)
+            if rows:
+                samples[name] = [row[0] for row in rows]
+        return samples
+
+    def shutdown(self):
+        """Stop the background loop, discarding pending prefetches."""
+        self._loop.close()
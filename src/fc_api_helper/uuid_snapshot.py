@@ -0,0 +1,315 @@
+"""Local per-client UUID snapshots for fc-uuid.
+
+`fc-uuid --client X --snapshot` copies (table, uuid, identifier) of every
+client-scoped table into a SQLite database with an FTS5 index, in a single
+psql session. Later `fc-uuid --client X` lookups (and `--search`) are
+answered locally. Refreshing an existing snapshot only fetches rows whose
+updated_at moved past the last sync, for tables that have that column; as
+that never sees rows deleted upstream, every MAX_INCREMENTAL_SYNCS-th
+refresh of a table reloads it completely.
+
+Tables are replaced one at a time (a savepoint per table): a table whose
+query fails keeps its previous content and sync state, and nothing is
+written if the psql session breaks.
+"""
+
+import os
+import re
+import sqlite3
+import sys
+import time
+
+from fc_api_helper.psql import (
+    DB_URL,
+    QUERY_DONE,
+    fetch_csv_rows,
+    param,
+    quote_ident,
+    quote_literal,
+    stream_csv_script
+)
+
+
+SNAPSHOT_DIR = os.path.expanduser('~/.cache/fc-api-helper/uuid-snapshots')
+
+UPDATED_AT_QUERY = (
+    "SELECT table_name::text FROM information_schema.columns "
+    "WHERE table_schema = 'django' AND column_name = 'updated_at'"
+)
+
+# Rows inserted per SQLite executemany batch
+BATCH_SIZE = 5000
+
+# Incremental refreshes of a table before it is reloaded completely
+MAX_INCREMENTAL_SYNCS = 10
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS rows (
+    tbl TEXT NOT NULL,
+    uuid TEXT NOT NULL,
+    identifier TEXT,
+    updated_at TEXT,
+    UNIQUE (tbl, uuid)
+);
+CREATE TABLE IF NOT EXISTS synced_tables (
+    tbl TEXT PRIMARY KEY,
+    synced_at INTEGER,
+    max_updated_at TEXT,
+    incremental_syncs INTEGER NOT NULL DEFAULT 0
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS rows_fts USING fts5(
+    identifier, content='rows', content_rowid='rowid'
+);
+"""
+
+
+def get_snapshot_file(client_uuid):
+    """Return the snapshot path of a client."""
+    safe_name = re.sub(r'[^A-Za-z0-9_-]', '_', client_uuid)
+    return os.path.join(SNAPSHOT_DIR, f"{safe_name}.sqlite")
+
+
+def open_snapshot(client_uuid, create=False):
+    """Open a client's snapshot database.
+
+    Returns:
+        sqlite3 connection, or None if the snapshot does not exist and
+        create is False
+    """
+    snapshot_file = get_snapshot_file(client_uuid)
+    if not create and not os.path.exists(snapshot_file):
+        return None
+
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    connection = sqlite3.connect(snapshot_file)
+    connection.executescript(SCHEMA_SQL)
+    columns = {row[1] for row in connection.execute("PRAGMA table_info(synced_tables)")}
+    if 'incremental_syncs' not in columns:
+        # Snapshots created before incremental syncs were counted
+        connection.execute(
+            "ALTER TABLE synced_tables ADD COLUMN incremental_syncs INTEGER NOT NULL DEFAULT 0")
+        connection.commit()
+    return connection
+
+
+def build_snapshot_queries(client_uuid, table_config, build_query, synced, updated_at_tables):
+    """Build the per-table snapshot queries.
+
+    Args:
+        client_uuid: Client UUID to snapshot
+        table_config: Active fc-uuid table config
+        build_query: Callable(table, client_uuid, select_cols) returning the
+            client-filtered (query, params), or None if the table has no
+            client path
+        synced: Dict of table -> max_updated_at from the previous sync
+        updated_at_tables: Set of tables having an updated_at column
+
+    Returns:
+        Tuple of (queries, params) where queries is a list of
+        (table, incremental, query) tuples and params the parameters of all
+        queries
+    """
+    queries = []
+    params = {}
+    for table in sorted(table_config):
+        if table_config[table].get('join_only'):
+            continue
+        identifier = table_config[table].get('identifier', 'id')
+        has_updated_at = table in updated_at_tables
+        updated_col = f"t.{quote_ident('updated_at')}::text" if has_updated_at else "NULL"
+        select_cols = (f"{quote_literal(table)}, t.{quote_ident('uuid')}::text, "
+                       f"t.{quote_ident(identifier)}::text, {updated_col}")
+
+        built = build_query(table, client_uuid, select_cols)
+        if built is None:
+            continue
+        query, query_params = built
+        params.update(query_params)
+
+        last_updated = synced.get(table)
+        incremental = bool(has_updated_at and last_updated)
+        if incremental:
+            since_param = f"since_{len(queries)}"
+            query += f" AND t.{quote_ident('updated_at')} > {param(since_param)}"
+            params[since_param] = last_updated
+        queries.append((table, incremental, query))
+    return queries, params
+
+
+def sync_snapshot(client_uuid, table_config, build_query, full=False, db_url=DB_URL):
+    """Create or refresh a client's snapshot.
+
+    Args:
+        client_uuid: Client UUID to snapshot
+        table_config: Active fc-uuid table config
+        build_query: See build_snapshot_queries
+        full: Drop the existing snapshot content and copy everything again
+        db_url: Database connection URL
+
+    Returns:
+        Tuple of (tables_synced, rows_written); tables whose query failed
+        are not counted and keep their previous content
+    """
+    connection = open_snapshot(client_uuid, create=True)
+    try:
+        return _sync_tables(connection, client_uuid, table_config, build_query, full, db_url)
+    except BaseException:
+        # psql failed (DatabaseError) or the sync was interrupted
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+
+
+def _sync_tables(connection, client_uuid, table_config, build_query, full, db_url):
+    # One transaction: releasing the per-table savepoints must not commit
+    connection.execute("BEGIN")
+    if full:
+        connection.execute("DELETE FROM rows")
+        connection.execute("DELETE FROM synced_tables")
+
+    synced = {}
+    incremental_syncs = {}
+    for table, max_updated_at, count in connection.execute(
+            "SELECT tbl, max_updated_at, incremental_syncs FROM synced_tables"):
+        incremental_syncs[table] = count
+        # Tables due for a full reload get no incremental starting point
+        if count < MAX_INCREMENTAL_SYNCS:
+            synced[table] = max_updated_at
+    updated_at_tables = {row[0] for row in fetch_csv_rows(UPDATED_AT_QUERY, db_url)}
+    queries, params = build_snapshot_queries(client_uuid, table_config, build_query, synced, updated_at_tables)
+    query_numbers = {table: number for number, (table, _, _) in enumerate(queries)}
+
+    rows_written = 0
+    max_updated = {}
+    batch = []
+    completed = []
+    # [query number, rows read] of the table being read, inside a savepoint
+    current = [None, 0]
+
+    def flush():
+        connection.executemany(
+            "INSERT OR REPLACE INTO rows (tbl, uuid, identifier, updated_at) VALUES (?, ?, ?, ?)",
+            batch
+        )
+        batch.clear()
+
+    def begin(number):
+        if current[0] is not None:
+            # The previous query ended without its QUERY_DONE row: it failed
+            abandon()
+        table, incremental, _ = queries[number]
+        connection.execute("SAVEPOINT snapshot_table")
+        if not incremental:
+            connection.execute("DELETE FROM rows WHERE tbl = ?", (table,))
+        current[:] = [number, 0]
+
+    def abandon():
+        batch.clear()
+        connection.execute("ROLLBACK TO snapshot_table")
+        connection.execute("RELEASE snapshot_table")
+        max_updated.pop(queries[current[0]][0], None)
+        current[:] = [None, 0]
+
+    for row in stream_csv_script((query for _, _, query in queries), db_url, params):
+        if len(row) == 2 and row[0] == QUERY_DONE:
+            number = int(row[1])
+            if current[0] != number:
+                begin(number)
+            flush()
+            connection.execute("RELEASE snapshot_table")
+            completed.append(number)
+            rows_written += current[1]
+            current[:] = [None, 0]
+            continue
+        if len(row) != 4 or row[0] not in query_numbers:
+            continue
+        table, uuid_value, identifier, updated_at = row
+        if current[0] != query_numbers[table]:
+            begin(query_numbers[table])
+        identifier = identifier.replace('\n', ' ').replace('\r', ' ')
+        batch.append((table, uuid_value, identifier, updated_at or None))
+        if updated_at and updated_at > max_updated.get(table, ''):
+            max_updated[table] = updated_at
+        current[1] += 1
+        if len(batch) >= BATCH_SIZE:
+            flush()
+    if current[0] is not None:
+        abandon()
+
+    completed_numbers = set(completed)
+    failed = [table for number, (table, _, _) in enumerate(queries) if number not in completed_numbers]
+    if failed:
+        print(f"Warning: {len(failed)} table(s) could not be synced and keep their previous snapshot: "
+              f"{', '.join(failed)}", file=sys.stderr)
+
+    now = int(time.time())
+    sync_states = []
+    for number in completed:
+        table, incremental, _ = queries[number]
+        if incremental:
+            sync_states.append((table, now, max_updated.get(table) or synced.get(table),
+                                incremental_syncs.get(table, 0) + 1))
+        else:
+            sync_states.append((table, now, max_updated.get(table), 0))
+    connection.executemany(
+        "INSERT OR REPLACE INTO synced_tables (tbl, synced_at, max_updated_at, incremental_syncs) "
+        "VALUES (?, ?, ?, ?)",
+        sync_states
+    )
+    connection.execute("INSERT INTO rows_fts(rows_fts) VALUES ('rebuild')")
+    connection.commit()
+
+    return len(completed), rows_written
+
+
+def get_snapshot_rows(connection, table, limit=None):
+    """Return (uuid, identifier) rows of a table from a snapshot.
+
+    Returns:
+        List of rows, or None if the table is not part of the snapshot
+    """
+    if connection.execute("SELECT 1 FROM synced_tables WHERE tbl = ?", (table,)).fetchone() is None:
+        return None
+
+    query = "SELECT uuid, coalesce(nullif(identifier, ''), '(no identifier)') FROM rows WHERE tbl = ?"
+    params = [table]
+    if limit:
+        query += " ORDER BY random() LIMIT ?"
+        params.append(limit)
+    return connection.execute(query, params).fetchall()
+
+
+def search_snapshot(connection, text, limit=500):
+    """Full-text search identifiers across all tables of a snapshot.
+
+    Every word of text is matched as a prefix.
+
+    Returns:
+        List of (table, uuid, identifier) rows, best matches first
+    """
+    terms = re.findall(r'\w+', text)
+    if not terms:
+        return []
+
+    match = " ".join(f'"{term}"*' for term in terms)
+    return connection.execute(
+        "SELECT r.tbl, r.uuid, r.identifier FROM rows_fts "
+        "JOIN rows r ON r.rowid = rows_fts.rowid "
+        "WHERE rows_fts MATCH ? ORDER BY rank LIMIT ?",
+        (match, limit)
+    ).fetchall()
+
+
+def print_snapshot_status(client_uuid):
+    """Print a short summary of a client's snapshot to stderr."""
+    connection = open_snapshot(client_uuid)
+    if connection is None:
+        print(f"No snapshot for client {client_uuid}", file=sys.stderr)
+        return
+    rows = connection.execute("SELECT count(*) FROM rows").fetchone()[0]
+    tables, synced_at = connection.execute("SELECT count(*), max(synced_at) FROM synced_tables").fetchone()
+    connection.close()
+    age = int(time.time()) - (synced_at or 0)
+    print(f"Snapshot {get_snapshot_file(client_uuid)}: {rows} rows in {tables} tables, "
+          f"synced {age // 60} min ago", file=sys.stderr)
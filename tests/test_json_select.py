@@ -0,0 +1,86 @@
+"""Streaming selection (json_select) checked against an in-memory reference."""
+
+import json
+import random
+import unittest
+
+from fc_api_helper.json_select import JsonSelector, parse_selector
+
+
+def _children(node):
+    if isinstance(node, dict):
+        return [(position, key, child) for position, (key, child) in enumerate(node.items())]
+    if isinstance(node, list):
+        return [(index, index, child) for index, child in enumerate(node)]
+    return []
+
+
+def _descendants(position, node):
+    """The node and all its descendants, with their positions."""
+    yield position, node
+    for index, _, child in _children(node):
+        yield from _descendants(position + (index,), child)
+
+
+def reference_select(expression, document):
+    """Select values by applying each step to the whole node set.
+
+    Nodes are identified by their position in the document, so every node
+    is selected at most once, and results come in document order.
+    """
+    nodes = {(): document}
+    for step in parse_selector(expression):
+        selected = {}
+        for position, node in nodes.items():
+            origins = _descendants(position, node) if step.recursive else [(position, node)]
+            for origin, origin_node in origins:
+                for index, key, child in _children(origin_node):
+                    if step.matches(key, child):
+                        selected[origin + (index,)] = child
+        nodes = selected
+    return [nodes[position] for position in sorted(nodes)]
+
+
+def stream_select(expression, document, chunk_size):
+    data = json.dumps(document).encode('utf-8')
+    chunks = [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
+    return list(JsonSelector(expression).iter_matches(chunks))
+
+
+def random_document(rng, depth=0):
+    roll = rng.random()
+    if depth >= 4 or roll < 0.3:
+        return rng.choice([0, 1, 2, 'a', 'uuid', True, None, 1.5])
+    if roll < 0.65:
+        return {rng.choice(['a', 'b', 'uuid', 'id']): random_document(rng, depth + 1)
+                for _ in range(rng.randint(0, 3))}
+    return [random_document(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+
+
+SELECTORS = [
+    '..uuid', '..*', '..[0]', '..[1:]', 'a..b', '..a.b', '..a..b', '..a.*',
+    '*', '[*].uuid', '[0]', 'a', 'a.b', '..[?a]', '..[?id==1]', '[?uuid!=2].a',
+    '..uuid.uuid', '..[*][0]',
+]
+
+
+class RecursiveDescentTest(unittest.TestCase):
+
+    def test_matches_inside_selected_values(self):
+        self.assertEqual(stream_select('..uuid', {'uuid': {'uuid': 1}}, 64), [{'uuid': 1}, 1])
+        self.assertEqual(stream_select('..*', {'a': {'b': 1}}, 64), [{'b': 1}, 1])
+        self.assertEqual(stream_select('..[0]', [[1, 2], 3], 64), [[1, 2], 1])
+
+    def test_matches_reference(self):
+        rng = random.Random(43)
+        for _ in range(500):
+            document = random_document(rng)
+            for expression in SELECTORS:
+                expected = reference_select(expression, document)
+                for chunk_size in (3, 1 << 16):
+                    with self.subTest(expression=expression, document=document, chunk_size=chunk_size):
+                        self.assertEqual(stream_select(expression, document, chunk_size), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()